@@ -0,0 +1,35 @@
+"""add partial index on unprocessed raw articles
+
+Revision ID: 7c1e2b9d4f10
+Revises: 35a4c06f7666
+Create Date: 2026-10-17 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e2b9d4f10'
+down_revision: Union[str, Sequence[str], None] = '35a4c06f7666'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_raw_article_unprocessed',
+        'raw_article',
+        ['ingested_at'],
+        unique=False,
+        postgresql_where=sa.text('processed = false'),
+        sqlite_where=sa.text('processed = 0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_raw_article_unprocessed', table_name='raw_article')
@@ -0,0 +1,28 @@
+"""add (created_at, id) index on story for feed pagination
+
+Revision ID: a3d5f8e21c47
+Revises: 7c1e2b9d4f10
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d5f8e21c47'
+down_revision: Union[str, Sequence[str], None] = '7c1e2b9d4f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_story_created_at_id', 'story', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_story_created_at_id', table_name='story')
@@ -0,0 +1,55 @@
+"""add crawl_watermark and crawl_run tables
+
+Revision ID: b8f3d1c6a2e5
+Revises: e4b7c2a9d816
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f3d1c6a2e5'
+down_revision: Union[str, Sequence[str], None] = 'e4b7c2a9d816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'crawl_watermark',
+        sa.Column('query', sa.String(), nullable=False),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('recent_urls', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('query'),
+    )
+    op.create_table(
+        'crawl_run',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('queries', sa.JSON(), nullable=False),
+        sa.Column('incremental_queries', sa.Integer(), nullable=False),
+        sa.Column('newsapi_requests', sa.Integer(), nullable=False),
+        sa.Column('fetched', sa.Integer(), nullable=False),
+        sa.Column('overlap_skipped', sa.Integer(), nullable=False),
+        sa.Column('inserted', sa.Integer(), nullable=False),
+        sa.Column('skipped', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_crawl_run_started_at'), 'crawl_run', ['started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_crawl_run_started_at'), table_name='crawl_run')
+    op.drop_table('crawl_run')
+    op.drop_table('crawl_watermark')
@@ -0,0 +1,61 @@
+"""store raw_article.content compressed (bytea)
+
+Revision ID: c2e9a4f7b315
+Revises: b8f3d1c6a2e5
+Create Date: 2026-10-17 22:00:00.000000
+
+Existing bodies are converted to plain UTF-8 bytes, which `CompressedText` reads as-is;
+`python -m src.services.retention compact` recompresses them (and compacts raw_json) in batches.
+
+"""
+from typing import Sequence, Union
+
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e9a4f7b315'
+down_revision: Union[str, Sequence[str], None] = 'b8f3d1c6a2e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _decompress(data: bytes) -> str:
+    # Storage format as of this revision: NUL + codec id ("z" zstd, "d" zlib), otherwise plain UTF-8
+    data = bytes(data)
+    if data[:2] == b"\x00z":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data[2:]).decode()
+    if data[:2] == b"\x00d":
+        return zlib.decompress(data[2:]).decode()
+    return data.decode()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'raw_article', 'content',
+        existing_type=sa.Text(),
+        type_=sa.LargeBinary(),
+        existing_nullable=True,
+        postgresql_using="convert_to(content, 'UTF8')",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Compressed bodies can only be decoded in Python
+    op.add_column('raw_article', sa.Column('content_text', sa.Text(), nullable=True))
+    table = sa.table('raw_article', sa.column('id', sa.Uuid()), sa.column('content', sa.LargeBinary()), sa.column('content_text', sa.Text()))
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(table.c.id, table.c.content).where(table.c.content.is_not(None)))
+    for batch in rows.mappings().partitions(1000):
+        connection.execute(
+            table.update().where(table.c.id == sa.bindparam('row_id')).values(content_text=sa.bindparam('text')),
+            [{'row_id': r['id'], 'text': _decompress(r['content'])} for r in batch],
+        )
+    op.drop_column('raw_article', 'content')
+    op.alter_column('raw_article', 'content_text', new_column_name='content')
@@ -0,0 +1,30 @@
+"""add llm_usage and llm_cost_usd columns on story
+
+Revision ID: e4b7c2a9d816
+Revises: a3d5f8e21c47
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7c2a9d816'
+down_revision: Union[str, Sequence[str], None] = 'a3d5f8e21c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('story', sa.Column('llm_usage', sa.JSON(), nullable=True))
+    op.add_column('story', sa.Column('llm_cost_usd', sa.Float(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('story', 'llm_cost_usd')
+    op.drop_column('story', 'llm_usage')
@@ -0,0 +1,30 @@
+"""add backfill range to crawl_watermark
+
+Revision ID: f5a1c8d3e620
+Revises: c2e9a4f7b315
+Create Date: 2026-10-17 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a1c8d3e620'
+down_revision: Union[str, Sequence[str], None] = 'c2e9a4f7b315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('crawl_watermark', sa.Column('backfill_from', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('crawl_watermark', sa.Column('backfill_to', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('crawl_watermark', 'backfill_to')
+    op.drop_column('crawl_watermark', 'backfill_from')
@@ -0,0 +1,85 @@
+"""
+Benchmark: citation check time vs. cluster size.
+
+Builds clusters of synthetic articles and a summary that cites every one of them, then times
+the first check (index build + check) and a repeated check on a cached index, against a naive
+check that scans the ID list and re-tokenizes the cited sources for every summary sentence.
+Run from the project root:
+
+    python -m benchmarks.bench_citations --sizes 10 100 1000 5000
+"""
+
+import argparse
+import random
+import time
+
+from src.agents.citations import CitationIndex, _SENTENCE_SPLIT, ngrams
+from src.agents.state import SynthesizedStory
+from src.config.config import CITATION_MIN_OVERLAP
+
+VOCABULARY = [f"w{i}" for i in range(5_000)]
+
+
+def synthetic_cluster(size: int, sentences: int = 40, seed: int = 11) -> tuple[list[dict], SynthesizedStory]:
+    rng = random.Random(seed)
+    articles = [
+        {
+            "id": f"article-{i}",
+            "title": " ".join(rng.choices(VOCABULARY, k=8)),
+            "content": " ".join(" ".join(rng.choices(VOCABULARY, k=18)) + "." for _ in range(sentences)),
+        }
+        for i in range(size)
+    ]
+    # One summary sentence lifted from every article, as a digest citing all of them would
+    claims = [a["content"].split(". ")[rng.randrange(sentences)].rstrip(".") + "." for a in articles]
+    story = SynthesizedStory(title="Digest", summary="## Key developments\n\n" + " ".join(claims),
+                             source_article_ids=[a["id"] for a in articles])
+    return articles, story
+
+
+def naive_check(articles: list[dict], story: SynthesizedStory) -> int:
+    """List membership per ID and per-sentence re-tokenization of every cited source."""
+    ids = [a["id"] for a in articles]
+    cited = [i for i in story.source_article_ids if i in ids]
+    supporting = set()
+    for sentence in _SENTENCE_SPLIT.split(story.summary):
+        grams = ngrams(sentence)
+        if sentence.startswith("#") or not grams:
+            continue
+        for article_id in cited:
+            article = articles[ids.index(article_id)]
+            if len(grams & ngrams(article["content"])) >= CITATION_MIN_OVERLAP * len(grams):
+                supporting.add(article_id)
+    return len(supporting)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--naive-max", type=int, default=100, help="Largest cluster to also time the naive check")
+    args = parser.parse_args()
+
+    print(f"{'articles':>8} | {'build+check ms':>14} | {'cached check ms':>15} | {'naive ms':>9} | verified")
+    for size in args.sizes:
+        articles, story = synthetic_cluster(size)
+
+        start = time.perf_counter()
+        index = CitationIndex(articles)
+        report = index.check(story)
+        first = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index.check(story)
+        cached = (time.perf_counter() - start) * 1000
+
+        naive = "-"
+        if size <= args.naive_max:
+            start = time.perf_counter()
+            naive_check(articles, story)
+            naive = f"{(time.perf_counter() - start) * 1000:.1f}"
+
+        print(f"{size:>8} | {first:>14.1f} | {cached:>15.1f} | {naive:>9} | {report.verified}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: near-duplicate clustering time vs. corpus size.
+
+Builds a synthetic corpus of events, each reported by several "publishers" with reworded text,
+then times MinHash/LSH clustering. Small sizes are also timed with an all-pairs MinHash
+comparison to show the quadratic baseline. Run from the project root:
+
+    python -m benchmarks.bench_clustering --sizes 1000 5000 10000 20000 50000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.services.clustering import NearDuplicateClusterer
+
+VOCABULARY = [f"w{i}" for i in range(20_000)]
+
+
+def synthetic_corpus(size: int, seed: int = 7) -> tuple[list[dict], list[int]]:
+    """Returns articles plus the true event label of each one."""
+    rng = random.Random(seed)
+    articles, labels = [], []
+    event = 0
+    while len(articles) < size:
+        base = rng.choices(VOCABULARY, k=200)
+        for _ in range(rng.randint(1, 5)):
+            words = [rng.choice(VOCABULARY) if rng.random() < 0.05 else w for w in base]
+            articles.append({"id": str(len(articles)), "title": " ".join(words[:8]), "content": " ".join(words)})
+            labels.append(event)
+        event += 1
+    return articles[:size], labels[:size]
+
+
+def all_pairs(clusterer: NearDuplicateClusterer, articles: list[dict]) -> int:
+    signatures = np.vstack([clusterer.signature(clusterer._text(a)) for a in articles])
+    matches = 0
+    for i in range(len(signatures)):
+        matches += int((np.mean(signatures[i + 1:] == signatures[i], axis=1) >= clusterer.threshold).sum())
+    return matches
+
+
+def pair_recall(clusters, labels) -> float:
+    """Fraction of same-event article pairs that ended up in the same cluster."""
+    assigned = {}
+    for c, cluster in enumerate(clusters):
+        for article_id in cluster.article_ids:
+            assigned[int(article_id)] = c
+    by_event: dict[int, list[int]] = {}
+    for i, label in enumerate(labels):
+        by_event.setdefault(label, []).append(i)
+    total = hits = 0
+    for members in by_event.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                total += 1
+                hits += assigned[members[a]] == assigned[members[b]]
+    return hits / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 20000, 50000])
+    parser.add_argument("--all-pairs-max", type=int, default=5000, help="Largest size to also time all-pairs comparison")
+    args = parser.parse_args()
+
+    clusterer = NearDuplicateClusterer()
+    print(f"{'articles':>9} | {'lsh sec':>8} | {'all-pairs sec':>13} | {'clusters':>8} | {'events':>6} | pair recall")
+    for size in args.sizes:
+        articles, labels = synthetic_corpus(size)
+
+        start = time.perf_counter()
+        clusters = clusterer.cluster(articles)
+        lsh_seconds = time.perf_counter() - start
+
+        brute = "-"
+        if size <= args.all_pairs_max:
+            start = time.perf_counter()
+            all_pairs(clusterer, articles)
+            brute = f"{time.perf_counter() - start:.2f}"
+
+        print(f"{size:>9} | {lsh_seconds:>8.2f} | {brute:>13} | {len(clusters):>8} | {len(set(labels)):>6} | {pair_recall(clusters, labels):.3f}")
+
+
+if __name__ == "__main__":
+    main()
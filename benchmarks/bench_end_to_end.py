@@ -0,0 +1,243 @@
+"""
+Benchmark: the whole offline pipeline, NewsAPI crawl to stored stories, at several corpus sizes.
+
+Spins up a local `/v2/everything` endpoint, static article sites for trafilatura and the
+deterministic `FakeChatModel`, then runs ingestion and the processor (clustering + graph)
+against a fresh SQLite file per size, or a database given by `--database-url` (e.g. a local
+Postgres, whose tables are dropped and recreated). Per size it records articles/sec, p50/p99
+latency per traced stage, database round trips and LLM calls per story, and writes everything
+to a JSON file. `--compare` checks a run against an earlier file and exits non-zero when a
+metric got worse by more than `--tolerance`, so the results can gate pull requests:
+
+    python -m benchmarks.bench_end_to_end --sizes 100 500 2000 --output bench_results.json
+    python -m benchmarks.bench_end_to_end --sizes 100 500 --compare bench_results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.fakes import FakeArticleSites, FakeNewsAPI, newsapi_corpus
+from src.agents.fake_llm import FakeChatModel
+from src.agents.llm import registry
+from src.db.models import Base, Story
+from src.logger.tracing import tracer
+from src.services.extractor import ArticleExtractor
+from src.services.news_api import CrawlBudget, NewsAPIClient
+from src.services.news_fetcher import NewsFetcherService
+from src.services.pipeline import IngestionPipeline
+from src.services.processor import ProcessorService
+
+STAGES = (
+    "newsapi.request", "extract", "ingestion.commit",
+    "processor.batch", "graph.run", "graph.researcher", "graph.citation_check", "graph.precheck", "graph.editor", "llm.call",
+)
+
+# (path in a size's results, higher is better); the metrics `--compare` checks
+TRACKED = [
+    (("ingestion", "articles_per_sec"), True),
+    (("processing", "stories_per_sec"), True),
+    (("ingestion", "db_round_trips_per_article"), False),
+    (("processing", "db_round_trips_per_story"), False),
+    (("processing", "llm_calls_per_story"), False),
+    (("processing", "llm_tokens_per_story"), False),
+]
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class RoundTrips:
+    """Counts statements sent to the database (executemany batches count once)."""
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def stage_latencies(spans) -> dict[str, dict]:
+    by_name: dict[str, list[float]] = {}
+    for s in spans:
+        by_name.setdefault(s.name, []).append(s.seconds * 1000)
+    return {
+        name: {
+            "count": len(by_name[name]),
+            "p50_ms": round(float(np.percentile(by_name[name], 50)), 3),
+            "p99_ms": round(float(np.percentile(by_name[name], 99)), 3),
+        }
+        for name in STAGES if name in by_name
+    }
+
+
+async def run_size(size: int, args, database_url: str) -> dict:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    round_trips = RoundTrips(engine)
+    exporter = ListExporter()
+    tracer.set_exporter(exporter)
+
+    queries = [f"benchmark topic {q}" for q in range(args.queries)]
+    per_query = math.ceil(size / len(queries))
+    with FakeArticleSites(hosts=args.hosts, latency=args.site_latency) as sites:
+        corpus = newsapi_corpus(sites, queries, per_query, args.articles_per_event)
+        with FakeNewsAPI(corpus, latency=args.api_latency) as api:
+            news_api = NewsAPIClient(api_key="bench", base_url=api.url, max_pages=math.ceil(per_query / 100), backoff_base=0.01)
+            fetcher = NewsFetcherService(extractor=ArticleExtractor(), news_api=news_api)
+            pipeline = IngestionPipeline(fetcher, sessionmaker, crawl_options={"budget": CrawlBudget(10_000)})
+            start = time.perf_counter()
+            ingestion = await pipeline.run(queries)
+            ingest_seconds = time.perf_counter() - start
+            await fetcher.aclose()
+    ingest_round_trips = round_trips.count
+
+    registry.clear()
+    registry.cache = None   # Every story must reach the model
+    registry.requests_per_minute = registry.tokens_per_minute = None
+    llm = FakeChatModel(latency=args.llm_latency, reject_first=args.reject_first)
+    registry.register(llm)
+    start = time.perf_counter()
+    processing = await ProcessorService(concurrency=args.concurrency).run(sessionmaker)
+    process_seconds = time.perf_counter() - start
+    process_round_trips = round_trips.count - ingest_round_trips
+    async with sessionmaker() as session:
+        stories = await session.scalar(select(func.count()).select_from(Story))
+
+    tracer.set_exporter(None)
+    await engine.dispose()
+    registry.clear()
+
+    per_story = max(stories, 1)
+    return {
+        "articles": ingestion.inserted,
+        "stories": stories,
+        "ingestion": {
+            "seconds": round(ingest_seconds, 3),
+            "articles_per_sec": round(ingestion.inserted / ingest_seconds, 2),
+            "db_round_trips": ingest_round_trips,
+            "db_round_trips_per_article": round(ingest_round_trips / max(ingestion.inserted, 1), 4),
+            "newsapi_requests": sum(1 for s in exporter.spans if s.name == "newsapi.request"),
+        },
+        "processing": {
+            "seconds": round(process_seconds, 3),
+            "clusters": processing.clusters,
+            "stories_per_sec": round(stories / process_seconds, 2),
+            "db_round_trips": process_round_trips,
+            "db_round_trips_per_story": round(process_round_trips / per_story, 4),
+            "llm_calls_per_story": round(len(llm.stats.calls) / per_story, 4),
+            "llm_tokens_per_story": round(sum(c.input_tokens + c.output_tokens for c in llm.stats.calls) / per_story, 1),
+        },
+        "stages": stage_latencies(exporter.spans),
+    }
+
+
+def _metric(result: dict, path: tuple[str, ...]) -> float | None:
+    for key in path:
+        result = result.get(key) if isinstance(result, dict) else None
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lines describing every tracked metric that got worse than `baseline` by more than `tolerance`."""
+    regressions = []
+    print(f"\n{'size':>6} | {'metric':<38} | {'baseline':>10} | {'current':>10} | {'change':>7}")
+    for size, current in results.items():
+        previous = baseline.get(size)
+        if previous is None:
+            continue
+        for path, higher_is_better in TRACKED:
+            old, new = _metric(previous, path), _metric(current, path)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = " <-" if worse > tolerance else ""
+            print(f"{size:>6} | {'.'.join(path):<38} | {old:>10g} | {new:>10g} | {change:>+6.0%}{flag}")
+            if worse > tolerance:
+                regressions.append(f"{size} articles: {'.'.join(path)} {old:g} -> {new:g} ({change:+.0%})")
+    return regressions
+
+
+async def main_async(args) -> int:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            database_url = args.database_url or f"sqlite+aiosqlite:///{Path(tmp) / f'bench_{size}.db'}"
+            results[str(size)] = result = await run_size(size, args, database_url)
+            ingestion, processing = result["ingestion"], result["processing"]
+            print(
+                f"{size:>6} articles: ingest {ingestion['articles_per_sec']:>7.1f} articles/s "
+                f"({ingestion['db_round_trips_per_article']:.2f} round trips/article) | "
+                f"{result['stories']} stories at {processing['stories_per_sec']:.1f}/s, "
+                f"{processing['llm_calls_per_story']:.2f} LLM calls and {processing['db_round_trips_per_story']:.2f} round trips per story"
+            )
+
+    output = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": "sqlite" if args.database_url is None else args.database_url.split(":")[0],
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "database_url")},
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(output, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text())["results"], args.tolerance)
+        if regressions:
+            print("\nRegressions beyond the tolerance:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000], help="Articles crawled per run")
+    parser.add_argument("--database-url", help="Async SQLAlchemy URL; its tables are dropped and recreated (default: SQLite)")
+    parser.add_argument("--queries", type=int, default=4)
+    parser.add_argument("--articles-per-event", type=int, default=4, help="Outlets covering each synthetic event")
+    parser.add_argument("--hosts", type=int, default=4, help="Fake publisher sites")
+    parser.add_argument("--api-latency", type=float, default=0.02, help="Seconds per fake NewsAPI page")
+    parser.add_argument("--site-latency", type=float, default=0.01, help="Seconds per fake article page")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--reject-first", type=int, default=0, help="Editor calls answered with feedback before approving")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clusters running through the graph at once")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="Earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative change before a metric counts as a regression")
+    args = parser.parse_args()
+
+    # The pipeline logs every article at INFO; that would be the bulk of what is measured
+    logging.getLogger().setLevel(logging.WARNING)
+    os.environ.setdefault("NEWS_API_KEY", "bench")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: full-text extraction throughput (articles/sec) against local fake article sites.
+
+Compares the old sequential path (blocking download + extract per URL) with the concurrent
+`ArticleExtractor`. Run from the project root:
+
+    python -m benchmarks.bench_extraction --sizes 5 100 1000 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import trafilatura
+
+from benchmarks.fakes import FakeArticleSites
+from src.services.extractor import ArticleExtractor
+
+
+def sequential(urls: list[str]) -> int:
+    extracted = 0
+    with httpx.Client() as client:
+        for url in urls:
+            text = trafilatura.extract(client.get(url).text, url=url)
+            extracted += text is not None
+    return extracted
+
+
+async def concurrent(urls: list[str], args) -> int:
+    async with ArticleExtractor(
+        max_concurrency=args.max_concurrency,
+        per_host_concurrency=args.per_host,
+        process_workers=args.process_workers,
+    ) as extractor:
+        results = await extractor.extract_many(urls)
+    return sum(text is not None for text in results.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 100, 1000])
+    parser.add_argument("--hosts", type=int, default=8, help="Number of fake publishers (one port each)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Server-side delay per request, in seconds")
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--per-host", type=int, default=8)
+    parser.add_argument("--process-workers", type=int, default=None)
+    parser.add_argument("--skip-sequential-above", type=int, default=100,
+                        help="Sequential runs grow linearly; skip them for larger sizes")
+    args = parser.parse_args()
+
+    print(f"{'urls':>6} | {'mode':<10} | {'seconds':>8} | {'articles/sec':>12} | extracted")
+    with FakeArticleSites(hosts=args.hosts, latency=args.latency) as sites:
+        for size in args.sizes:
+            urls = sites.urls(size)
+            if size <= args.skip_sequential_above:
+                start = time.perf_counter()
+                ok = sequential(urls)
+                elapsed = time.perf_counter() - start
+                print(f"{size:>6} | {'sequential':<10} | {elapsed:>8.2f} | {size / elapsed:>12.1f} | {ok}")
+
+            start = time.perf_counter()
+            ok = asyncio.run(concurrent(urls, args))
+            elapsed = time.perf_counter() - start
+            print(f"{size:>6} | {'concurrent':<10} | {elapsed:>8.2f} | {size / elapsed:>12.1f} | {ok}")
+
+
+if __name__ == "__main__":
+    main()
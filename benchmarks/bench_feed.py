@@ -0,0 +1,160 @@
+"""
+Benchmark: /feed latency (p50/p99) under concurrent load.
+
+Seeds a SQLite database with stories linked to long source articles, then fires requests at
+the FastAPI app in-process (httpx ASGI transport, so no server or network is involved):
+keyset pages at random depths with and without `include_content`, against an OFFSET-paginated
+endpoint that loads and serializes every source article in full, and finally keyset pages
+served from a warm feed response cache. Run from the project root:
+
+    python -m benchmarks.bench_feed --stories 20000 --requests 1000 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+import numpy as np
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from src.api import feed
+from src.api.schemas import FeedPage
+from src.db.models import Base, RawArticle, Story, StorySource
+from src.db.session import get_session
+from src.services.feed_cache import InMemoryFeedCache, get_feed_cache
+
+
+def build_app(sessionmaker: async_sessionmaker, cache: InMemoryFeedCache) -> FastAPI:
+    bench_app = FastAPI()
+    bench_app.include_router(feed.router)
+
+    async def session_override():
+        async with sessionmaker() as session:
+            yield session
+
+    @bench_app.get("/feed-offset", response_model=FeedPage)
+    async def offset_feed(page: int = Query(0), limit: int = Query(20), session: AsyncSession = Depends(get_session)):
+        """The naive version: OFFSET paging, full articles loaded and validated by FastAPI."""
+        stmt = (
+            select(Story).options(selectinload(Story.sources))
+            .order_by(Story.created_at.desc(), Story.id.desc()).offset(page * limit).limit(limit)
+        )
+        stories = (await session.execute(stmt)).scalars().all()
+        return {"items": stories, "next_cursor": None}
+
+    bench_app.dependency_overrides[get_session] = session_override
+    bench_app.dependency_overrides[get_feed_cache] = lambda: cache
+    return bench_app
+
+
+async def seed(sessionmaker: async_sessionmaker, stories: int, articles: int, sources: int):
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    article_rows = [
+        {
+            "id": uuid4(), "source_id": f"outlet-{i % 50}", "url": f"https://outlet-{i % 50}.example.com/{i}",
+            "title": f"Article {i}", "content": "Lorem ipsum dolor sit amet. " * 200,
+            "raw_json": {"source": {"name": f"outlet-{i % 50}"}}, "published_at": now, "ingested_at": now, "processed": True,
+        }
+        for i in range(articles)
+    ]
+    story_rows = [
+        {"id": uuid4(), "title": f"Story {i}", "summary": "## Key developments\n\n" + "Facts. " * 80,
+         "created_at": now - timedelta(minutes=i), "sentiment_score": 0.0, "category": "AI", "citation_verified": True}
+        for i in range(stories)
+    ]
+    link_rows = [
+        {"story_id": story["id"], "raw_article_id": article["id"]}
+        for story in story_rows for article in rng.sample(article_rows, sources)
+    ]
+    async with sessionmaker() as session:
+        for table, rows in ((RawArticle, article_rows), (Story, story_rows), (StorySource, link_rows)):
+            for start in range(0, len(rows), 1000):
+                await session.execute(insert(table), rows[start:start + 1000])
+        await session.commit()
+
+
+async def load_test(client: httpx.AsyncClient, urls: list[str], concurrency: int) -> np.ndarray:
+    latencies: list[float] = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(url: str):
+        async with limit:
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one(url) for url in urls))
+    return np.array(latencies)
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'feed.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        await seed(sessionmaker, args.stories, args.articles, args.sources)
+
+        rng = random.Random(5)
+        pages = args.stories // args.limit
+        # A cache that keeps nothing until the last scenario
+        cache = InMemoryFeedCache(max_entries=0)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app(sessionmaker, cache)), base_url="http://bench") as client:
+            # Collect real cursors by walking the feed once
+            cursors, cursor = [None], None
+            while len(cursors) < pages:
+                cursor = (await client.get("/feed", params={"limit": args.limit, **({"cursor": cursor} if cursor else {})})).json()["next_cursor"]
+                cursors.append(cursor)
+
+            def keyset_urls(extra: str) -> list[str]:
+                picks = (rng.choice(cursors) for _ in range(args.requests))
+                return [f"/feed?limit={args.limit}{extra}" + (f"&cursor={c}" if c else "") for c in picks]
+
+            scenarios = {
+                "keyset": keyset_urls(""),
+                "keyset+content": keyset_urls("&include_content=true"),
+                "offset+content": [f"/feed-offset?limit={args.limit}&page={rng.randrange(pages)}" for _ in range(args.requests)],
+            }
+            print(f"{args.stories} stories x {args.sources} sources, {args.requests} requests, concurrency {args.concurrency}")
+            print(f"{'scenario':>15} | {'p50 ms':>7} | {'p99 ms':>7} | {'req/s':>7}")
+            scenarios["keyset (cached)"] = scenarios["keyset"]
+            for name, urls in scenarios.items():
+                if name == "keyset (cached)":
+                    cache.max_entries = len(cursors)
+                    await load_test(client, urls, args.concurrency)   # Warm up
+                    cache.hits = cache.misses = 0
+                start = time.perf_counter()
+                latencies = await load_test(client, urls, args.concurrency)
+                rate = len(urls) / (time.perf_counter() - start)
+                print(f"{name:>15} | {np.percentile(latencies, 50):>7.1f} | {np.percentile(latencies, 99):>7.1f} | {rate:>7.0f}")
+            stats = await cache.stats()
+            print(f"feed cache: {stats['entries']} pages, {stats['bytes'] / 1e6:.1f} MB, hit rate {stats['hit_rate']:.2f}")
+        await engine.dispose()
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stories", type=int, default=20000)
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--sources", type=int, default=5, help="Source articles per story")
+    parser.add_argument("--limit", type=int, default=20, help="Stories per page")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: clusters/sec through the LangGraph app, sequential vs. concurrent batch runs.
+
+Uses the offline `FakeChatModel` with injected per-call latency to stand in for LLM round trips.
+Run from the project root:
+
+    python -m benchmarks.bench_graph_batch --clusters 64 --latency 0.3 --concurrency 1 8 32 64
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.agents.fake_llm import FakeChatModel
+from src.agents.graph import app
+from src.agents.llm import registry
+from src.agents.runner import run_graph_batch
+
+
+def cluster(index: int) -> dict:
+    raw_articles = [
+        {"id": f"c{index}-a{i}", "title": f"Event {index} report {i}", "content": f"Outlet {i} covers event {index}. " * 20}
+        for i in range(4)
+    ]
+    return {"raw_articles": raw_articles, "draft_story": None, "editor_feedback": None, "is_approved": False, "iteration_count": 0}
+
+
+def configure(args, rpm: float | None = None):
+    registry.clear()
+    registry.max_concurrency = args.llm_concurrency
+    registry.requests_per_minute = rpm
+    registry.tokens_per_minute = None
+    registry.cache = None  # Every run must reach the model
+    llm = FakeChatModel(latency=args.latency, reject_first=0)
+    registry.register(llm)
+    return llm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds per fake LLM call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--llm-concurrency", type=int, default=64, help="Registry cap on in-flight LLM calls")
+    parser.add_argument("--rpm", type=float, default=60, help="Also run the widest batch under this RPM quota")
+    args = parser.parse_args()
+
+    states = [cluster(i) for i in range(args.clusters)]
+    print(f"{'mode':<24} | {'seconds':>7} | {'clusters/sec':>12} | llm calls")
+
+    llm = configure(args)
+    start = time.perf_counter()
+    for state in states:
+        app.invoke(state)
+    seconds = time.perf_counter() - start
+    print(f"{'sequential invoke':<24} | {seconds:>7.2f} | {len(states) / seconds:>12.1f} | {len(llm.stats.calls)}")
+
+    for concurrency in args.concurrency:
+        llm = configure(args)
+        run = asyncio.run(run_graph_batch(states, concurrency=concurrency))
+        print(f"{f'batch x{concurrency}':<24} | {run.seconds:>7.2f} | {len(states) / run.seconds:>12.1f} | {len(llm.stats.calls)}")
+
+    llm = configure(args, rpm=args.rpm)
+    widest = max(args.concurrency)
+    run = asyncio.run(run_graph_batch(states, concurrency=widest))
+    label = f"batch x{widest} @ {args.rpm:g} RPM"
+    print(f"{label:<24} | {run.seconds:>7.2f} | {len(states) / run.seconds:>12.1f} | {len(llm.stats.calls)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: log calls/sec and per-call latency, development vs production logging.
+
+Each mode configures `CustomLogger` against a temporary log directory (console output goes to
+/dev/null) and times a burst of log calls from one thread, the way an async ingestion or LLM
+code path makes them: mostly INFO events with a few fields, a share of high-volume `llm_call`
+events (sampled in production), and the odd warning. `--slow-write-ms` adds a delay to every
+file flush to show disk stalls landing on the caller in development mode. The production
+drain time is how long the listener thread needs to write out what was queued. Run from the
+project root:
+
+    python -m benchmarks.bench_logging --calls 50000 --slow-write-ms 0 0.2
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import random
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+
+from src.logger.custom_logger import CustomLogger, get_logger
+
+
+def workload(calls: int, llm_share: float) -> list[str]:
+    rng = random.Random(0)
+    kinds = []
+    for _ in range(calls):
+        roll = rng.random()
+        kinds.append("llm_call" if roll < llm_share else "warning" if roll > 0.99 else "info")
+    return kinds
+
+
+def run(mode: str, kinds: list[str], slow_write_ms: float) -> tuple[float, float, float, float]:
+    flush = logging.StreamHandler.flush
+
+    def slow_flush(handler):
+        if isinstance(handler, logging.FileHandler):
+            time.sleep(slow_write_ms / 1000)
+        flush(handler)
+
+    latencies = np.empty(len(kinds))
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull), mock.patch.object(logging.StreamHandler, "flush", slow_flush):
+        CustomLogger.configure(mode=mode, log_dir=log_dir)
+        logger = get_logger(f"bench.{mode}")
+        start = time.perf_counter()
+        for i, kind in enumerate(kinds):
+            t0 = time.perf_counter()
+            if kind == "llm_call":
+                logger.info("llm_call", model="qwen/qwen3-32b", node="researcher", prompt_tokens=1800, completion_tokens=400)
+            elif kind == "warning":
+                logger.warning("Article skipped", url=f"https://example.com/{i}", reason="too short")
+            else:
+                logger.info("Article stored", url=f"https://example.com/{i}", words=850)
+            latencies[i] = time.perf_counter() - t0
+        seconds = time.perf_counter() - start
+        drain_start = time.perf_counter()
+        CustomLogger.shutdown()
+        drain = time.perf_counter() - drain_start
+    return len(kinds) / seconds, np.percentile(latencies, 50) * 1e6, np.percentile(latencies, 99) * 1e6, drain
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--llm-share", type=float, default=0.3, help="Share of calls that are llm_call events")
+    parser.add_argument("--slow-write-ms", type=float, nargs="+", default=[0.0, 0.2], help="Added latency per file flush")
+    args = parser.parse_args()
+
+    kinds = workload(args.calls, args.llm_share)
+    print(f"{args.calls} log calls, {args.llm_share:.0%} llm_call events")
+    print(f"{'mode':>11} | {'flush ms':>8} | {'calls/s':>9} | {'p50 us':>7} | {'p99 us':>7} | {'drain s':>7}")
+    for slow_write_ms in args.slow_write_ms:
+        for mode in ("development", "production"):
+            rate, p50, p99, drain = run(mode, kinds, slow_write_ms)
+            print(f"{mode:>11} | {slow_write_ms:>8.2f} | {rate:>9,.0f} | {p50:>7.1f} | {p99:>7.1f} | {drain:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: Researcher input tokens and wall time with and without revision mode.
+
+Runs the Researcher <-> Editor loop on synthetic clusters with the offline `FakeChatModel`,
+whose Editor rejects the first drafts and whose latency grows with prompt size.
+Run from the project root:
+
+    python -m benchmarks.bench_revision --clusters 5 --articles 10 --rejections 2
+"""
+
+import argparse
+import time
+
+from src.agents import nodes
+from src.agents.fake_llm import FakeChatModel
+from src.agents.graph import app
+from src.agents.llm import registry
+
+
+def cluster(index: int, articles: int) -> dict:
+    raw_articles = [
+        {
+            "id": f"c{index}-a{i}",
+            "title": f"Event {index}: report {i}",
+            "content": " ".join(
+                f"Outlet {i} says figure {j} for event {index} rose {j * 3} percent year over year." for j in range(80)
+            ),
+        }
+        for i in range(articles)
+    ]
+    return {"raw_articles": raw_articles, "draft_story": None, "editor_feedback": None, "is_approved": False, "iteration_count": 0}
+
+
+def run(revision_mode: bool, args) -> tuple[int, int, float]:
+    nodes.RESEARCHER_REVISION_MODE = revision_mode
+    registry.clear()
+    registry.requests_per_minute = registry.tokens_per_minute = None  # Measure the LLM, not the quota
+    registry.cache = None  # Replayed responses would hide the token savings
+    input_tokens = revision_tokens = 0
+    start = time.perf_counter()
+    for index in range(args.clusters):
+        llm = FakeChatModel(reject_first=args.rejections, latency=args.latency, latency_per_1k_input=args.latency_per_1k)
+        registry.register(llm)
+        app.invoke(cluster(index, args.articles))
+        researcher = [c.input_tokens for c in llm.stats.calls if c.kind == "researcher"]
+        input_tokens += sum(researcher)
+        revision_tokens += sum(researcher[1:])
+    return input_tokens, revision_tokens, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=5)
+    parser.add_argument("--articles", type=int, default=10)
+    parser.add_argument("--rejections", type=int, default=2, help="Editor rejections before approval")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fixed seconds per LLM call")
+    parser.add_argument("--latency-per-1k", type=float, default=0.02, help="Seconds per 1k prompt tokens")
+    args = parser.parse_args()
+
+    full = run(False, args)
+    revision = run(True, args)
+    print(f"{'mode':<9} | {'researcher tokens':>17} | {'revision-pass tokens':>20} | {'seconds':>7}")
+    for name, (tokens, revision_tokens, seconds) in (("full", full), ("revision", revision)):
+        print(f"{name:<9} | {tokens:>17} | {revision_tokens:>20} | {seconds:>7.2f}")
+    print(f"saved: {full[0] - revision[0]} tokens ({1 - revision[0] / full[0]:.0%}), {full[2] - revision[2]:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
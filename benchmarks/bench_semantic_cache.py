@@ -0,0 +1,108 @@
+"""
+Benchmark: semantic cache hit rate, saved LLM calls and lookup latency.
+
+Replays a synthetic /chat workload: questions about a fixed set of "intents", asked with a
+Zipf-like popularity and reworded each time (dropped/reordered words, filler phrases). Every
+miss is counted as one LLM call and stored; every hit is checked against the intent of the
+question it was served from, so false hits show up next to the hit rate. Run from the
+project root:
+
+    python -m benchmarks.bench_semantic_cache --thresholds 0.6 0.7 0.8 0.9 0.95
+"""
+
+import argparse
+import asyncio
+import random
+
+import numpy as np
+
+from src.services.embeddings import HashingEmbedder, get_embedder
+from src.services.semantic_cache import CachedAnswer, InMemorySemanticCache
+
+VOCABULARY = [f"topic{i}" for i in range(3000)]
+OPENERS = ["what happened with", "why did", "how does", "what is new about", "explain"]
+FILLERS = ["please", "today", "exactly", "in short", "this week"]
+
+
+def intents(count: int, rng: random.Random) -> list[list[str]]:
+    return [rng.choice(OPENERS).split() + rng.sample(VOCABULARY, 6) for _ in range(count)]
+
+
+def reword(words: list[str], rng: random.Random) -> str:
+    words = list(words)
+    if rng.random() < 0.5:
+        del words[rng.randrange(3, len(words))]
+    if rng.random() < 0.5:
+        i = rng.randrange(3, len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    if rng.random() < 0.5:
+        words.append(rng.choice(FILLERS))
+    return " ".join(words) + "?"
+
+
+def workload(args) -> list[tuple[int, str]]:
+    rng = random.Random(7)
+    topics = intents(args.intents, rng)
+    weights = [1 / (rank + 1) ** args.zipf for rank in range(args.intents)]
+    chosen = rng.choices(range(args.intents), weights=weights, k=args.questions)
+    return [(intent, reword(topics[intent], rng)) for intent in chosen]
+
+
+async def replay(embedder, questions: list[tuple[int, str]], threshold: float, llm_seconds: float) -> str:
+    cache = InMemorySemanticCache(threshold=threshold)
+    vectors = embedder.embed([q for _, q in questions])
+    false_hits = 0
+    for (intent, question), vector in zip(questions, vectors):
+        cached = await cache.lookup(vector)
+        if cached is None:
+            await cache.store(vector, CachedAnswer(question, answer=str(intent)))
+        elif cached.answer != str(intent):
+            false_hits += 1
+    stats = await cache.stats()
+    return (
+        f"{threshold:>9.2f} | {stats['hit_rate']:>8.1%} | {false_hits / len(questions):>10.2%} | "
+        f"{stats['saved_llm_calls']:>9} | {stats['saved_llm_calls'] * llm_seconds / 60:>9.1f} | "
+        f"{stats['lookup_ms_p50']:>8.3f} | {stats['lookup_ms_p95']:>8.3f} | {stats['entries']:>7}"
+    )
+
+
+async def lookup_latency(dim: int, entries: int, lookups: int = 500) -> tuple[float, float]:
+    rng = np.random.default_rng(0)
+    cache = InMemorySemanticCache(max_entries=entries)
+    for vector in rng.standard_normal((entries, dim)).astype(np.float32):
+        await cache.store(vector, CachedAnswer("q", "a"))
+    for vector in rng.standard_normal((lookups, dim)).astype(np.float32):
+        await cache.lookup(vector)
+    stats = await cache.stats()
+    return stats["lookup_ms_p50"], stats["lookup_ms_p95"]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--intents", type=int, default=1000)
+    parser.add_argument("--zipf", type=float, default=1.0, help="Popularity skew of the intents")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.7, 0.8, 0.9, 0.95])
+    parser.add_argument("--embedder", choices=["hashing", "sentence-transformers"], default="hashing")
+    parser.add_argument("--llm-seconds", type=float, default=2.0, help="Wall time of one answer generation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 50_000], help="Cache sizes for the latency table")
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder() if args.embedder == "hashing" else get_embedder(args.embedder)
+    questions = workload(args)
+    distinct = len({intent for intent, _ in questions})
+    print(f"{args.questions} questions over {distinct} intents ({args.embedder} embeddings); "
+          f"an ideal cache answers {1 - distinct / args.questions:.1%}")
+    print(f"{'threshold':>9} | {'hit rate':>8} | {'false hits':>10} | {'saved LLM':>9} | {'saved min':>9} | "
+          f"{'p50 ms':>8} | {'p95 ms':>8} | {'entries':>7}")
+    for threshold in args.thresholds:
+        print(await replay(embedder, questions, threshold, args.llm_seconds))
+
+    print(f"\n{'entries':>8} | {'lookup p50 ms':>13} | {'lookup p95 ms':>13}")
+    for size in args.sizes:
+        p50, p95 = await lookup_latency(embedder.dim, size)
+        print(f"{size:>8} | {p50:>13.3f} | {p95:>13.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
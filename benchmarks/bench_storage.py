@@ -0,0 +1,150 @@
+"""
+Benchmark: on-disk size of the article and story tables.
+
+Builds the same synthetic corpus (NewsAPI-shaped payloads, article bodies drawn from a
+Zipf-distributed vocabulary, stories spread over half a year) into three SQLite databases:
+uncompressed content with the full NewsAPI payload in `raw_json`, compressed content with the
+compact payload, and the latter after archiving everything older than the retention window.
+Sizes come from SQLite's `dbstat` table (tables plus their indexes) and the file size after
+VACUUM. Run from the project root:
+
+    python -m benchmarks.bench_storage --articles 20000 --days 180 --retention-days 90
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.db.models import Base, RawArticle, Story, StorySource
+from src.db.types import CompressedText
+from src.services import retention
+from src.services.news_fetcher import compact_payload
+
+TABLES = ("raw_article", "story", "story_source")
+
+
+def corpus(articles: int, days: int, seed: int = 11) -> tuple[list[dict], list[dict]]:
+    """NewsAPI payloads with their ingestion time, and story summaries with their sources."""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(20000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    now = datetime.now(timezone.utc)
+
+    payloads = []
+    for i in range(articles):
+        ingested_at = now - timedelta(days=days * i / articles)
+        outlet = f"outlet-{i % 60}"
+        words = rng.choices(vocabulary, weights, k=rng.randint(400, 1200))
+        body = ". ".join(" ".join(words[j:j + 14]) for j in range(0, len(words), 14))
+        payloads.append({
+            "ingested_at": ingested_at,
+            "body": body,
+            "payload": {
+                "source": {"id": outlet if i % 3 else None, "name": outlet.replace("-", " ").title()},
+                "author": f"Reporter {i % 400}",
+                "title": f"Headline {i}: " + " ".join(words[:8]),
+                "description": " ".join(words[8:40]),
+                "url": f"https://{outlet}.example.com/{ingested_at:%Y/%m/%d}/story-{i}",
+                "urlToImage": f"https://cdn.{outlet}.example.com/images/{i}.jpg",
+                "publishedAt": ingested_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "content": " ".join(words[:40])[:200] + "… [+4821 chars]",
+            },
+        })
+    stories = [
+        {"created_at": payloads[i]["ingested_at"], "sources": list(range(i, min(i + 4, articles))),
+         "summary": "## Key developments\n\n" + " ".join(rng.choices(vocabulary, weights, k=250))}
+        for i in range(0, articles, 4)
+    ]
+    return payloads, stories
+
+
+async def build(path: Path, payloads: list[dict], stories: list[dict], compact: bool) -> async_sessionmaker:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    ids = [uuid4() for _ in payloads]
+    article_rows = [
+        {
+            "id": article_id, "source_id": p["payload"]["source"]["id"] or p["payload"]["source"]["name"],
+            "url": p["payload"]["url"], "urlToImage": p["payload"]["urlToImage"], "title": p["payload"]["title"],
+            "content": p["body"], "raw_json": compact_payload(p["payload"]) if compact else p["payload"],
+            "published_at": p["ingested_at"], "ingested_at": p["ingested_at"], "processed": True,
+        }
+        for article_id, p in zip(ids, payloads)
+    ]
+    story_rows, link_rows = [], []
+    for i, story in enumerate(stories):
+        story_rows.append({"id": uuid4(), "title": f"Story {i}", "summary": story["summary"], "created_at": story["created_at"],
+                           "category": "AI", "sentiment_score": 0.1, "citation_verified": True, "llm_cost_usd": 0.0})
+        link_rows += [{"story_id": story_rows[-1]["id"], "raw_article_id": ids[j]} for j in story["sources"]]
+
+    CompressedText.codec = "zstd" if compact else "none"
+    try:
+        async with sessionmaker() as session:
+            for model, rows in ((RawArticle, article_rows), (Story, story_rows), (StorySource, link_rows)):
+                for start in range(0, len(rows), 1000):
+                    await session.execute(insert(model), rows[start:start + 1000])
+            await session.commit()
+    finally:
+        CompressedText.codec = "zstd"
+    return sessionmaker
+
+
+def table_sizes(path: Path) -> dict[str, int]:
+    """Bytes per table, its indexes included, and the whole file after VACUUM."""
+    with sqlite3.connect(path) as conn:
+        conn.execute("VACUUM")
+        rows = conn.execute(
+            "SELECT s.tbl_name, SUM(d.pgsize) FROM dbstat AS d JOIN sqlite_schema AS s ON s.name = d.name GROUP BY s.tbl_name"
+        ).fetchall()
+    return {**dict(rows), "file": path.stat().st_size}
+
+
+async def main_async(args):
+    payloads, stories = corpus(args.articles, args.days)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        results = {}
+        for name, compact in (("baseline", False), ("compact", True)):
+            sessionmaker = await build(tmp / f"{name}.db", payloads, stories, compact)
+            await sessionmaker.kw["bind"].dispose()
+            results[name] = table_sizes(tmp / f"{name}.db")
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp / 'compact.db'}")
+        start = time.perf_counter()
+        report = await retention.archive(async_sessionmaker(bind=engine, class_=AsyncSession), args.retention_days, tmp / "archive")
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+        results[f"retained {args.retention_days}d"] = table_sizes(tmp / "compact.db")
+
+        print(f"{args.articles} articles and {len(stories)} stories over {args.days} days (sizes in MB)")
+        print(f"{'database':>16} | " + " | ".join(f"{t:>12}" for t in (*TABLES, "file")))
+        for name, sizes in results.items():
+            print(f"{name:>16} | " + " | ".join(f"{sizes.get(t, 0) / 1e6:>12.2f}" for t in (*TABLES, "file")))
+        print(
+            f"archived {report.stories} stories and {report.articles} articles in {elapsed:.1f}s "
+            f"to {report.parts} parts ({report.bytes_written / 1e6:.2f} MB)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=180, help="Span of ingestion times in the corpus")
+    parser.add_argument("--retention-days", type=int, default=90)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
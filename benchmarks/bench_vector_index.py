@@ -0,0 +1,108 @@
+"""
+Benchmark: vector index query latency and recall vs. brute force.
+
+Fills a throwaway index with synthetic chunk embeddings (unit vectors scattered around topic
+centers, like chunks of stories about the same events), trains the IVF lists, then times
+queries through the IVF index and through an exact scan of the same memory-mapped matrix.
+Recall@k is measured against exact float32 search, so it includes any int8 quantization
+loss. Run from the project root:
+
+    python -m benchmarks.bench_vector_index --sizes 10000 100000 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from uuid import uuid4
+
+import numpy as np
+
+from src.services.vector_index import VectorIndex
+
+_ADD_BATCH = 50_000
+
+
+def topic_centers(count: int, dim: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+
+
+def synthetic_batch(rng: np.random.Generator, centers: np.ndarray, size: int, noise: float) -> np.ndarray:
+    vectors = centers[rng.integers(0, len(centers), size)] + noise * rng.standard_normal((size, centers.shape[1]), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def percentile_ms(samples: list[float], q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+
+def run(size: int, args) -> list[str]:
+    rng = np.random.default_rng(size)
+    centers = topic_centers(max(size // 200, 10), args.dim, seed=size)
+    queries = synthetic_batch(rng, centers, args.queries, args.noise)
+
+    lines = []
+    with tempfile.TemporaryDirectory() as path:
+        index = VectorIndex(path, dim=args.dim, dtype=args.dtype, nprobe=args.nprobe[0])
+        # Exact float32 top-k, merged batch by batch as the vectors are generated
+        truth_rows = np.empty((args.queries, 0), dtype=np.int64)
+        truth_scores = np.empty((args.queries, 0), dtype=np.float32)
+        start = time.perf_counter()
+        for offset in range(0, size, _ADD_BATCH):
+            batch = synthetic_batch(rng, centers, min(_ADD_BATCH, size - offset), args.noise)
+            index.add(batch, [uuid4() for _ in range(len(batch))], "article", [0] * len(batch))
+            rows = np.concatenate([truth_rows, np.broadcast_to(np.arange(offset, offset + len(batch)), (args.queries, len(batch)))], axis=1)
+            scores = np.concatenate([truth_scores, queries @ batch.T], axis=1)
+            keep = np.argsort(-scores, axis=1)[:, :args.k]
+            truth_rows = np.take_along_axis(rows, keep, axis=1)
+            truth_scores = np.take_along_axis(scores, keep, axis=1)
+        add_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.train()
+        train_seconds = time.perf_counter() - start
+
+        def measure(search) -> tuple[list[float], float]:
+            latencies, recalls = [], []
+            for q, truth in zip(queries, truth_rows):
+                start = time.perf_counter()
+                rows, _ = search(q)
+                latencies.append(time.perf_counter() - start)
+                recalls.append(len(set(rows.tolist()) & set(truth.tolist())) / args.k)
+            return latencies, float(np.mean(recalls))
+
+        latencies, recall = measure(lambda q: index.exact_search(q, args.k))
+        brute_p50 = percentile_ms(latencies, 50)
+        lines.append(
+            f"{size:>9} | {'exact':>9} | {brute_p50:>8.2f} | {percentile_ms(latencies, 95):>8.2f} | "
+            f"{recall:>9.3f} | {1.0:>7.1f}x | add {add_seconds:.1f}s, train {train_seconds:.1f}s, {len(index.centroids)} lists"
+        )
+        for nprobe in args.nprobe:
+            latencies, recall = measure(lambda q: index.search_rows(q, args.k, nprobe=nprobe))
+            p50 = percentile_ms(latencies, 50)
+            lines.append(
+                f"{size:>9} | {f'ivf/{nprobe}':>9} | {p50:>8.2f} | {percentile_ms(latencies, 95):>8.2f} | "
+                f"{recall:>9.3f} | {brute_p50 / p50:>7.1f}x |"
+            )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=384, help="Embedding width (all-MiniLM-L6-v2 is 384)")
+    parser.add_argument("--dtype", choices=["float32", "int8"], default="int8")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--noise", type=float, default=1.0, help="Per-component spread of chunks around their topic")
+    args = parser.parse_args()
+
+    print(f"dim={args.dim} dtype={args.dtype} k={args.k} queries={args.queries}")
+    print(f"{'chunks':>9} | {'search':>9} | {'p50 ms':>8} | {'p95 ms':>8} | {'recall@k':>9} | {'speedup':>8} |")
+    for size in args.sizes:
+        for line in run(size, args):
+            print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Local stand-ins for the external services Sentinel talks to.
+Everything here runs on 127.0.0.1 so benchmarks never touch the real internet.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PARAGRAPHS = [
+    "Researchers unveiled a new generation of language models that reason more reliably across long documents.",
+    "The release follows months of benchmarking against open and proprietary systems on math and coding tasks.",
+    "Industry analysts expect the efficiency gains to lower inference costs for enterprise customers this year.",
+    "Critics cautioned that evaluation suites still miss failure modes that appear only in production traffic.",
+    "The company said it would publish model weights and a technical report under a permissive license.",
+]
+
+
+_EVENT_PATH = re.compile(r"event-(\d+)/")
+
+
+def event_paragraphs(event: int, count: int = 8) -> list[str]:
+    """Sentences about one synthetic news event; different events share few words, so they don't cluster."""
+    rng = random.Random(event)
+    terms = [f"{rng.choice(('Quantix', 'Veridian', 'Solace', 'Arbor', 'Nimbus'))}{rng.randrange(10_000)}" for _ in range(6)]
+    return [
+        f"{terms[i % 6]} and {terms[(i + 1) % 6]} announced {rng.choice(('a chip', 'a model', 'a merger', 'a policy', 'a dataset'))} "
+        f"worth {rng.randrange(10, 900)} million dollars, according to filings reviewed on day {event} of the quarter."
+        for i in range(count)
+    ]
+
+
+def article_html(slug: str, event: int | None = None) -> str:
+    """A realistic-enough news page: navigation and footer boilerplate around a main article body."""
+    paragraphs = PARAGRAPHS * 2 if event is None else event_paragraphs(event)
+    body = "\n".join(f"<p>{p} ({slug}, paragraph {i})</p>" for i, p in enumerate(paragraphs))
+    return f"""<!DOCTYPE html>
+<html><head><title>{slug}</title></head>
+<body>
+<nav><a href="/">Home</a> <a href="/tech">Tech</a> <a href="/world">World</a></nav>
+<article><h1>Story {slug}</h1>{body}</article>
+<footer>Subscribe to our newsletter. All rights reserved.</footer>
+</body></html>"""
+
+
+class _ArticleHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        event = _EVENT_PATH.search(self.path)
+        payload = article_html(self.path.strip("/") or "index", int(event.group(1)) if event else None).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeArticleSites:
+    """
+    Serves static article pages from `hosts` local HTTP servers (one port per fake publisher),
+    so per-host concurrency limits are exercised the same way they are against real sites.
+    """
+    def __init__(self, hosts: int = 4, latency: float = 0.0):
+        handler = type("Handler", (_ArticleHandler,), {"latency": latency})
+        self.servers = [ThreadingHTTPServer(("127.0.0.1", 0), handler) for _ in range(hosts)]
+        for server in self.servers:
+            server.daemon_threads = True
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def base_urls(self) -> list[str]:
+        return [f"http://127.0.0.1:{server.server_address[1]}" for server in self.servers]
+
+    def urls(self, count: int) -> list[str]:
+        bases = self.base_urls
+        return [f"{bases[i % len(bases)]}/article-{i}" for i in range(count)]
+
+    def __enter__(self):
+        for server in self.servers:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def __exit__(self, *exc_info):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+def newsapi_corpus(sites: FakeArticleSites, queries: list[str], per_query: int, articles_per_event: int = 4) -> dict[str, list[dict]]:
+    """NewsAPI payloads (query -> articles) pointing at `sites`; every event is covered by several outlets."""
+    bases = sites.base_urls
+    now = datetime.now(timezone.utc)
+    corpus = {}
+    for q, query in enumerate(queries):
+        articles = []
+        for i in range(per_query):
+            n = q * per_query + i
+            event = n // articles_per_event
+            lead = event_paragraphs(event, 1)[0]
+            articles.append({
+                "source": {"id": f"outlet-{n % 40}", "name": f"Outlet {n % 40}"},
+                "author": f"Reporter {n % 97}",
+                "title": f"Event {event}: {lead.split(' announced')[0]} announce new deal",
+                "description": lead,
+                "url": f"{bases[n % len(bases)]}/event-{event}/article-{n}",
+                "urlToImage": None,
+                "publishedAt": (now - timedelta(minutes=n)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "content": lead[:200],
+            })
+        corpus[query] = articles
+    return corpus
+
+
+class _NewsAPIHandler(BaseHTTPRequestHandler):
+    corpus: dict[str, list[dict]] = {}
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        params = {key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        articles = self.corpus.get(params.get("q"), [])
+        page, page_size = int(params.get("page", 1)), int(params.get("pageSize", 100))
+        payload = json.dumps({
+            "status": "ok",
+            "totalResults": len(articles),
+            "articles": articles[(page - 1) * page_size:page * page_size],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeNewsAPI:
+    """A local `/v2/everything` endpoint paging through a fixed corpus (see `newsapi_corpus`)."""
+    def __init__(self, corpus: dict[str, list[dict]], latency: float = 0.0):
+        handler = type("Handler", (_NewsAPIHandler,), {"corpus": corpus, "latency": latency})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v2/everything"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
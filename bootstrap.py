@@ -1,6 +1,7 @@
 import asyncio
 from dotenv import load_dotenv
 from src.db.session import init_db, AsyncSessionLocal
+from src.services.crawl_scheduler import CrawlScheduler
 from src.services.news_fetcher import NewsFetcherService
 
 # Load environment variables
@@ -13,15 +14,18 @@ async def main():
     print("📦 Creating database tables...")
     await init_db()
     
-    # 2. Run the Ingestion Pipeline
+    # 2. Run the first crawl; it sets the watermarks later runs continue from
     print("📰 Starting Ingestion Service...")
     fetcher = NewsFetcherService()
     
-    async with AsyncSessionLocal() as session:
-        # Let's fetch 5 articles for our initial test
-        await fetcher.run_ingestion(session=session, limit=5)
+    try:
+        # Fetch up to 5 articles per tracked query for our initial test
+        await CrawlScheduler(fetcher, AsyncSessionLocal, limit=5).run_once()
+    finally:
+        await fetcher.aclose()
         
     print("✅ Bootstrap complete! Check your database.")
+    print("⏱️ Keep it fresh with: python -m src.services.crawl_scheduler")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
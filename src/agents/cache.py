@@ -0,0 +1,210 @@
+"""
+Persistent response cache in front of the LLM chains.
+With `LLM_TEMPERATURE = 0` a prompt always gets the same answer, so re-running the processor
+on the same articles (after a crash or a downstream fix) can replay Researcher and Editor
+responses from a local SQLite file instead of paying for them again.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import BaseModel
+
+from src.config.config import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+_TOUCH_BATCH = 256      # Hits whose `accessed_at` update is written in one transaction
+
+
+def normalize_prompt(value: Any) -> str:
+    """Role + whitespace-collapsed content of every message, so formatting noise doesn't miss the cache."""
+    if hasattr(value, "to_messages"):
+        value = value.to_messages()
+    if not isinstance(value, list):
+        value = [value]
+    return json.dumps([
+        [getattr(m, "type", "human"), " ".join(str(getattr(m, "content", m)).split())]
+        for m in value
+    ])
+
+
+class ResponseCache:
+    """
+    SQLite-backed key/value store for LLM responses.
+    Entries older than `ttl_seconds` are treated as misses; beyond `max_entries` the least
+    recently used ones are evicted. The file is opened lazily and shared between threads.
+    Hits only note their access time in memory; the updates are written in batches, and always
+    before an eviction reads them, so a hit costs one SELECT.
+    """
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_seconds: float | None = LLM_CACHE_TTL_SECONDS,
+        max_entries: int | None = LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._entries = 0
+        self._touched: dict[str, float] = {}
+
+    @staticmethod
+    def key(namespace: str, prompt: str) -> str:
+        return hashlib.sha256(f"{namespace}\x00{prompt}".encode()).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_responses_accessed ON llm_responses (accessed_at)")
+            if self.ttl_seconds is not None:
+                self._conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._entries = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        return self._conn
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            row = conn.execute("SELECT payload, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._entries -= 1
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touched(conn)
+            self.hits += 1
+            return row[0]
+
+    def _flush_touched(self, conn: sqlite3.Connection):
+        if not self._touched:
+            return
+        conn.execute("BEGIN")
+        conn.executemany("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", [(at, key) for key, at in self._touched.items()])
+        conn.execute("COMMIT")
+        self._touched.clear()
+
+    def put(self, key: str, payload: str):
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            exists = conn.execute("SELECT 1 FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._entries += exists is None
+            self._touched.pop(key, None)
+            if self.max_entries is not None and self._entries > self.max_entries:
+                self._flush_touched(conn)
+                excess = self._entries - self.max_entries
+                conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN "
+                    "(SELECT key FROM llm_responses ORDER BY accessed_at ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._entries -= excess
+                self.evictions += excess
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self._entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM llm_responses")
+            self._entries = 0
+            self._touched.clear()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touched(self._conn)
+                self._conn.close()
+                self._conn = None
+
+
+def _encode(output: Any) -> str:
+    if isinstance(output, BaseMessage):
+        return json.dumps({"message": message_to_dict(output)})
+    if isinstance(output, BaseModel):
+        return json.dumps({"schema": output.model_dump(mode="json")})
+    raise TypeError(f"Cannot cache LLM output of type {type(output).__name__}")
+
+
+def _decode(payload: str, schema: type | None) -> Any:
+    data = json.loads(payload)
+    if "schema" in data:
+        return schema.model_validate(data["schema"])
+    return messages_from_dict([data["message"]])[0]
+
+
+def cached(runnable: Runnable, cache: ResponseCache, namespace: str, schema: type | None = None) -> Runnable:
+    """
+    Wraps a runnable so identical prompts under the same `namespace` (model, temperature,
+    output schema) are answered from `cache`. Hits skip the rate limiter and concurrency cap.
+    The async path runs the SQLite reads and writes in a thread, off the event loop.
+    """
+    def lookup(value: Any) -> tuple[str, Any]:
+        key = cache.key(namespace, normalize_prompt(value))
+        payload = cache.get(key)
+        if payload is None:
+            return key, None
+        try:
+            return key, _decode(payload, schema)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable LLM cache entry {key[:12]}: {e}")
+            return key, None
+
+    def call(value: Any, config: RunnableConfig):
+        key, output = lookup(value)
+        if output is None:
+            output = runnable.invoke(value, config)
+            cache.put(key, _encode(output))
+        return output
+
+    async def acall(value: Any, config: RunnableConfig):
+        key, output = await asyncio.to_thread(lookup, value)
+        if output is None:
+            output = await runnable.ainvoke(value, config)
+            await asyncio.to_thread(cache.put, key, _encode(output))
+        return output
+
+    return RunnableLambda(call, afunc=acall, name=runnable.get_name())
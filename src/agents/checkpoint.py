@@ -0,0 +1,121 @@
+"""
+Durable checkpoints for graph runs.
+A checkpointed graph saves its state after every node, so a batch interrupted mid-way through a
+Researcher/Editor loop resumes from the last completed node instead of paying for it again.
+Checkpoints store article IDs in place of `raw_articles`; the content is re-attached from the
+cluster states the batch is restarted with.
+"""
+
+import hashlib
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import aiosqlite
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from src.agents.state import AgentState
+from src.config.config import GRAPH_CHECKPOINT_URL
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+ARTICLE_IDS = "__article_ids__"
+
+
+class ArticleStore:
+    """Article dicts by ID, for re-attaching content to checkpoints that only kept the IDs."""
+    def __init__(self):
+        self._articles: dict[str, dict] = {}
+
+    def add(self, articles: list[dict]):
+        for article in articles:
+            self._articles[str(article["id"])] = article
+
+    def resolve(self, ids: list[str]) -> list[dict]:
+        missing = [i for i in ids if i not in self._articles]
+        if missing:
+            raise KeyError(f"Checkpoint references {len(missing)} unknown article(s), e.g. {missing[0]}; "
+                           "register the cluster's raw_articles before loading it")
+        return [self._articles[i] for i in ids]
+
+
+class CompactSerializer(SerializerProtocol):
+    """
+    Wraps LangGraph's serializer, replacing every list of article dicts with their IDs on
+    the way out and looking the articles back up in `articles` on the way in.
+    """
+    def __init__(self, articles: ArticleStore | None = None, inner: SerializerProtocol | None = None):
+        self.articles = articles or ArticleStore()
+        self.inner = inner or JsonPlusSerializer(allowed_msgpack_modules=[("src.agents.state", "SynthesizedStory")])
+
+    @staticmethod
+    def _is_articles(value: Any) -> bool:
+        return isinstance(value, list) and bool(value) and all(
+            isinstance(a, dict) and "id" in a and "content" in a for a in value
+        )
+
+    def _compact(self, obj: Any) -> Any:
+        # `raw_articles` shows up both inside whole checkpoints and as a bare channel write
+        if self._is_articles(obj):
+            self.articles.add(obj)
+            return {ARTICLE_IDS: [str(a["id"]) for a in obj]}
+        if isinstance(obj, dict):
+            return {key: self._compact(value) for key, value in obj.items()}
+        return obj
+
+    def _expand(self, obj: Any) -> Any:
+        if not isinstance(obj, dict):
+            return obj
+        if set(obj) == {ARTICLE_IDS}:
+            return self.articles.resolve(obj[ARTICLE_IDS])
+        return {key: self._expand(value) for key, value in obj.items()}
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        return self.inner.dumps_typed(self._compact(obj))
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        return self._expand(self.inner.loads_typed(data))
+
+
+def thread_id(state: AgentState) -> str:
+    """Stable per cluster, so a restarted batch finds its own checkpoints."""
+    ids = sorted(str(a["id"]) for a in state["raw_articles"])
+    return hashlib.sha256("\n".join(ids).encode()).hexdigest()[:32]
+
+
+def register_articles(checkpointer: BaseCheckpointSaver, state: AgentState):
+    if isinstance(checkpointer.serde, CompactSerializer):
+        checkpointer.serde.articles.add(state["raw_articles"])
+
+
+@asynccontextmanager
+async def open_checkpointer(url: str = GRAPH_CHECKPOINT_URL) -> AsyncIterator[BaseCheckpointSaver]:
+    """
+    A checkpoint saver with compact serialization. `url` is a SQLite file path, or "postgres"
+    to keep checkpoints in the application database configured in `src/db/session.py`.
+    """
+    serde = CompactSerializer()
+    if url == "postgres":
+        try:
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+        except ImportError as e:
+            raise ImportError("Postgres checkpoints need the 'langgraph-checkpoint-postgres' package") from e
+        from src.db.session import DATABASE_URL
+        # The saver talks to Postgres through psycopg, not the SQLAlchemy asyncpg driver
+        async with AsyncPostgresSaver.from_conn_string(DATABASE_URL.replace("+asyncpg", "")) as saver:
+            saver.serde = serde
+            await saver.setup()
+            yield saver
+        return
+
+    if url != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(url)), exist_ok=True)
+    async with aiosqlite.connect(url) as conn:
+        saver = AsyncSqliteSaver(conn, serde=serde)
+        await saver.setup()
+        logger.info(f"Graph checkpoints stored in {url}")
+        yield saver
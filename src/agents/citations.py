@@ -0,0 +1,134 @@
+"""
+Set-based citation check between the Researcher and the Editor.
+Every `source_article_ids` entry is looked up in the cluster's precomputed ID set, and every
+cited article must actually support part of the summary, measured as word n-gram overlap
+between summary sentences and the article's content. The ID set, per-article n-gram sets and
+the sources' vocabulary (used by the Editor pre-checks) are built once per cluster and reused
+across revision iterations.
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+
+from src.agents.state import AgentState, SynthesizedStory
+from src.config.config import CITATION_INDEX_CACHE_SIZE, CITATION_MIN_OVERLAP, CITATION_NGRAM_SIZE
+from src.logger.custom_logger import get_logger
+from src.logger.tracing import traced
+
+logger = get_logger(__name__)
+
+_WORD = re.compile(r"\w+")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_NUMBER = re.compile(r"(?<![\w.,])\d+(?:[.,]\d+)*")
+
+
+def ngrams(text: str, size: int = CITATION_NGRAM_SIZE) -> set[int]:
+    """Hashed word n-grams; hashing keeps the per-article sets compact and fast to intersect."""
+    words = _WORD.findall(text.lower())
+    return set(map(hash, zip(*(words[i:] for i in range(size)))))
+
+
+def numbers(text: str) -> set[str]:
+    """Numbers as written, without thousands separators ("1,200" and "1200" are the same)."""
+    return {re.sub(r",(?=\d{3}\b)", "", number) for number in _NUMBER.findall(text)}
+
+
+@dataclass
+class CitationReport:
+    unknown_ids: list[str] = field(default_factory=list)        # Not in the cluster
+    unsupported_ids: list[str] = field(default_factory=list)    # In the cluster, but back no sentence
+    unsupported_sentences: list[str] = field(default_factory=list)  # Backed by none of the cited articles
+
+    @property
+    def verified(self) -> bool:
+        return not self.unknown_ids and not self.unsupported_ids
+
+    def feedback(self) -> str:
+        parts = []
+        if self.unknown_ids:
+            parts.append(f"Unknown source IDs (not in the provided articles): {', '.join(self.unknown_ids)}.")
+        if self.unsupported_ids:
+            parts.append(f"Cited articles that support none of the summary: {', '.join(self.unsupported_ids)}.")
+        return "CITATION CHECK FAILED. " + " ".join(parts) + " Cite only articles whose content backs your claims."
+
+
+class CitationIndex:
+    """The cluster's article IDs, the n-gram set of every article, and the words and numbers they contain."""
+    def __init__(
+        self,
+        raw_articles: list[dict],
+        ngram_size: int = CITATION_NGRAM_SIZE,
+        min_overlap: float = CITATION_MIN_OVERLAP,
+    ):
+        self.ngram_size = ngram_size
+        self.min_overlap = min_overlap
+        texts = {str(a["id"]): f"{a.get('title', '')}\n{a.get('content') or ''}" for a in raw_articles}
+        self.grams = {article_id: ngrams(text, ngram_size) for article_id, text in texts.items()}
+        self.ids = frozenset(self.grams)
+        self.words = frozenset(word for text in texts.values() for word in _WORD.findall(text.lower()))
+        self.numbers = frozenset(number for text in texts.values() for number in numbers(text))
+
+    def check(self, story: SynthesizedStory) -> CitationReport:
+        report = CitationReport()
+        cited = []
+        for article_id in dict.fromkeys(story.source_article_ids):
+            (cited if article_id in self.ids else report.unknown_ids).append(article_id)
+
+        sentences, needed = [], []
+        by_gram: dict[int, list[int]] = {}       # Summary n-gram -> sentences containing it
+        for sentence in _SENTENCE_SPLIT.split(story.summary):
+            sentence = sentence.strip()
+            grams = ngrams(sentence, self.ngram_size)
+            if sentence.startswith("#") or not grams:
+                continue
+            for gram in grams:
+                by_gram.setdefault(gram, []).append(len(sentences))
+            sentences.append(sentence)
+            needed.append(self.min_overlap * len(grams))
+
+        # One C-level set intersection per cited article finds the few n-grams it shares with
+        # the summary; only those are credited to sentences
+        summary_grams = set(by_gram)
+        backed = [False] * len(sentences)
+        for article_id in cited:
+            hits = Counter(s for gram in self.grams[article_id] & summary_grams for s in by_gram[gram])
+            supported = [s for s, count in hits.items() if count >= needed[s]]
+            if not supported:
+                report.unsupported_ids.append(article_id)
+            for s in supported:
+                backed[s] = True
+
+        report.unsupported_sentences = [sentence for sentence, ok in zip(sentences, backed) if not ok]
+        return report
+
+
+_index_cache: OrderedDict[tuple[str, ...], CitationIndex] = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def citation_index(raw_articles: list[dict]) -> CitationIndex:
+    """Cached per cluster, so revision iterations don't re-tokenize the sources."""
+    key = tuple(str(a["id"]) for a in raw_articles)
+    with _index_lock:
+        if key in _index_cache:
+            _index_cache.move_to_end(key)
+            return _index_cache[key]
+    index = CitationIndex(raw_articles)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > CITATION_INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+@traced("graph.citation_check")
+def citation_check(state: AgentState) -> dict:
+    """Graph node: flags the draft and, if citations fail, hands the Researcher concrete feedback."""
+    report = citation_index(state["raw_articles"]).check(state["draft_story"])
+    if report.verified:
+        logger.info("🔗 Citation Check: all citations verified")
+        return {"citation_verified": True}
+    logger.warning(f"🔗 Citation Check: {len(report.unknown_ids)} unknown, {len(report.unsupported_ids)} unsupported citation(s)")
+    return {"citation_verified": False, "editor_feedback": report.feedback()}
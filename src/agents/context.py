@@ -0,0 +1,285 @@
+"""
+Token-budgeted context builder for the Researcher prompt.
+Cleans each article (boilerplate and sentences already seen in another source are dropped),
+splits a token budget across articles by relevance and length, and renders the prompt in one pass.
+Revision prompts use `select_passages` to send only the sentences the Editor's feedback is about.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from src.config.config import (
+    LLM_CONTEXT_WINDOW,
+    RESEARCHER_CONTEXT_TOKENS,
+    RESEARCHER_MIN_ARTICLE_TOKENS,
+    RESEARCHER_REVISION_PASSAGE_TOKENS,
+)
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"\w+")
+_BOILERPLATE = re.compile(
+    r"\b(subscribe|sign up|newsletter|all rights reserved|cookie|advertisement|read more|"
+    r"click here|follow us|share this|related articles|terms of (use|service)|privacy policy)\b",
+    re.IGNORECASE,
+)
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with "
+    "please should could would more less make made draft summary story article articles source sources".split()
+)
+
+
+class Tokenizer(Protocol):
+    def count(self, text: str) -> int: ...
+
+
+class RegexTokenizer:
+    """
+    Dependency-free approximation of a BPE tokenizer: words and punctuation are tokens,
+    and long words count one extra token per 4 characters.
+    """
+    def count(self, text: str) -> int:
+        return sum(1 + (len(tok) - 1) // 4 for tok in _TOKEN.findall(text))
+
+
+class TiktokenTokenizer:
+    """Exact BPE counts via the optional `tiktoken` package."""
+    def __init__(self, encoding: str = "cl100k_base"):
+        import tiktoken
+        self.encoding = tiktoken.get_encoding(encoding)
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+_default_tokenizer: Tokenizer | None = None
+
+
+def get_tokenizer() -> Tokenizer:
+    """`tiktoken` when installed and its encoding can be loaded, otherwise the regex approximation."""
+    global _default_tokenizer
+    if _default_tokenizer is None:
+        try:
+            _default_tokenizer = TiktokenTokenizer()
+        except ImportError:
+            _default_tokenizer = RegexTokenizer()
+        except Exception as e:
+            # tiktoken downloads its encoding on first use; offline hosts fall back to the approximation
+            logger.warning(f"tiktoken encoding unavailable ({e!r}); counting tokens approximately")
+            _default_tokenizer = RegexTokenizer()
+    return _default_tokenizer
+
+
+def count_tokens(text: str) -> int:
+    return get_tokenizer().count(text)
+
+
+@dataclass
+class BuiltContext:
+    text: str
+    tokens: int                     # Tokens in `text`
+    original_tokens: int            # Tokens the naive full-content context would have used
+    article_tokens: dict[str, int] = field(default_factory=dict)
+    dropped_sentences: int = 0
+    dropped_articles: int = 0       # Lowest-ranked sources left out because even their floor did not fit
+
+
+@dataclass
+class _Article:
+    id: str
+    header: str
+    sentences: list[str]
+    sentence_tokens: list[int]
+    header_tokens: int = 0
+    relevance: float = 1.0
+    allocation: int = 0
+
+    @property
+    def demand(self) -> int:
+        return sum(self.sentence_tokens)
+
+
+def _normalize(sentence: str) -> str:
+    return " ".join(_WORD.findall(sentence.lower()))
+
+
+class ContextBuilder:
+    """
+    Renders `raw_articles` into the Researcher's context within `token_budget` tokens.
+    Articles sharing more vocabulary with the rest of the cluster are considered more
+    relevant and receive a larger share of the budget; nobody gets more than it needs.
+    Headers count against the budget, and when a large cluster cannot give every article its
+    header plus `min_article_tokens`, only the most relevant articles that fit are included.
+    """
+    def __init__(
+        self,
+        token_budget: int = RESEARCHER_CONTEXT_TOKENS,
+        min_article_tokens: int = RESEARCHER_MIN_ARTICLE_TOKENS,
+        tokenizer: Tokenizer | None = None,
+    ):
+        self.token_budget = min(token_budget, LLM_CONTEXT_WINDOW)
+        self.min_article_tokens = min_article_tokens
+        self.tokenizer = tokenizer or get_tokenizer()
+
+    def _prepare(self, raw_articles: list[dict]) -> tuple[list[_Article], int]:
+        seen: set[str] = set()
+        dropped = 0
+        articles = []
+        for art in raw_articles:
+            sentences = []
+            for sentence in _SENTENCE_SPLIT.split(art.get("content") or ""):
+                sentence = sentence.strip()
+                key = _normalize(sentence)
+                if not key or _BOILERPLATE.search(sentence) or key in seen:
+                    dropped += bool(key)
+                    continue
+                seen.add(key)
+                sentences.append(sentence)
+            header = f"ID: {art['id']}\nTitle: {art.get('title', '')}\nContent: "
+            articles.append(_Article(
+                id=str(art["id"]),
+                header=header,
+                sentences=sentences,
+                sentence_tokens=[self.tokenizer.count(s + " ") for s in sentences],
+                header_tokens=self.tokenizer.count(header + "\n\n"),
+            ))
+        return articles, dropped
+
+    @staticmethod
+    def _score(articles: list[_Article]):
+        """Relevance = share of an article's vocabulary that other sources in the cluster also use."""
+        vocabularies = [set(_WORD.findall(" ".join(a.sentences).lower())) for a in articles]
+        document_frequency: dict[str, int] = {}
+        for vocabulary in vocabularies:
+            for term in vocabulary:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        for article, vocabulary in zip(articles, vocabularies):
+            if len(articles) == 1 or not vocabulary:
+                article.relevance = 1.0
+                continue
+            shared = sum(document_frequency[t] > 1 for t in vocabulary)
+            article.relevance = 0.2 + shared / len(vocabulary)
+
+    def _select(self, articles: list[_Article]) -> list[_Article]:
+        """The most relevant articles whose headers and floors fit the budget, in their original order."""
+        ranked = sorted(range(len(articles)), key=lambda i: -articles[i].relevance)
+        kept, used = set(), 0
+        for i in ranked:
+            cost = articles[i].header_tokens + min(articles[i].demand, self.min_article_tokens)
+            if used + cost <= self.token_budget:
+                kept.add(i)
+                used += cost
+        return [article for i, article in enumerate(articles) if i in kept]
+
+    def _allocate(self, articles: list[_Article], budget: int):
+        """Weighted water-filling: split by relevance, cap at demand, redistribute the leftovers."""
+        open_articles = [a for a in articles if a.demand > 0]
+        for article in open_articles:
+            article.allocation = min(article.demand, self.min_article_tokens)
+        budget -= sum(a.allocation for a in open_articles)
+        open_articles = [a for a in open_articles if a.allocation < a.demand]
+        while budget > 0 and open_articles:
+            total_weight = sum(a.relevance for a in open_articles)
+            spent = 0
+            for article in open_articles:
+                share = max(1, int(budget * article.relevance / total_weight))
+                grant = min(share, article.demand - article.allocation, budget - spent)
+                article.allocation += grant
+                spent += grant
+            budget -= spent
+            open_articles = [a for a in open_articles if a.allocation < a.demand]
+            if spent == 0:
+                break
+
+    def build(self, raw_articles: list[dict]) -> BuiltContext:
+        articles, dropped = self._prepare(raw_articles)
+        original_tokens = sum(
+            self.tokenizer.count(f"ID: {a['id']}\nTitle: {a.get('title', '')}\nContent: {a.get('content') or ''}\n\n")
+            for a in raw_articles
+        )
+
+        self._score(articles)
+        kept = self._select(articles)
+        dropped_articles = len(articles) - len(kept)
+        dropped += sum(len(a.sentences) for a in articles) - sum(len(a.sentences) for a in kept)
+        articles = kept
+        self._allocate(articles, self.token_budget - sum(a.header_tokens for a in articles))
+
+        parts: list[str] = []
+        article_tokens: dict[str, int] = {}
+        for article in articles:
+            used = 0
+            kept = []
+            # News is written lead-first, so keep sentences in order until the allocation runs out
+            for sentence, tokens in zip(article.sentences, article.sentence_tokens):
+                if used + tokens > article.allocation:
+                    break
+                kept.append(sentence)
+                used += tokens
+            dropped += len(article.sentences) - len(kept)
+            parts.append(article.header)
+            parts.append(" ".join(kept))
+            parts.append("\n\n")
+            article_tokens[article.id] = used
+
+        text = "".join(parts)
+        return BuiltContext(
+            text=text,
+            tokens=self.tokenizer.count(text),
+            original_tokens=original_tokens,
+            article_tokens=article_tokens,
+            dropped_sentences=dropped,
+            dropped_articles=dropped_articles,
+        )
+
+
+def build_context(raw_articles: list[dict], token_budget: int = RESEARCHER_CONTEXT_TOKENS) -> BuiltContext:
+    return ContextBuilder(token_budget=token_budget).build(raw_articles)
+
+
+def select_passages(
+    raw_articles: list[dict],
+    feedback: str,
+    token_budget: int = RESEARCHER_REVISION_PASSAGE_TOKENS,
+    tokenizer: Tokenizer | None = None,
+) -> str:
+    """
+    Picks the source sentences an Editor's feedback refers to: sentences from articles the
+    feedback cites by ID come first, then sentences sharing the most terms with the feedback.
+    """
+    tokenizer = tokenizer or get_tokenizer()
+    feedback_terms = set(_WORD.findall(feedback.lower())) - _STOPWORDS
+    cited = {
+        str(art["id"]) for art in raw_articles
+        if re.search(rf"(?<![\w-]){re.escape(str(art['id']))}(?![\w-])", feedback)
+    }
+
+    candidates = []
+    for art in raw_articles:
+        article_id = str(art["id"])
+        for position, sentence in enumerate(_SENTENCE_SPLIT.split(art.get("content") or "")):
+            sentence = sentence.strip()
+            if not sentence or _BOILERPLATE.search(sentence):
+                continue
+            overlap = len(feedback_terms & set(_WORD.findall(sentence.lower())))
+            if article_id in cited or overlap:
+                candidates.append((article_id in cited, overlap, -position, article_id, sentence))
+    candidates.sort(reverse=True)
+
+    by_article: dict[str, list[str]] = {}
+    used = 0
+    for *_, article_id, sentence in candidates:
+        tokens = tokenizer.count(f"- {sentence}\n")
+        if used + tokens > token_budget:
+            continue
+        by_article.setdefault(article_id, []).append(sentence)
+        used += tokens
+    return "".join(
+        f"ID: {article_id}\n" + "".join(f"- {sentence}\n" for sentence in sentences) + "\n"
+        for article_id, sentences in by_article.items()
+    )
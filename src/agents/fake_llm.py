@@ -0,0 +1,129 @@
+"""
+A deterministic, offline stand-in for the chat model used by the agents.
+It injects configurable latency, reports token usage like a real provider, supports
+`with_structured_output(SynthesizedStory)`, and records every call so tests and
+benchmarks can measure tokens and wall time without network access.
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.agents.context import count_tokens
+
+_ID_LINE = re.compile(r"^ID: (.+)$", re.MULTILINE)
+_TITLE_LINE = re.compile(r"^Title: (.+)$", re.MULTILINE)
+_CONTENT_LINE = re.compile(r"^Content: (.+)$", re.MULTILINE)
+
+
+@dataclass
+class FakeCall:
+    kind: str               # "researcher" (structured output), "chat" or "editor" (free text)
+    input_tokens: int
+    output_tokens: int
+    seconds: float
+
+
+@dataclass
+class FakeLLMStats:
+    """Shared by a model and every structured-output copy made from it."""
+    calls: list[FakeCall] = field(default_factory=list)
+    editor_calls: int = 0
+
+    def tokens(self, kind: str | None = None) -> int:
+        return sum(c.input_tokens for c in self.calls if kind is None or c.kind == kind)
+
+
+class FakeChatModel(BaseChatModel):
+    model_name: str = "fake-chat"
+    latency: float = 0.0            # Seconds per call
+    latency_per_1k_input: float = 0.0  # Extra seconds per 1k prompt tokens (prefill cost)
+    output_tokens: int = 150        # Reported completion tokens per call
+    reject_first: int = 0           # Editor calls answered with feedback before approving
+    stats: FakeLLMStats = Field(default_factory=FakeLLMStats)
+    structured_schema: Any = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name}
+
+    def _draft(self, prompt: str) -> str:
+        ids = [i.strip() for i in _ID_LINE.findall(prompt)]
+        titles = _TITLE_LINE.findall(prompt)
+        lead = " ".join(c.split(". ")[0].rstrip(".") + "." for c in _CONTENT_LINE.findall(prompt)[:3])
+        if "PREVIOUS DRAFT" in prompt:
+            title = re.search(r"^TITLE: (.+)$", prompt, re.MULTILINE)
+            cited = re.search(r"^SOURCE IDS: (.*)$", prompt, re.MULTILINE)
+            previous = re.search(r"^SUMMARY:\n## Key developments\n\n(.*?)\n\nEDITOR FEEDBACK", prompt, re.MULTILINE | re.DOTALL)
+            feedback = re.search(r"^EDITOR FEEDBACK TO ADDRESS: (.+)$", prompt, re.MULTILINE)
+            titles = [title.group(1)] if title else titles
+            ids = [i.strip() for i in cited.group(1).split(",") if i.strip()] if cited else ids
+            # Like a well-behaved model, stop citing whatever the feedback calls out by ID
+            called_out = set(re.findall(r"[\w-]+", feedback.group(1))) if feedback else set()
+            ids = [i for i in ids if i not in called_out]
+            lead = f"{previous.group(1) + ' ' if previous else ''}Revised to address the editor's feedback."
+        return json.dumps({
+            "title": titles[0] if titles else "Daily digest",
+            "summary": f"## Key developments\n\n{lead or 'No new facts.'}",
+            "source_article_ids": list(dict.fromkeys(ids)),
+        })
+
+    def _respond(self, messages: list[BaseMessage]) -> tuple[ChatResult, float]:
+        started = time.perf_counter()
+        prompt = "\n".join(str(m.content) for m in messages)
+        if self.structured_schema is not None:
+            kind, content = "researcher", self._draft(prompt)
+        elif "\nQUESTION: " in prompt:
+            passages = re.findall(r"^\[(\d+)\]", prompt, re.MULTILINE)
+            kind = "chat"
+            content = f"Answered from {len(passages)} passage(s) " + " ".join(f"[{p}]" for p in passages[:3])
+        else:
+            kind = "editor"
+            self.stats.editor_calls += 1
+            content = "APPROVED" if self.stats.editor_calls > self.reject_first else (
+                "Tighten the opening paragraph and make sure every figure matches the cited sources."
+            )
+        input_tokens = count_tokens(prompt)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": self.output_tokens,
+                "total_tokens": input_tokens + self.output_tokens,
+            },
+            response_metadata={"model_name": self.model_name},
+        )
+        delay = self.latency + self.latency_per_1k_input * input_tokens / 1000
+        self.stats.calls.append(FakeCall(kind, input_tokens, self.output_tokens, time.perf_counter() - started + delay))
+        return ChatResult(generations=[ChatGeneration(message=message)]), delay
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        result, delay = self._respond(messages)
+        if delay:
+            time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        result, delay = self._respond(messages)
+        if delay:
+            await asyncio.sleep(delay)
+        return result
+
+    def with_structured_output(self, schema: type[BaseModel], **kwargs):
+        structured = self.model_copy(update={"structured_schema": schema})
+        return structured | RunnableLambda(lambda message: schema.model_validate_json(message.content))
@@ -1,7 +1,21 @@
-from langgraph.graph import StateGraph, END
+"""
+The Researcher -> citation check -> pre-check -> Editor workflow.
+LangGraph, LangChain and the agent nodes are only imported when the graph is first built, so
+processes that never run it (crawlers, the feed API, most tests) don't pay for them at startup.
+`get_app()` compiles the graph once; `app` is kept as a lazily resolved module attribute.
+"""
+
+from functools import cache
+from typing import TYPE_CHECKING
+
 from src.agents.state import AgentState
-from src.agents.nodes import researcher_agent, editor_agent
+from src.config.config import GRAPH_MAX_ITERATIONS as MAX_ITERATIONS
 from src.logger.custom_logger import get_logger
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+    from langgraph.graph import StateGraph
+
 logger = get_logger(__name__)
 
 
@@ -12,35 +26,108 @@ def should_publish(state: AgentState):
         return "publish"
     
     # Guardrail: Prevent infinite loops if the LLMs get stuck arguing
-    if state["iteration_count"] >= 3:
+    if state["iteration_count"] >= MAX_ITERATIONS:
         logger.warning("⚠️ Max iterations reached. Forcing approval.")
         return "publish"
         
     return "revise"
 
 
+def citations_valid(state: AgentState):
+    """Bad citations go straight back to the Researcher, without spending an Editor call."""
+    if state["citation_verified"]:
+        return "review"
+
+    # Same guardrail as the Editor loop; the story is stored with citation_verified=False
+    if state["iteration_count"] >= MAX_ITERATIONS:
+        logger.warning("⚠️ Max iterations reached with unverified citations. Sending to the Editor.")
+        return "review"
+
+    return "revise"
+
+
+def prechecks_passed(state: AgentState):
+    """Drafts that fail the rule-based checks are sent back before the Editor's LLM call."""
+    if state["precheck_passed"]:
+        return "review"
+
+    # Same guardrail again; the Editor reviews the last draft
+    if state["iteration_count"] >= MAX_ITERATIONS:
+        logger.warning("⚠️ Max iterations reached with a draft failing pre-checks. Sending to the Editor.")
+        return "review"
+
+    return "revise"
+
+
 # --- BUILD THE GRAPH ---
-workflow = StateGraph(AgentState)
-
-# Add nodes (Agents)
-workflow.add_node("researcher", researcher_agent)
-workflow.add_node("editor", editor_agent)
-
-# Set the entry point
-workflow.set_entry_point("researcher")
-
-# Connect researcher to editor
-workflow.add_edge("researcher", "editor")
-
-# Conditional logic: Editor either approves (END) or rejects (Back to Researcher)
-workflow.add_conditional_edges(
-    "editor",
-    should_publish,
-    {
-        "publish": END,
-        "revise": "researcher"
-    }
-)
-
-# Compile the graph into an executable application
-app = workflow.compile()
\ No newline at end of file
+@cache
+def build_workflow() -> "StateGraph":
+    from langchain_core.runnables import RunnableLambda
+    from langgraph.graph import StateGraph, END
+    from src.agents.citations import citation_check
+    from src.agents.nodes import researcher_agent, aresearcher_agent, editor_agent, aeditor_agent
+    from src.agents.prechecks import editor_precheck
+
+    workflow = StateGraph(AgentState)
+
+    # Add nodes (Agents). Each node has a sync and an async implementation,
+    # so the same compiled app serves `app.invoke` and `app.ainvoke`.
+    workflow.add_node("researcher", RunnableLambda(researcher_agent, afunc=aresearcher_agent, name="researcher"))
+    workflow.add_node("citation_check", citation_check)
+    workflow.add_node("precheck", editor_precheck)
+    workflow.add_node("editor", RunnableLambda(editor_agent, afunc=aeditor_agent, name="editor"))
+
+    # Set the entry point
+    workflow.set_entry_point("researcher")
+
+    # Every draft is checked against the cluster before the Editor sees it
+    workflow.add_edge("researcher", "citation_check")
+    workflow.add_conditional_edges(
+        "citation_check",
+        citations_valid,
+        {
+            "review": "precheck",
+            "revise": "researcher"
+        }
+    )
+
+    # Cheap rule-based checks catch obviously bad drafts without an Editor call
+    workflow.add_conditional_edges(
+        "precheck",
+        prechecks_passed,
+        {
+            "review": "editor",
+            "revise": "researcher"
+        }
+    )
+
+    # Conditional logic: Editor either approves (END) or rejects (Back to Researcher)
+    workflow.add_conditional_edges(
+        "editor",
+        should_publish,
+        {
+            "publish": END,
+            "revise": "researcher"
+        }
+    )
+    return workflow
+
+
+def compile_app(checkpointer: "BaseCheckpointSaver | None" = None):
+    """With a checkpointer, state is saved after every node and runs resume per `thread_id`."""
+    return build_workflow().compile(checkpointer=checkpointer)
+
+
+@cache
+def get_app():
+    """The graph without a checkpointer, compiled on first use and shared by the process."""
+    return compile_app()
+
+
+def __getattr__(name: str):
+    # `from src.agents.graph import app` keeps working; it compiles the graph at that point
+    if name == "app":
+        return get_app()
+    if name == "workflow":
+        return build_workflow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,213 @@
+"""
+Process-wide LLM client registry.
+Chat models are built once per (backend, model, temperature) and shared by every node call,
+so HTTP connection pools and structured-output wrappers are reused instead of rebuilt.
+Every runnable handed out is capped to `LLM_MAX_CONCURRENCY` in-flight requests,
+rate-limited against the provider's RPM/TPM quotas, and reports its token usage and cost.
+Deterministic (temperature 0) runnables sit behind the persistent response cache, so
+replays never reach the provider.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from src.config.config import (
+    LLM,
+    LLM_BACKEND,
+    LLM_CACHE_ENABLED,
+    LLM_BASE_URL,
+    LLM_EXPECTED_COMPLETION_TOKENS,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TEMPERATURE,
+    LLM_TOKENS_PER_MINUTE,
+)
+from src.agents.cache import ResponseCache, cached
+from src.agents.context import count_tokens
+from src.agents.rate_limit import RateLimiter
+from src.agents.usage import usage_handler
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+ModelKey = tuple[str, str, float]
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight calls from both sync code (threads) and async code (any event loop)."""
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._thread_slots = threading.BoundedSemaphore(limit)
+        self._loop_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def thread_slot(self) -> threading.BoundedSemaphore:
+        return self._thread_slots
+
+    def loop_slot(self) -> asyncio.Semaphore:
+        # asyncio primitives are bound to one loop, so each loop gets its own semaphore
+        loop = asyncio.get_running_loop()
+        if loop not in self._loop_slots:
+            self._loop_slots[loop] = asyncio.Semaphore(self.limit)
+        return self._loop_slots[loop]
+
+
+def _estimate_tokens(value: Any) -> int:
+    """Prompt tokens of a runnable input plus the completion we expect back."""
+    if hasattr(value, "to_messages"):
+        value = value.to_messages()
+    if isinstance(value, list):
+        text = "\n".join(str(getattr(m, "content", m)) for m in value)
+    else:
+        text = str(value)
+    return count_tokens(text) + LLM_EXPECTED_COMPLETION_TOKENS
+
+
+def bounded(runnable: Runnable, limiter: ConcurrencyLimiter, rate_limiter: RateLimiter | None = None) -> Runnable:
+    """
+    Wraps a runnable so `invoke`/`ainvoke` respect the provider's RPM/TPM quotas
+    and wait for a free slot in `limiter`.
+    """
+    def call(value: Any, config: RunnableConfig):
+        if rate_limiter is not None:
+            rate_limiter.acquire_sync(_estimate_tokens(value))
+        with limiter.thread_slot():
+            return runnable.invoke(value, config)
+
+    async def acall(value: Any, config: RunnableConfig):
+        if rate_limiter is not None:
+            await rate_limiter.acquire(_estimate_tokens(value))
+        async with limiter.loop_slot():
+            return await runnable.ainvoke(value, config)
+
+    return RunnableLambda(call, afunc=acall, name=runnable.get_name())
+
+
+def _build_model(backend: str, model: str, temperature: float) -> BaseChatModel:
+    limits = httpx.Limits(max_connections=LLM_MAX_CONCURRENCY, max_keepalive_connections=LLM_MAX_CONCURRENCY)
+    if backend == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(
+            model_name=model,
+            temperature=temperature,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=httpx.Client(limits=limits),
+            http_async_client=httpx.AsyncClient(limits=limits),
+        )
+    if backend == "openai":
+        # Any OpenAI-compatible server, e.g. a local vLLM/Ollama/llama.cpp stub
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            base_url=LLM_BASE_URL,
+            api_key=os.getenv("OPENAI_API_KEY", "not-needed"),
+            max_retries=LLM_MAX_RETRIES,
+            http_client=httpx.Client(limits=limits),
+            http_async_client=httpx.AsyncClient(limits=limits),
+        )
+    if backend == "fake":
+        from src.agents.fake_llm import FakeChatModel
+        return FakeChatModel(model_name=model)
+    raise ValueError(f"Unknown LLM backend '{backend}'. Expected 'groq', 'openai' or 'fake'.")
+
+
+def _instrument(chat_model: BaseChatModel) -> BaseChatModel:
+    """Attaches the token/cost accounting callback (once) to a chat model."""
+    callbacks = list(chat_model.callbacks or [])
+    if usage_handler not in callbacks:
+        chat_model.callbacks = [*callbacks, usage_handler]
+    return chat_model
+
+
+class LLMRegistry:
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        requests_per_minute: float | None = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float | None = LLM_TOKENS_PER_MINUTE,
+        cache: ResponseCache | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._models: dict[ModelKey, BaseChatModel] = {}
+        self._limiters: dict[ModelKey, ConcurrencyLimiter] = {}
+        self._rate_limiters: dict[ModelKey, RateLimiter] = {}
+        self._runnables: dict[tuple, Runnable] = {}
+
+    def _key(self, model: str, temperature: float, backend: str | None) -> ModelKey:
+        return (backend or LLM_BACKEND, model, float(temperature))
+
+    def register(self, chat_model: BaseChatModel, model: str = LLM, temperature: float = LLM_TEMPERATURE, backend: str | None = None):
+        """Installs a pre-built model (e.g. a configured fake) under a registry key."""
+        key = self._key(model, temperature, backend)
+        with self._lock:
+            self._models[key] = _instrument(chat_model)
+            self._runnables = {k: v for k, v in self._runnables.items() if k[0] != key}
+
+    def model(self, model: str = LLM, temperature: float = LLM_TEMPERATURE, backend: str | None = None) -> BaseChatModel:
+        """The shared, unwrapped chat model for this key."""
+        key = self._key(model, temperature, backend)
+        with self._lock:
+            if key not in self._models:
+                logger.info(f"Creating shared LLM client: backend={key[0]} model={model} temperature={temperature}")
+                self._models[key] = _instrument(_build_model(*key))
+            return self._models[key]
+
+    def _limiter(self, key: ModelKey) -> ConcurrencyLimiter:
+        with self._lock:
+            if key not in self._limiters:
+                self._limiters[key] = ConcurrencyLimiter(self.max_concurrency)
+            return self._limiters[key]
+
+    def rate_limiter(self, model: str = LLM, temperature: float = LLM_TEMPERATURE, backend: str | None = None) -> RateLimiter:
+        """Provider quotas apply per model, so every temperature of a model shares one limiter."""
+        key = self._key(model, 0, backend)
+        with self._lock:
+            if key not in self._rate_limiters:
+                self._rate_limiters[key] = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+            return self._rate_limiters[key]
+
+    def runnable(self, schema: type | None = None, model: str = LLM, temperature: float = LLM_TEMPERATURE, backend: str | None = None) -> Runnable:
+        """The concurrency-capped chat model, or its cached `with_structured_output(schema)` runnable."""
+        key = self._key(model, temperature, backend)
+        cache_key = (key, schema)
+        if cache_key not in self._runnables:
+            chat_model = self.model(model, temperature, backend)
+            inner = chat_model.with_structured_output(schema) if schema is not None else chat_model
+            wrapped = bounded(inner, self._limiter(key), self.rate_limiter(model, temperature, backend))
+            # Sampled outputs aren't reproducible, so only temperature 0 is worth replaying
+            if self.cache is not None and key[2] == 0:
+                namespace = f"{key[0]}:{model}:{key[2]}:{getattr(schema, '__name__', 'text')}"
+                wrapped = cached(wrapped, self.cache, namespace, schema)
+            with self._lock:
+                self._runnables.setdefault(cache_key, wrapped)
+        return self._runnables[cache_key]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._limiters.clear()
+            self._rate_limiters.clear()
+            self._runnables.clear()
+
+
+registry = LLMRegistry(cache=ResponseCache() if LLM_CACHE_ENABLED else None)
+
+
+def get_llm(model: str = LLM, temperature: float = LLM_TEMPERATURE, backend: str | None = None) -> Runnable:
+    return registry.runnable(None, model, temperature, backend)
+
+
+def get_structured_llm(schema: type, model: str = LLM, temperature: float = LLM_TEMPERATURE, backend: str | None = None) -> Runnable:
+    return registry.runnable(schema, model, temperature, backend)
@@ -1,68 +1,114 @@
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_groq import ChatGroq
+from src.agents.context import build_context, select_passages
+from src.agents.llm import get_llm, get_structured_llm
 from src.agents.state import AgentState, SynthesizedStory
-from src.config.config import LLM, LLM_TEMPERATURE
+from src.agents.usage import UsageMeter, add_usage, track_usage
+from src.config.config import LLM, LLM_TEMPERATURE, RESEARCHER_REVISION_MODE
 
 from src.logger.custom_logger import get_logger
+from src.logger.tracing import traced
 logger = get_logger(__name__)
 
 # --- NODES (The Agents) ---
-def researcher_agent(state: AgentState):
-    logger.info("🧠 Researcher Agent: Synthesizing articles...")
-    
-    # Initialize Groq LLM locally (Lazy Initialization)
-    researcher_llm = ChatGroq(temperature=LLM_TEMPERATURE, model_name=LLM)
-    structured_researcher = researcher_llm.with_structured_output(SynthesizedStory)
-    
+def _researcher_messages(state: AgentState) -> list[BaseMessage]:
+    """Full synthesis prompt on the first pass; a compact revision prompt after an Editor rejection."""
     articles = state["raw_articles"]
     feedback = state.get("editor_feedback")
-    
-    # Format the articles for the prompt
-    context = ""
-    for art in articles:
-        context += f"ID: {art['id']}\nTitle: {art['title']}\nContent: {art['content'][:1000]}...\n\n"
+    draft = state.get("draft_story")
+
+    if RESEARCHER_REVISION_MODE and draft is not None and feedback:
+        # Only the previous draft, the feedback and the passages it refers to
+        passages = select_passages(articles, feedback)
+        return [
+            SystemMessage("You are an expert AI News Analyst revising your own digest. Apply the editor's feedback "
+                          "with minimal changes. Only include facts present in the draft or the source passages. "
+                          "You MUST return the IDs of the articles you used."),
+            HumanMessage(f"PREVIOUS DRAFT\nTITLE: {draft.title}\nSOURCE IDS: {', '.join(draft.source_article_ids)}\n"
+                         f"SUMMARY:\n{draft.summary}\n\nEDITOR FEEDBACK TO ADDRESS: {feedback}\n\n"
+                         f"RELEVANT SOURCE PASSAGES:\n{passages}"),
+        ]
+
+    # Format the articles for the prompt within the token budget
+    context = build_context(articles).text
 
     # If the editor rejected a previous draft, we include the feedback
     feedback_prompt = f"\nEDITOR FEEDBACK TO ADDRESS: {feedback}" if feedback else ""
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are an expert AI News Analyst. Synthesize the provided articles into a single, cohesive daily digest. "
-                   "Only include facts present in the articles. You MUST return the IDs of the articles you used."),
-        ("user", f"Here are the articles:\n{context}{feedback_prompt}")
-    ])
-    
-    chain = prompt | structured_researcher
-    result = chain.invoke({})
-    
+    return [
+        SystemMessage("You are an expert AI News Analyst. Synthesize the provided articles into a single, cohesive daily digest. "
+                      "Only include facts present in the articles. You MUST return the IDs of the articles you used."),
+        HumanMessage(f"Here are the articles:\n{context}{feedback_prompt}"),
+    ]
+
+def _researcher_chain(state: AgentState):
+    # Shared client from the process-wide registry (pooled connections, cached structured output)
+    structured_researcher = get_structured_llm(SynthesizedStory, model=LLM, temperature=LLM_TEMPERATURE)
+
+    # Message objects (not templates), so braces in article text are never parsed as variables
+    prompt = ChatPromptTemplate.from_messages(_researcher_messages(state))
+    return prompt | structured_researcher
+
+def _researcher_update(state: AgentState, result: SynthesizedStory, usage: UsageMeter) -> dict:
     return {
         "draft_story": result,
-        "iteration_count": state.get("iteration_count", 0) + 1
+        "iteration_count": state.get("iteration_count", 0) + 1,
+        "usage": add_usage(state.get("usage"), "researcher", usage),
     }
 
-def editor_agent(state: AgentState):
-    logger.info("🧐 Editor Agent: Reviewing draft...")
-    
-    # Initialize Groq LLM locally (Lazy Initialization)
-    editor_llm = ChatGroq(temperature=LLM_TEMPERATURE, model_name=LLM)
-    
+@traced("graph.researcher")
+def researcher_agent(state: AgentState):
+    logger.info("🧠 Researcher Agent: Synthesizing articles...")
+    with track_usage("researcher") as usage:
+        result = _researcher_chain(state).invoke({})
+    return _researcher_update(state, result, usage)
+
+@traced("graph.researcher")
+async def aresearcher_agent(state: AgentState):
+    logger.info("🧠 Researcher Agent: Synthesizing articles...")
+    with track_usage("researcher") as usage:
+        result = await _researcher_chain(state).ainvoke({})
+    return _researcher_update(state, result, usage)
+
+def editor_messages(state: AgentState) -> list[BaseMessage]:
+    """The Editor's prompt; the pre-checks also size it to count the tokens a skipped call saves."""
     draft = state["draft_story"]
-    articles = state["raw_articles"]
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a strict Managing Editor. Review the draft story against the provided source articles. "
-                   "Look for hallucinations, bias, or poor formatting. "
-                   "If it is perfect, reply with exactly 'APPROVED'. "
-                   "If it needs work, provide 1-2 sentences of specific feedback."),
-        ("user", f"DRAFT TITLE: {draft.title}\n\nDRAFT SUMMARY:\n{draft.summary}\n\nDo you approve?")
-    ])
-    
-    chain = prompt | editor_llm
-    result = chain.invoke({})
+    return [
+        SystemMessage("You are a strict Managing Editor. Review the draft story against the provided source articles. "
+                      "Look for hallucinations, bias, or poor formatting. "
+                      "If it is perfect, reply with exactly 'APPROVED'. "
+                      "If it needs work, provide 1-2 sentences of specific feedback."),
+        HumanMessage(f"DRAFT TITLE: {draft.title}\n\nDRAFT SUMMARY:\n{draft.summary}\n\nDo you approve?")
+    ]
+
+def _editor_chain(state: AgentState):
+    # Shared client from the process-wide registry
+    editor_llm = get_llm(model=LLM, temperature=LLM_TEMPERATURE)
+
+    prompt = ChatPromptTemplate.from_messages(editor_messages(state))
+    return prompt | editor_llm
+
+def _editor_update(state: AgentState, result, usage: UsageMeter) -> dict:
     feedback = result.content.strip()
+    usage = add_usage(state.get("usage"), "editor", usage)
     
     if "APPROVED" in feedback.upper():
         logger.info("✅ Editor Agent: Story Approved!")
-        return {"is_approved": True, "editor_feedback": None}
+        return {"is_approved": True, "editor_feedback": None, "usage": usage}
     else:
         logger.warning(f"❌ Editor Agent: Revision needed - {feedback}")
-        return {"is_approved": False, "editor_feedback": feedback}
\ No newline at end of file
+        return {"is_approved": False, "editor_feedback": feedback, "usage": usage}
+
+@traced("graph.editor")
+def editor_agent(state: AgentState):
+    logger.info("🧐 Editor Agent: Reviewing draft...")
+    with track_usage("editor") as usage:
+        result = _editor_chain(state).invoke({})
+    return _editor_update(state, result, usage)
+
+@traced("graph.editor")
+async def aeditor_agent(state: AgentState):
+    logger.info("🧐 Editor Agent: Reviewing draft...")
+    with track_usage("editor") as usage:
+        result = await _editor_chain(state).ainvoke({})
+    return _editor_update(state, result, usage)
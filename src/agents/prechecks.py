@@ -0,0 +1,149 @@
+"""
+Rule-based checks between the citation check and the Editor.
+Drafts that are empty, too short or too long, have broken Markdown, cite nothing, or state
+numbers or names that appear in none of the sources go straight back to the Researcher with
+generated feedback, so the Editor's LLM call is only spent on drafts that could pass. Every
+skipped call is counted under "editor_avoided" in `AgentState["usage"]` (with the tokens and
+cost the Editor's prompt would have had) and in the Prometheus metrics.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from src.agents.citations import CitationIndex, citation_index, numbers
+from src.agents.context import count_tokens
+from src.agents.nodes import editor_messages
+from src.agents.state import AgentState, SynthesizedStory
+from src.agents.usage import UsageMeter, estimate_cost, merge_usage
+from src.config.config import (
+    GRAPH_MAX_ITERATIONS,
+    LLM,
+    PRECHECK_EDITOR_OUTPUT_TOKENS,
+    PRECHECK_MAX_SUMMARY_WORDS,
+    PRECHECK_MAX_TITLE_CHARS,
+    PRECHECK_MIN_NUMBER,
+    PRECHECK_MIN_SUMMARY_WORDS,
+)
+from src.logger.custom_logger import get_logger
+from src.logger.metrics import metrics
+from src.logger.tracing import traced
+
+logger = get_logger(__name__)
+
+EDITOR_CALLS_AVOIDED = metrics.counter(
+    "sentinel_editor_calls_avoided_total", "Editor LLM calls skipped because a draft failed the pre-checks.", ("check",)
+)
+EDITOR_TOKENS_AVOIDED = metrics.counter(
+    "sentinel_editor_tokens_avoided_total", "Estimated prompt + completion tokens of the skipped Editor calls."
+)
+
+_WORD = re.compile(r"\w+")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_LINE_MARKER = re.compile(r"^\s*(?:[-*+>]|\d+[.)])\s+")
+_BAD_HEADING = re.compile(r"^#{1,6}(?:[^#\s]|\s*$)")
+_UNCLOSED_LINK = re.compile(r"\[[^\]\n]*\]\([^)\n]*$")
+_CAPITALIZED = re.compile(r"\b[A-Z][\w'’-]*")
+_CLAUSE_START = tuple(":;(\"“‘'—–")
+# Capitalized anyway, and summaries name the day or month even when sources give a date
+_CALENDAR = frozenset(
+    "monday tuesday wednesday thursday friday saturday sunday january february march april may june "
+    "july august september october november december".split()
+)
+
+
+@dataclass
+class PrecheckReport:
+    problems: dict[str, str] = field(default_factory=dict)     # Check name -> what is wrong
+
+    @property
+    def passed(self) -> bool:
+        return not self.problems
+
+    def feedback(self) -> str:
+        return "PRE-CHECK FAILED. " + " ".join(self.problems.values())
+
+
+def _markdown_problems(summary: str) -> list[str]:
+    problems = []
+    if summary.count("```") % 2:
+        problems.append("a ``` code fence is never closed")
+    for line in summary.splitlines():
+        line = line.strip()
+        if _BAD_HEADING.match(line):
+            problems.append(f"malformed heading {line[:40]!r}")
+        elif line.count("**") % 2:
+            problems.append(f"unbalanced ** in {line[:40]!r}")
+        elif line.count("[") != line.count("]") or _UNCLOSED_LINK.search(line):
+            problems.append(f"broken link or brackets in {line[:40]!r}")
+    return problems
+
+
+def _unsupported_facts(summary: str, index: CitationIndex) -> tuple[list[str], list[str]]:
+    """
+    Numbers and capitalized names in the summary that appear in none of the sources. Words that
+    start a sentence or clause and day and month names are capitalized anyway, so they are not
+    taken for names: a false positive costs a whole Researcher call.
+    """
+    figures, names = {}, {}
+    for line in summary.splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        for sentence in _SENTENCE_SPLIT.split(_LINE_MARKER.sub("", line)):
+            sentence = re.sub(r"[*_`]", "", sentence).strip()
+            for number in numbers(sentence) - index.numbers:
+                if "." in number or "," in number or int(number) >= PRECHECK_MIN_NUMBER:
+                    figures.setdefault(number)
+            for match in _CAPITALIZED.finditer(sentence):
+                before = sentence[:match.start()].rstrip()
+                if not before or before.endswith(_CLAUSE_START) or match.group().lower() in _CALENDAR:
+                    continue
+                parts = [p for p in _WORD.findall(match.group().lower()) if len(p) > 1]
+                if any(p not in index.words for p in parts):
+                    names.setdefault(match.group().rstrip("'’-"))
+    return list(figures), list(names)
+
+
+def check_draft(story: SynthesizedStory, raw_articles: list[dict]) -> PrecheckReport:
+    report = PrecheckReport()
+    title, summary = story.title.strip(), story.summary.strip()
+    words = len(_WORD.findall(summary))
+
+    if not title:
+        report.problems["title"] = "The title is empty."
+    elif len(title) > PRECHECK_MAX_TITLE_CHARS:
+        report.problems["title"] = f"The title has {len(title)} characters; keep it under {PRECHECK_MAX_TITLE_CHARS}."
+    if words < PRECHECK_MIN_SUMMARY_WORDS:
+        report.problems["length"] = f"The summary has {words} words; write at least {PRECHECK_MIN_SUMMARY_WORDS}."
+    elif words > PRECHECK_MAX_SUMMARY_WORDS:
+        report.problems["length"] = f"The summary has {words} words; cut it to at most {PRECHECK_MAX_SUMMARY_WORDS}."
+    if not story.source_article_ids:
+        report.problems["sources"] = "No source article IDs are cited."
+    if markdown := _markdown_problems(summary):
+        report.problems["markdown"] = f"Fix the Markdown: {'; '.join(markdown[:3])}."
+
+    figures, names = _unsupported_facts(summary, citation_index(raw_articles))
+    if figures:
+        report.problems["numbers"] = f"These figures appear in no source: {', '.join(figures[:8])}."
+    if names:
+        report.problems["entities"] = f"These names appear in no source: {', '.join(names[:8])}."
+    return report
+
+
+@traced("graph.precheck")
+def editor_precheck(state: AgentState) -> dict:
+    """Graph node: flags the draft and, if it fails, hands the Researcher the generated feedback."""
+    report = check_draft(state["draft_story"], state["raw_articles"])
+    if report.passed:
+        logger.info("📏 Pre-check: draft passed")
+        return {"precheck_passed": True}
+
+    logger.warning(f"📏 Pre-check: {', '.join(report.problems)} failed")
+    update = {"precheck_passed": False, "editor_feedback": report.feedback()}
+    if state["iteration_count"] < GRAPH_MAX_ITERATIONS:
+        # The draft goes back to the Researcher: count the Editor call that isn't made
+        prompt = count_tokens("\n".join(str(m.content) for m in editor_messages(state)))
+        avoided = UsageMeter(1, prompt, PRECHECK_EDITOR_OUTPUT_TOKENS, estimate_cost(LLM, prompt, PRECHECK_EDITOR_OUTPUT_TOKENS))
+        EDITOR_CALLS_AVOIDED.inc(check=next(iter(report.problems)))
+        EDITOR_TOKENS_AVOIDED.inc(avoided.prompt_tokens + avoided.completion_tokens)
+        update["usage"] = merge_usage(state.get("usage"), {"editor_avoided": avoided.as_dict()})
+    return update
@@ -0,0 +1,67 @@
+"""
+Token-bucket rate limiting against the LLM provider's request (RPM) and token (TPM) quotas.
+"""
+
+import asyncio
+import threading
+import time
+
+from src.config.config import LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+
+
+class _Bucket:
+    def __init__(self, capacity: float, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+class RateLimiter:
+    """
+    Two token buckets refilled continuously over `period` seconds: one for requests, one for tokens.
+    `acquire` waits until both buckets can cover the call, then charges them. Safe to share
+    between threads and event loops.
+    """
+    def __init__(
+        self,
+        requests_per_period: float | None = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_period: float | None = LLM_TOKENS_PER_MINUTE,
+        period: float = 60.0,
+    ):
+        self._requests = _Bucket(requests_per_period, period) if requests_per_period else None
+        self._tokens = _Bucket(tokens_per_period, period) if tokens_per_period else None
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Charges both buckets and returns 0, or returns how long to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            buckets = [(b, amount) for b, amount in ((self._requests, 1), (self._tokens, tokens)) if b is not None]
+            for bucket, amount in buckets:
+                bucket.refill(now)
+                # A single request larger than the whole bucket would otherwise wait forever
+                wait = max(wait, bucket.wait_time(min(amount, bucket.capacity)))
+            if wait == 0.0:
+                for bucket, amount in buckets:
+                    bucket.level -= min(amount, bucket.capacity)
+            return wait
+
+    async def acquire(self, tokens: int = 0):
+        while (wait := self._try_acquire(tokens)) > 0:
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: int = 0):
+        while (wait := self._try_acquire(tokens)) > 0:
+            self.waited_seconds += wait
+            time.sleep(wait)
@@ -0,0 +1,105 @@
+"""
+Concurrent batch execution of the compiled LangGraph app.
+Runs many cluster states through `app.ainvoke` at once; LLM calls inside the nodes are
+further bounded by the registry's concurrency cap and RPM/TPM rate limiter.
+With a checkpointer, each cluster runs on its own thread and a restarted batch resumes
+every cluster from its last completed node.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.agents.graph import compile_app, get_app
+from src.agents.state import AgentState
+from src.agents.usage import merge_usage
+from src.config.config import GRAPH_BATCH_CONCURRENCY
+from src.logger.custom_logger import get_logger
+from src.logger.tracing import span
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class BatchRun:
+    results: list[AgentState | None]          # Final state per input, None if that run failed
+    errors: dict[int, BaseException] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(r is not None for r in self.results)
+
+    @property
+    def usage(self) -> dict:
+        """LLM usage of the finished runs, per node and in total."""
+        return merge_usage(*(r.get("usage") for r in self.results if r is not None))
+
+
+async def run_graph_batch(
+    states: list[AgentState],
+    concurrency: int = GRAPH_BATCH_CONCURRENCY,
+    graph=None,
+    config: dict | None = None,
+    checkpointer: "BaseCheckpointSaver | None" = None,
+) -> BatchRun:
+    """
+    Executes every state through the graph with at most `concurrency` runs in flight.
+    A failing cluster is logged and reported in `errors` without stopping the others.
+    """
+    if checkpointer is None:
+        graph = graph or get_app()
+    elif graph is None:
+        graph = compile_app(checkpointer)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run_one(state: AgentState):
+        async with limit:
+            with span("graph.run", articles=len(state.get("raw_articles") or ())):
+                if checkpointer is None:
+                    return await graph.ainvoke(state, config=config)
+                return await _run_checkpointed(graph, checkpointer, state, config)
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_one(state) for state in states), return_exceptions=True)
+    run = BatchRun(results=[], seconds=time.perf_counter() - start)
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"Graph run {index} failed: {outcome!r}")
+            run.errors[index] = outcome
+            run.results.append(None)
+        else:
+            run.results.append(outcome)
+
+    total = run.usage.get("total", {})
+    logger.info(
+        f"Graph batch finished: {run.succeeded}/{len(states)} clusters in {run.seconds:.2f}s",
+        llm_calls=total.get("calls", 0),
+        prompt_tokens=total.get("prompt_tokens", 0),
+        completion_tokens=total.get("completion_tokens", 0),
+        cost_usd=round(total.get("cost_usd", 0.0), 6),
+        editor_calls_avoided=run.usage.get("editor_avoided", {}).get("calls", 0),
+    )
+    return run
+
+
+async def _run_checkpointed(graph, checkpointer: "BaseCheckpointSaver", state: AgentState, config: dict | None):
+    from src.agents.checkpoint import register_articles, thread_id
+
+    register_articles(checkpointer, state)
+    thread_config = {**(config or {})}
+    thread_config["configurable"] = {**thread_config.get("configurable", {}), "thread_id": thread_id(state)}
+
+    snapshot = await graph.aget_state(thread_config)
+    if snapshot.values and not snapshot.next:
+        logger.info(f"Cluster {thread_config['configurable']['thread_id']} already finished, reusing its checkpoint")
+        return snapshot.values
+    if snapshot.next:
+        logger.info(f"Resuming cluster {thread_config['configurable']['thread_id']} at {', '.join(snapshot.next)}")
+        state = None
+    # "sync" durability writes each checkpoint before the next node starts
+    return await graph.ainvoke(state, config=thread_config, durability="sync")
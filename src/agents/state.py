@@ -15,4 +15,7 @@ class AgentState(TypedDict):
     draft_story: SynthesizedStory | None  # The output from the Researcher
     editor_feedback: str | None   # The critique from the Editor
     is_approved: bool             # The guardrail flag
-    iteration_count: int          # To prevent infinite loops
\ No newline at end of file
+    iteration_count: int          # To prevent infinite loops
+    citation_verified: bool       # Every cited ID is in the cluster and backs part of the summary
+    precheck_passed: bool         # The draft passed the rule-based checks in front of the Editor
+    usage: dict                   # LLM calls/tokens/cost/seconds per node and "total" (see agents/usage.py)
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Token usage and cost accounting for LLM calls.
+One callback handler is attached to every model the registry hands out. Each finished call's
+prompt/completion tokens, latency and estimated cost are
+  - added to the `UsageMeter` of the code that made it (`track_usage`), which graph nodes
+    fold into `AgentState["usage"]` so totals travel with the run and land on the Story;
+  - counted in the Prometheus metrics (`src/logger/metrics.py`), labelled by model and node;
+  - logged as an `llm_call` event, and recorded as an `llm.call` span when tracing is on.
+Responses replayed from the response cache never reach the model, so they cost nothing here.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.config.config import LLM_PRICES_PER_MILLION
+from src.logger.custom_logger import get_logger
+from src.logger.metrics import metrics
+from src.logger.tracing import tracer
+
+logger = get_logger(__name__)
+
+_LABELS = ("model", "node")
+LLM_CALLS = metrics.counter("sentinel_llm_calls_total", "LLM calls that returned a response.", _LABELS)
+LLM_ERRORS = metrics.counter("sentinel_llm_errors_total", "LLM calls that raised.", _LABELS)
+PROMPT_TOKENS = metrics.counter("sentinel_llm_prompt_tokens_total", "Prompt tokens reported by the provider.", _LABELS)
+COMPLETION_TOKENS = metrics.counter("sentinel_llm_completion_tokens_total", "Completion tokens reported by the provider.", _LABELS)
+COST_USD = metrics.counter("sentinel_llm_cost_usd_total", "Estimated spend from LLM_PRICES_PER_MILLION.", _LABELS)
+LATENCY = metrics.histogram("sentinel_llm_latency_seconds", "Wall time of one LLM call.", _LABELS)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD at the configured per-million-token prices; unlisted models cost 0."""
+    input_price, output_price = LLM_PRICES_PER_MILLION.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class UsageMeter:
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    seconds: float = 0.0
+
+    def add(self, other: "UsageMeter"):
+        self.calls += other.calls
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cost_usd += other.cost_usd
+        self.seconds += other.seconds
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class _Scope:
+    node: str
+    meter: UsageMeter
+
+
+_scope: ContextVar[_Scope | None] = ContextVar("llm_usage_scope", default=None)
+
+
+@contextmanager
+def track_usage(node: str) -> Iterator[UsageMeter]:
+    """Collects the usage of every LLM call made inside the block (threads and tasks included)."""
+    scope = _Scope(node, UsageMeter())
+    token = _scope.set(scope)
+    try:
+        yield scope.meter
+    finally:
+        _scope.reset(token)
+
+
+def merge_usage(*usages: dict | None) -> dict:
+    """Sums usage dicts (node -> UsageMeter fields) node by node."""
+    merged: dict[str, UsageMeter] = {}
+    for usage in usages:
+        for key, values in (usage or {}).items():
+            merged.setdefault(key, UsageMeter()).add(UsageMeter(**values))
+    return {key: meter.as_dict() for key, meter in merged.items()}
+
+
+def add_usage(usage: dict | None, node: str, meter: UsageMeter) -> dict:
+    """`AgentState["usage"]` with `meter` added under `node` and under "total"."""
+    return merge_usage(usage, {node: meter.as_dict(), "total": meter.as_dict()})
+
+
+def _token_counts(response: LLMResult) -> tuple[int, int]:
+    prompt = completion = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+    if not prompt and not completion:
+        # Providers that only report usage in `llm_output`
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt, completion = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    return prompt, completion
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    # Inline, so the handler sees the caller's context variables (and its `track_usage` scope)
+    run_inline = True
+
+    def __init__(self):
+        self._started: dict[UUID, tuple[float, int, str, _Scope | None]] = {}
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id: UUID, metadata: dict | None = None, **kwargs: Any):
+        model = (metadata or {}).get("ls_model_name") or "unknown"
+        self._started[run_id] = (time.perf_counter(), time.time_ns(), model, _scope.get())
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        if run_id not in self._started:
+            return
+        started, started_ns, model, scope = self._started.pop(run_id)
+        prompt, completion = _token_counts(response)
+        call = UsageMeter(1, prompt, completion, estimate_cost(model, prompt, completion), time.perf_counter() - started)
+        node = scope.node if scope is not None else "other"
+        if scope is not None:
+            scope.meter.add(call)
+
+        labels = {"model": model, "node": node}
+        LLM_CALLS.inc(**labels)
+        PROMPT_TOKENS.inc(prompt, **labels)
+        COMPLETION_TOKENS.inc(completion, **labels)
+        COST_USD.inc(call.cost_usd, **labels)
+        LATENCY.observe(call.seconds, **labels)
+        if tracer.enabled:
+            tracer.record("llm.call", started_ns, time.time_ns(), model=model, prompt_tokens=prompt, completion_tokens=completion)
+        logger.info(
+            "llm_call", model=model, node=node, prompt_tokens=prompt, completion_tokens=completion,
+            cost_usd=round(call.cost_usd, 6), seconds=round(call.seconds, 3),
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        if run_id not in self._started:
+            return
+        _, started_ns, model, scope = self._started.pop(run_id)
+        LLM_ERRORS.inc(model=model, node=scope.node if scope is not None else "other")
+        if tracer.enabled:
+            tracer.record("llm.call", started_ns, time.time_ns(), error=f"{type(error).__name__}: {error}", model=model)
+
+
+usage_handler = UsageCallbackHandler()
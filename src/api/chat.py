@@ -0,0 +1,29 @@
+"""
+The /chat endpoint: answers a question from the top-k story and article chunks, serving
+answers to semantically similar questions from the semantic cache.
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.schemas import ChatRequest, ChatResponse
+from src.db.session import get_session
+from src.services.chat import ChatService, get_chat_service
+
+router = APIRouter()
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat(
+    request: ChatRequest,
+    session: AsyncSession = Depends(get_session),
+    service: ChatService = Depends(get_chat_service),
+) -> ChatResponse:
+    result = await service.answer(session, request.question)
+    return ChatResponse(answer=result.answer, sources=result.sources, cached=result.cached)
+
+
+@router.get("/chat/cache-stats")
+async def chat_cache_stats(service: ChatService = Depends(get_chat_service)) -> dict:
+    """Hit rate, saved LLM calls and lookup latency of the semantic cache."""
+    return await service.cache.stats()
@@ -0,0 +1,119 @@
+"""
+The /feed endpoint: newest Stories first, keyset-paginated on (created_at, id).
+Sources come from one extra `selectinload` query per page (no N+1 lazy loads), article
+`content`/`raw_json` are only read and serialized when asked for, and the page is encoded
+straight to JSON bytes by Pydantic's serializer. Encoded pages are served from the feed
+cache with an ETag, so revalidating clients get a 304 without a body.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.api.schemas import FeedPage
+from src.config.config import FEED_DEFAULT_PAGE_SIZE, FEED_MAX_PAGE_SIZE
+from src.db.models import RawArticle, Story
+from src.db.session import get_session
+from src.services.feed_cache import FeedCache, get_feed_cache, page_key
+
+router = APIRouter()
+
+# Everything `RawArticleRead` needs except the article body
+_SOURCE_COLUMNS = (
+    RawArticle.id,
+    RawArticle.source_id,
+    RawArticle.url,
+    RawArticle.urlToImage,
+    RawArticle.title,
+    RawArticle.published_at,
+    RawArticle.ingested_at,
+    RawArticle.processed,
+)
+_EXCLUDE_CONTENT = {"items": {"__all__": {"sources": {"__all__": {"content"}}}}}
+_HEAD_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+_CURSOR_CACHE_CONTROL = "public, max-age=3600"
+
+
+class JSONBytesResponse(Response):
+    """Content is already-encoded JSON bytes (e.g. from `model_dump_json`)."""
+    media_type = "application/json"
+
+
+def encode_cursor(created_at: datetime, story_id: UUID) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{story_id.hex}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, story_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(story_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def fetch_page(
+    session: AsyncSession,
+    limit: int = FEED_DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    include_content: bool = False,
+) -> FeedPage:
+    sources = selectinload(Story.sources)
+    if not include_content:
+        sources = sources.load_only(*_SOURCE_COLUMNS)
+
+    # One row past the page tells us whether there is a next page
+    stmt = select(Story).options(sources).order_by(Story.created_at.desc(), Story.id.desc()).limit(limit + 1)
+    if cursor is not None:
+        created_at, story_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Story.created_at, Story.id) < tuple_(created_at, story_id))
+
+    stories = list((await session.execute(stmt)).scalars().all())
+    has_more = len(stories) > limit
+    stories = stories[:limit]
+
+    if not include_content:
+        # The body was never loaded; mark it as such so reading it can't trigger a lazy load
+        for story in stories:
+            for article in story.sources:
+                set_committed_value(article, "content", None)
+
+    next_cursor = encode_cursor(stories[-1].created_at, stories[-1].id) if has_more else None
+    return FeedPage.model_validate({"items": stories, "next_cursor": next_cursor}, from_attributes=True)
+
+
+@router.get("/feed", response_model=FeedPage, response_class=JSONBytesResponse)
+async def get_feed(
+    limit: int = Query(FEED_DEFAULT_PAGE_SIZE, ge=1, le=FEED_MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="`next_cursor` from the previous page"),
+    include_content: bool = Query(False, description="Include the full text of every source article"),
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_session),
+    cache: FeedCache = Depends(get_feed_cache),
+):
+    key = page_key(limit, cursor, include_content)
+    cached = await cache.get(key)
+    if cached is None:
+        # Read before the query, so a page built from rows older than an invalidation is not stored
+        version = await cache.version()
+        page = await fetch_page(session, limit, cursor, include_content)
+        body = page.model_dump_json(exclude=None if include_content else _EXCLUDE_CONTENT).encode()
+        cached = await cache.set(key, body, head=cursor is None, version=version)
+
+    # Pages behind a cursor only change on edits or archiving; the first page does whenever a story is published
+    headers = {"ETag": cached.etag, "Cache-Control": _HEAD_CACHE_CONTROL if cached.head else _CURSOR_CACHE_CONTROL}
+    if if_none_match is not None and cached.etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return JSONBytesResponse(cached.body, headers=headers)
+
+
+@router.get("/feed/cache-stats")
+async def feed_cache_stats(cache: FeedCache = Depends(get_feed_cache)) -> dict:
+    """Hit rate, entries and memory of the feed response cache."""
+    return await cache.stats()
@@ -0,0 +1,19 @@
+"""
+The FastAPI application; Prometheus metrics are served at /metrics. Run with:
+
+    uvicorn src.api.main:app
+"""
+
+from fastapi import FastAPI, Response
+
+from src.api import chat, feed
+from src.logger.metrics import CONTENT_TYPE, metrics
+
+app = FastAPI(title="Sentinel AI News", description="Synthesized, citation-checked AI news stories.")
+app.include_router(feed.router)
+app.include_router(chat.router)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
@@ -50,4 +50,25 @@ class StoryRead(StoryBase):
     created_at: datetime
     sources: List[RawArticleRead] = []
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# One page of the /feed endpoint; pass `next_cursor` back as `cursor` for the next page
+class FeedPage(BaseModel):
+    items: List[StoryRead]
+    next_cursor: Optional[str] = None
+
+# --- Chat Schemas ---
+class ChatRequest(BaseModel):
+    question: str = Field(min_length=1, max_length=2000)
+
+# A retrieved chunk the answer was generated from
+class ChatSource(BaseModel):
+    id: UUID
+    kind: str
+    chunk: int
+    score: float
+
+class ChatResponse(BaseModel):
+    answer: str
+    sources: List[ChatSource] = []
+    cached: bool = False
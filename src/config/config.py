@@ -1,3 +1,149 @@
+import os
+
 # LLM
 LLM = "qwen/qwen3-32b"
-LLM_TEMPERATURE = 0
\ No newline at end of file
+LLM_TEMPERATURE = 0
+LLM_CONTEXT_WINDOW = 131072         # Tokens the configured LLM accepts per request
+LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")  # "groq", "openai" (any OpenAI-compatible server) or "fake" (offline)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "http://localhost:8000/v1")  # Used by the "openai" backend
+LLM_MAX_CONCURRENCY = 8             # In-flight requests per model across the process
+LLM_MAX_RETRIES = 2
+LLM_REQUESTS_PER_MINUTE = 60        # Provider RPM quota (per model)
+LLM_TOKENS_PER_MINUTE = 300_000     # Provider TPM quota (per model), prompt + expected completion
+LLM_EXPECTED_COMPLETION_TOKENS = 800  # Reserved per request when charging the TPM bucket
+GRAPH_BATCH_CONCURRENCY = 16        # Clusters running through the graph at once
+GRAPH_MAX_ITERATIONS = 3            # Researcher drafts per cluster before the last one is published as is
+GRAPH_CHECKPOINT_URL = os.getenv("GRAPH_CHECKPOINT_URL", ".cache/graph_checkpoints.sqlite")  # SQLite path or "postgres"
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"  # Replay identical prompts from disk
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite")
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600  # Responses older than this are fetched again; None keeps them forever
+LLM_CACHE_MAX_ENTRIES = 50_000      # Least recently used responses are evicted beyond this
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Batch processes serve Prometheus metrics on this port when set
+LLM_PRICES_PER_MILLION = {          # Estimated USD per 1M (prompt, completion) tokens; unlisted models cost 0
+    "qwen/qwen3-32b": (0.29, 0.59),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+}
+
+# Researcher prompt context
+RESEARCHER_CONTEXT_TOKENS = 6000    # Token budget for the article context in one prompt
+RESEARCHER_MIN_ARTICLE_TOKENS = 60  # Floor per article so small sources still get a voice
+RESEARCHER_REVISION_MODE = True     # After an Editor rejection, send only draft + feedback + cited passages
+RESEARCHER_REVISION_PASSAGE_TOKENS = 800
+
+# Citation check
+CITATION_NGRAM_SIZE = 2             # Words per n-gram when matching summary sentences to sources
+CITATION_MIN_OVERLAP = 0.3          # Share of a sentence's n-grams an article must contain to back it
+CITATION_INDEX_CACHE_SIZE = 256     # Clusters whose ID/n-gram index is kept between iterations
+
+# Editor pre-checks (rule-based, before the Editor's LLM call)
+PRECHECK_MIN_SUMMARY_WORDS = 15      # Below this a digest says next to nothing
+PRECHECK_MAX_SUMMARY_WORDS = 1200
+PRECHECK_MAX_TITLE_CHARS = 160
+PRECHECK_MIN_NUMBER = 10            # Smaller integers are often spelled out in sources, so they aren't checked
+PRECHECK_EDITOR_OUTPUT_TOKENS = 60  # Typical Editor reply, for the tokens a skipped call would have cost
+
+# Full-text extraction
+EXTRACT_MAX_CONCURRENCY = 32        # Downloads in flight across all hosts
+EXTRACT_PER_HOST_CONCURRENCY = 4    # Downloads in flight against a single publisher
+EXTRACT_TIMEOUT_SECONDS = 15.0      # Per-URL budget for download + extraction together, from when the download starts
+EXTRACT_PROCESS_WORKERS = None      # None = os.cpu_count() workers for trafilatura.extract
+EXTRACT_USER_AGENT = "Mozilla/5.0 (compatible; SentinelNewsBot/0.1)"
+
+# Ingestion
+INGEST_BATCH_SIZE = 100             # Articles per dedup query / bulk INSERT
+INGEST_SKIP_EXISTING = True         # Drop already-stored URLs before downloading them
+
+# API
+FEED_DEFAULT_PAGE_SIZE = 20         # Stories per /feed page
+FEED_MAX_PAGE_SIZE = 100
+FEED_CACHE_BACKEND = os.getenv("FEED_CACHE_BACKEND", "memory")  # "memory" (per process) or "redis" (shared)
+FEED_CACHE_REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+FEED_CACHE_MAX_ENTRIES = 2048       # Encoded pages kept by the in-memory backend
+FEED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FEED_CACHE_HEAD_TTL_SECONDS = 60    # First pages, when a separate processor cannot invalidate this process
+FEED_CACHE_PAGE_TTL_SECONDS = 3600  # Cursor pages; bounds how long edits stay invisible (matches their max-age)
+CHAT_TOP_K = 6                      # Chunks retrieved as context for one /chat answer
+CHAT_CACHE_BACKEND = os.getenv("CHAT_CACHE_BACKEND", "memory")  # "memory" (per process) or "redis" (shared)
+CHAT_CACHE_REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CHAT_CACHE_SIMILARITY = 0.92        # Cosine between two questions' embeddings to reuse an answer
+CHAT_CACHE_TTL_SECONDS = 6 * 3600   # One ingestion cycle
+CHAT_CACHE_MAX_ENTRIES = 10_000     # Least recently used answers are evicted beyond this
+CHAT_CACHE_INVALIDATE_SIMILARITY = 0.5  # A new story this close to a cached question drops its answer
+
+# Vector index (RAG retrieval)
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", ".cache/vector_index")
+VECTOR_INDEX_DTYPE = "int8"         # "float32" or "int8" (4x smaller, scores within ~1%)
+VECTOR_EMBEDDING_BACKEND = os.getenv("VECTOR_EMBEDDING_BACKEND", "auto")  # "sentence-transformers" if installed, else "hashing"
+VECTOR_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+VECTOR_EMBED_BATCH_SIZE = 64        # Chunks per forward pass of the embedding model
+VECTOR_CHUNK_WORDS = 200            # Words per chunk of article content / story summary
+VECTOR_CHUNK_OVERLAP_WORDS = 40     # Words repeated between consecutive chunks
+VECTOR_INDEX_BATCH_ROWS = 256       # Database rows read (and embedded) per indexing step
+VECTOR_IVF_MIN_TRAIN = 4096         # Below this many chunks every search is exact (brute force)
+VECTOR_IVF_NPROBE = 16              # Inverted lists scanned per query; more = higher recall, slower
+VECTOR_IVF_RETRAIN_GROWTH = 4.0     # Re-cluster the lists once the index has grown this many times
+
+# Processor
+PROCESSOR_BATCH_SIZE = 200          # Unprocessed articles claimed (and clustered) per transaction
+
+# NewsAPI crawling
+NEWS_API_BASE_URL = "https://newsapi.org/v2/everything"
+NEWS_QUERIES = [
+    "Artificial Intelligence",
+    "large language models",
+    "NVIDIA supply chain",
+    "semiconductors",
+    "OpenAI",
+    "AI regulation",
+]
+NEWS_API_PAGE_SIZE = 100            # NewsAPI maximum
+NEWS_API_MAX_PAGES = 5              # Per query
+NEWS_API_MAX_CONCURRENCY = 4        # Requests in flight against NewsAPI
+NEWS_API_CRAWL_BUDGET = 100         # Max HTTP requests per crawl (retries included)
+NEWS_API_MAX_RETRIES = 5            # On 429 / 5xx
+NEWS_API_BACKOFF_BASE_SECONDS = 1.0
+NEWS_API_BACKOFF_MAX_SECONDS = 60.0
+NEWS_API_WATERMARK_OVERLAP_MINUTES = 60  # Re-ask this far behind each query's watermark for late-indexed articles
+CRAWL_INTERVAL_SECONDS = 6 * 3600   # Scheduler: one incremental crawl every 6 hours
+
+# Ingestion pipeline (fetch -> extract -> validate -> store)
+PIPELINE_QUEUE_SIZE = 200           # Max items buffered between two stages
+PIPELINE_EXTRACT_WORKERS = 32
+PIPELINE_VALIDATE_WORKERS = 2
+PIPELINE_STORE_WORKERS = 1
+PIPELINE_COMMIT_EVERY = 100         # Rows per store commit
+PIPELINE_FLUSH_INTERVAL_SECONDS = 5.0  # Commit a partial batch after this much idle time
+
+# Near-duplicate clustering (processor step 1)
+CLUSTER_NUM_PERM = 128              # MinHash signature length
+CLUSTER_LSH_BANDS = 64              # bands x rows = num_perm; more bands = lower candidate threshold
+CLUSTER_SIMILARITY_THRESHOLD = 0.3  # Estimated Jaccard (or cosine with embeddings) to merge two articles
+CLUSTER_SHINGLE_SIZE = 3            # Words per shingle
+CLUSTER_CONTENT_WORDS = 300         # Leading content words shingled alongside the title
+
+# Logging
+LOG_MODE = os.getenv("LOG_MODE", "development")  # "development" (inline handlers) or "production" (queue, rotation, sampling)
+LOG_DIR = os.getenv("LOG_DIR", "")  # Defaults to logs/ in the project root
+LOG_MAX_BYTES = 50 * 1024 * 1024    # production: rotate the log file at this size
+LOG_BACKUP_COUNT = 5                # production: rotated files kept
+LOG_CALLSITE_MIN_LEVEL = "WARNING"  # production: filename/function/line only on events at this level and above
+LOG_SAMPLE_RATES = {                # production: fraction of these INFO/DEBUG events kept, by event name
+    "llm_call": 0.1,
+}
+
+# Tracing
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")  # "none", "file" (JSON lines at TRACING_FILE) or "otlp" (OTLP/JSON over HTTP)
+TRACING_FILE = os.getenv("TRACING_FILE", ".cache/traces.jsonl")
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACING_BATCH_SIZE = 512            # Spans per export
+TRACING_FLUSH_SECONDS = 2.0         # Export a partial batch after this long
+
+# Article storage and retention
+ARTICLE_CONTENT_COMPRESSION = os.getenv("ARTICLE_CONTENT_COMPRESSION", "zstd")  # "zstd" (zlib without `zstandard`), "zlib" or "none"
+ARTICLE_CONTENT_COMPRESS_MIN_BYTES = 256  # Shorter bodies are stored as plain UTF-8
+RAW_JSON_COMPACT = True             # Keep only the NewsAPI payload fields that have no column of their own
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "90"))  # Processed articles older than this that no story links to are archived
+STORY_RETENTION_DAYS = int(os.getenv("STORY_RETENTION_DAYS", "0"))  # Stories older than this are archived too and leave /feed; 0 keeps them
+RETENTION_BATCH_SIZE = 1000         # Rows per archive part file (and per delete transaction)
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
@@ -0,0 +1,51 @@
+"""
+Set-based helpers for writing many rows in a single round trip.
+This keeps the ingestion and processor services free of per-row SELECT/INSERT loops.
+"""
+
+from typing import Any, Sequence
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.db.models import Base
+
+
+def _dialect_insert(session: AsyncSession, model: type[Base]):
+    """Returns the dialect-specific `insert()` construct that supports ON CONFLICT."""
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Bulk insert with ON CONFLICT is not supported for dialect '{dialect}'")
+
+
+async def existing_values(session: AsyncSession, column: InstrumentedAttribute, values: Sequence[Any]) -> set:
+    """One `column IN (...)` query returning which of `values` are already stored."""
+    if not values:
+        return set()
+    result = await session.execute(select(column).where(column.in_(values)))
+    return set(result.scalars().all())
+
+
+async def insert_ignore_conflicts(
+    session: AsyncSession,
+    model: type[Base],
+    rows: list[dict],
+    conflict_columns: list[str],
+    returning: InstrumentedAttribute | None = None,
+) -> list:
+    """
+    Bulk `INSERT ... ON CONFLICT (conflict_columns) DO NOTHING [RETURNING returning]`.
+    Returns the `returning` values of the rows that were actually inserted (empty if not requested).
+    """
+    if not rows:
+        return []
+    stmt = _dialect_insert(session, model).values(rows).on_conflict_do_nothing(index_elements=conflict_columns)
+    if returning is None:
+        await session.execute(stmt)
+        return []
+    result = await session.execute(stmt.returning(returning))
+    return list(result.scalars().all())
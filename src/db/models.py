@@ -6,8 +6,9 @@ This is the "Model" layer.
 from datetime import datetime, timezone
 from typing import Optional, List
 from uuid import UUID, uuid4
-from sqlalchemy import String, Text, DateTime, Boolean, Float, ForeignKey, JSON
+from sqlalchemy import String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from src.db.types import CompressedText
 
 # The base class for all our database models
 class Base(DeclarativeBase):
@@ -28,8 +29,8 @@ class RawArticle(Base):
     url: Mapped[str] = mapped_column(String, unique=True, index=True)
     urlToImage: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     title: Mapped[str] = mapped_column(String)
-    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True) # Trafilatura text
-    raw_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    content: Mapped[Optional[str]] = mapped_column(CompressedText, nullable=True) # Trafilatura text, stored compressed
+    raw_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True) # NewsAPI payload minus the fields above (see compact_payload)
     published_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     ingested_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     processed: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -37,6 +38,17 @@ class RawArticle(Base):
     # Relationship back to stories
     stories: Mapped[List["Story"]] = relationship(secondary="story_source", back_populates="sources")
 
+    # The processor claims the oldest unprocessed rows; indexing only those keeps claiming
+    # fast no matter how many processed articles accumulate
+    __table_args__ = (
+        Index(
+            "ix_raw_article_unprocessed",
+            "ingested_at",
+            postgresql_where=text("processed = false"),
+            sqlite_where=text("processed = 0"),
+        ),
+    )
+
 # --- Table 2: Synthesized AI Stories ---
 class Story(Base):
     __tablename__ = "story"
@@ -48,6 +60,40 @@ class Story(Base):
     category: Mapped[str] = mapped_column(String, default="General")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     citation_verified: Mapped[bool] = mapped_column(Boolean, default=False)
+    llm_usage: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True) # Calls/tokens/cost/seconds per agent node and "total"
+    llm_cost_usd: Mapped[float] = mapped_column(Float, default=0.0) # Estimated spend to produce the story
     
     # Relationship to the raw articles
-    sources: Mapped[List["RawArticle"]] = relationship(secondary="story_source", back_populates="stories")
\ No newline at end of file
+    sources: Mapped[List["RawArticle"]] = relationship(secondary="story_source", back_populates="stories")
+
+    # Backs the /feed keyset pagination: ORDER BY created_at DESC, id DESC
+    __table_args__ = (Index("ix_story_created_at_id", "created_at", "id"),)
+
+# --- Table 3: Crawl state ---
+class CrawlWatermark(Base):
+    __tablename__ = "crawl_watermark"
+
+    query: Mapped[str] = mapped_column(String, primary_key=True)
+    published_at: Mapped[datetime] = mapped_column(DateTime(timezone=True)) # Newest article NewsAPI returned for the query
+    recent_urls: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True) # url -> publishedAt (ISO) of articles inside the overlap window, skipped next run
+    backfill_from: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True) # Older range a crawl cut short; later runs page through it
+    backfill_to: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+# --- Table 4: Crawl run statistics ---
+class CrawlRun(Base):
+    __tablename__ = "crawl_run"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    status: Mapped[str] = mapped_column(String, default="running") # "running", "succeeded", "partial" or "failed"
+    queries: Mapped[list] = mapped_column(JSON)
+    incremental_queries: Mapped[int] = mapped_column(default=0) # Queries that had a watermark
+    newsapi_requests: Mapped[int] = mapped_column(default=0)
+    fetched: Mapped[int] = mapped_column(default=0)            # Unique new articles streamed from NewsAPI
+    overlap_skipped: Mapped[int] = mapped_column(default=0)    # Dropped in memory as already seen last run
+    inserted: Mapped[int] = mapped_column(default=0)
+    skipped: Mapped[int] = mapped_column(default=0)
+    failed: Mapped[int] = mapped_column(default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
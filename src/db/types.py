@@ -0,0 +1,59 @@
+"""
+Column types with custom storage.
+`CompressedText` keeps article bodies compressed (zstd, or zlib without the optional
+`zstandard` package) in a binary column while the ORM and Core still read and write `str`.
+Stored values start with a NUL byte and a codec id; anything else is plain UTF-8, which is
+what rows written before compression (or below the size threshold) contain. Text columns can
+never hold NUL in PostgreSQL, so the two forms cannot be confused.
+"""
+
+import zlib
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from src.config.config import ARTICLE_CONTENT_COMPRESSION, ARTICLE_CONTENT_COMPRESS_MIN_BYTES
+
+try:
+    import zstandard
+except ImportError:     # Optional: falls back to zlib
+    zstandard = None
+
+_ZSTD, _ZLIB = b"\x00z", b"\x00d"
+
+
+def compress_text(text: str, codec: str = ARTICLE_CONTENT_COMPRESSION, min_bytes: int = ARTICLE_CONTENT_COMPRESS_MIN_BYTES) -> bytes:
+    data = text.encode()
+    if codec == "none" or len(data) < min_bytes:
+        return data
+    if codec == "zstd" and zstandard is not None:
+        return _ZSTD + zstandard.ZstdCompressor(level=9).compress(data)
+    if codec in ("zstd", "zlib"):
+        return _ZLIB + zlib.compress(data, 6)
+    raise ValueError(f"Unknown compression codec: {codec!r}")
+
+
+def decompress_text(data: bytes) -> str:
+    header = bytes(data[:2])
+    if header == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("This value is zstd-compressed; install `zstandard` to read it.")
+        return zstandard.ZstdDecompressor().decompress(data[2:]).decode()
+    if header == _ZLIB:
+        return zlib.decompress(data[2:]).decode()
+    return bytes(data).decode()
+
+
+class CompressedText(TypeDecorator):
+    """`str` in Python, compressed bytes in the database (see module docstring)."""
+    impl = LargeBinary
+    cache_ok = True
+
+    # Module-wide switch, so benchmarks can write an uncompressed baseline
+    codec = ARTICLE_CONTENT_COMPRESSION
+
+    def process_bind_param(self, value: str | None, dialect) -> bytes | None:
+        return None if value is None else compress_text(value, self.codec)
+
+    def process_result_value(self, value: bytes | None, dialect) -> str | None:
+        return None if value is None else decompress_text(value)
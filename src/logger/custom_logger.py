@@ -1,46 +1,110 @@
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
+import random
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 import structlog
 
+from src.config.config import (
+    LOG_BACKUP_COUNT,
+    LOG_CALLSITE_MIN_LEVEL,
+    LOG_DIR,
+    LOG_MAX_BYTES,
+    LOG_MODE,
+    LOG_SAMPLE_RATES,
+)
+
+_CALLSITE = structlog.processors.CallsiteParameterAdder(
+    {
+        structlog.processors.CallsiteParameter.FILENAME,
+        structlog.processors.CallsiteParameter.FUNC_NAME,
+        structlog.processors.CallsiteParameter.LINENO,
+    },
+    additional_ignores=[__name__],
+)
+
+
+def _callsite_from(min_level: int):
+    """Adds the callsite only to events at `min_level` and above; the frame walk is the costliest processor."""
+    def add_callsite(logger, method_name: str, event_dict: dict) -> dict:
+        if structlog.stdlib.NAME_TO_LEVEL.get(method_name, logging.INFO) >= min_level:
+            return _CALLSITE(logger, method_name, event_dict)
+        return event_dict
+    return add_callsite
+
+
+def _sample(rates: dict[str, float]):
+    """Keeps a random `rate` share of the named INFO/DEBUG events and tags the survivors with it."""
+    def sample(logger, method_name: str, event_dict: dict) -> dict:
+        rate = rates.get(event_dict.get("event"))
+        if rate is not None and structlog.stdlib.NAME_TO_LEVEL.get(method_name, logging.INFO) <= logging.INFO:
+            if random.random() >= rate:
+                raise structlog.DropEvent
+            event_dict["sample_rate"] = rate
+        return event_dict
+    return sample
+
+
+class _EventQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread unformatted. The stock `prepare` renders the message
+    to a string, which would throw away structlog's event dict before the JSON formatter sees it.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if not isinstance(record.msg, dict):
+            # Foreign (stdlib) records: resolve %-args now, the objects may change before the listener runs
+            record.msg, record.args = record.getMessage(), None
+        return record
+
+
 class CustomLogger:
     """
     A logger class that implements structured JSON logging using `structlog`.
     It automatically creates a logs/ directory in the project root and generates timestamp-based 
     log files. It logs to both console and file simultaneously.
+
+    In "production" mode (LOG_MODE) the handlers run on a background thread behind a queue,
+    so disk and stdout writes never block the event loop; the file rotates by size, callsite
+    info is only added from LOG_CALLSITE_MIN_LEVEL up, and high-volume events are sampled.
     """
     _is_configured = False
+    _listener: logging.handlers.QueueListener | None = None
+    _handlers: list[logging.Handler] = []     # Installed on the root logger
 
     @classmethod
-    def configure(cls, level: int = logging.INFO):
+    def configure(cls, level: int = logging.INFO, mode: str = LOG_MODE, log_dir: str | Path | None = None):
         """
         Configures the structlog and standard logging settings.
         """
         if cls._is_configured:
             return
+        if mode not in ("development", "production"):
+            raise ValueError(f"Unknown log mode: {mode!r}")
+        production = mode == "production"
 
         # Determine project root (this file is in src/logger/)
         project_root = Path(__file__).resolve().parent.parent.parent
-        logs_dir = project_root / "logs"
+        logs_dir = Path(log_dir or LOG_DIR or project_root / "logs")
         logs_dir.mkdir(parents=True, exist_ok=True)
 
         timestamp = datetime.now(timezone.utc).strftime("%Y_%m_%d_%H_%M_%S")
         log_file = logs_dir / f"app_{timestamp}.log"
 
         shared_processors = [
+            # Cheap checks first, so filtered-out and sampled-away events skip the rest of the chain
+            structlog.stdlib.filter_by_level,
+            *([_sample(LOG_SAMPLE_RATES)] if production else []),
             structlog.contextvars.merge_contextvars,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
             structlog.processors.TimeStamper(fmt="iso", utc=True, key="timestamp"),
-            structlog.processors.CallsiteParameterAdder(
-                {
-                    structlog.processors.CallsiteParameter.FILENAME,
-                    structlog.processors.CallsiteParameter.FUNC_NAME,
-                    structlog.processors.CallsiteParameter.LINENO,
-                }
-            ),
+            _callsite_from(logging.getLevelName(LOG_CALLSITE_MIN_LEVEL)) if production else _CALLSITE,
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
@@ -59,7 +123,10 @@ class CustomLogger:
             processor=structlog.processors.JSONRenderer(),
         )
 
-        file_handler = logging.FileHandler(log_file)
+        if production:
+            file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+        else:
+            file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
         file_handler.setLevel(level)
 
@@ -70,11 +137,35 @@ class CustomLogger:
         root_logger = logging.getLogger()
         root_logger.setLevel(level)
         root_logger.handlers.clear()
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(console_handler)
+        if production:
+            records: queue.SimpleQueue = queue.SimpleQueue()
+            cls._listener = logging.handlers.QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+            cls._listener.start()
+            atexit.register(cls.shutdown)
+            cls._handlers = [_EventQueueHandler(records)]
+        else:
+            cls._handlers = [file_handler, console_handler]
+        for handler in cls._handlers:
+            root_logger.addHandler(handler)
 
         cls._is_configured = True
 
+    @classmethod
+    def shutdown(cls):
+        """
+        Flushes queued records, closes the handlers and allows `configure` to run again.
+        """
+        if cls._listener is not None:
+            cls._listener.stop()
+            for handler in cls._listener.handlers:
+                handler.close()
+            cls._listener = None
+        for handler in cls._handlers:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+        cls._handlers = []
+        cls._is_configured = False
+
     @classmethod
     def get_logger(cls, name: str, level: int = logging.INFO) -> structlog.BoundLogger:
         """
@@ -0,0 +1,384 @@
+"""
+Lightweight tracing: nested timing spans across a crawl or processor run.
+`span()` (a context manager) and `traced()` (a decorator for sync and async functions) open a
+span whose parent is the span already open in the current context, and bind its `trace_id` and
+`span_id` into structlog's contextvars so log lines inside carry them. SQLAlchemy queries become
+`db.query` spans through engine events (`instrument_engine`), LLM calls `llm.call` spans through
+the usage callback. Finished spans are batched to an exporter on a background thread: JSON lines
+in a local file, or OTLP/JSON over HTTP to a collector (TRACING_EXPORTER). Summarize a file with
+
+    python -m src.logger.tracing .cache/traces.jsonl --chrome trace.json
+
+which prints per-stage latency and a timeline of the slowest trace, and writes a Chrome trace
+(chrome://tracing, Perfetto) for flame-style views.
+"""
+
+import argparse
+import atexit
+import functools
+import inspect
+import json
+import queue
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, Protocol
+
+import structlog
+from sqlalchemy import event
+
+from src.config.config import (
+    TRACING_BATCH_SIZE,
+    TRACING_EXPORTER,
+    TRACING_FILE,
+    TRACING_FLUSH_SECONDS,
+    TRACING_OTLP_ENDPOINT,
+)
+from src.logger.custom_logger import get_logger
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+SERVICE_NAME = "sentinel-ai-news"
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int                   # Unix epoch nanoseconds
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class _NoopSpan:
+    """Handed out while tracing is off, so callers can `set()` attributes unconditionally."""
+    def set(self, **attributes: Any):
+        pass
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[Span]): ...
+
+
+class JsonFileSpanExporter:
+    """Appends one JSON object per span to `path`."""
+    def __init__(self, path: str | Path = TRACING_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: list[Span]):
+        with self.path.open("a") as f:
+            f.writelines(json.dumps(s.as_dict(), default=str) + "\n" for s in spans)
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_payload(spans: list[Span], service_name: str = SERVICE_NAME) -> dict:
+    """An OTLP/JSON `ExportTraceServiceRequest` for `spans`."""
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+        "scopeSpans": [{
+            "scope": {"name": __name__},
+            "spans": [{
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                "status": {"code": 2, "message": s.error} if s.error else {},
+            } for s in spans],
+        }],
+    }]}
+
+
+class OtlpHttpSpanExporter:
+    """Posts OTLP/JSON to a collector's /v1/traces endpoint (OpenTelemetry Collector, Jaeger, Tempo)."""
+    def __init__(self, endpoint: str = TRACING_OTLP_ENDPOINT, client: "httpx.Client | None" = None):
+        import httpx
+
+        self.endpoint = endpoint
+        self.client = client or httpx.Client(timeout=5.0)
+
+    def export(self, spans: list[Span]):
+        self.client.post(self.endpoint, json=otlp_payload(spans)).raise_for_status()
+
+
+class Tracer:
+    """Creates spans and ships finished ones to the exporter from a daemon thread, in batches."""
+    def __init__(self, exporter: SpanExporter | None = None, batch_size: int = TRACING_BATCH_SIZE, flush_interval: float = TRACING_FLUSH_SECONDS):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start(self, name: str, parent: Span | None, attributes: dict) -> Span:
+        trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        return Span(name, trace_id, f"{random.getrandbits(64):016x}", parent.span_id if parent else None, time.time_ns(), attributes=attributes)
+
+    def finish(self, span: Span):
+        if not span.end_ns:
+            span.end_ns = time.time_ns()
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+        self._queue.put(span)
+
+    def record(self, name: str, start_ns: int, end_ns: int, error: str | None = None, **attributes: Any):
+        """A span for work timed elsewhere (engine and callback events), under the current span."""
+        span = self.start(name, _current.get(), attributes)
+        span.start_ns, span.end_ns, span.error = start_ns, end_ns, error
+        self.finish(span)
+
+    def flush(self, timeout: float | None = 10.0):
+        """Blocks until every span finished so far has been exported."""
+        if self._thread is not None:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait(timeout)
+
+    def set_exporter(self, exporter: SpanExporter | None):
+        self.flush()
+        self.exporter = exporter
+
+    def _run(self):
+        batch: list[Span] = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+            if isinstance(item, Span):
+                batch.append(item)
+            if batch and (not isinstance(item, Span) or len(batch) >= self.batch_size):
+                self._export(batch)
+                batch = []
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _export(self, spans: list[Span]):
+        exporter = self.exporter
+        if exporter is None:
+            return
+        try:
+            exporter.export(spans)
+        except Exception as e:
+            logger.warning(f"Dropped {len(spans)} spans: {e!r}")
+
+
+def _exporter_from_config() -> SpanExporter | None:
+    if TRACING_EXPORTER == "file":
+        return JsonFileSpanExporter(TRACING_FILE)
+    if TRACING_EXPORTER == "otlp":
+        return OtlpHttpSpanExporter(TRACING_OTLP_ENDPOINT)
+    if TRACING_EXPORTER != "none":
+        raise ValueError(f"Unknown TRACING_EXPORTER: {TRACING_EXPORTER!r}")
+    return None
+
+
+tracer = Tracer(_exporter_from_config())
+atexit.register(tracer.flush)
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_NOOP = _NoopSpan()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+    """Times the block as a child of the current span (a new trace if there is none)."""
+    if not tracer.enabled:
+        yield _NOOP
+        return
+    current = tracer.start(name, _current.get(), attributes)
+    token = _current.set(current)
+    log_tokens = structlog.contextvars.bind_contextvars(trace_id=current.trace_id, span_id=current.span_id)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        structlog.contextvars.reset_contextvars(**log_tokens)
+        _current.reset(token)
+        tracer.finish(current)
+
+
+def traced(name: str | None = None):
+    """Decorator form of `span`, named after the function unless `name` is given."""
+    def decorate(func):
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- SQLAlchemy ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if tracer.enabled:
+        context._span_start_ns = time.time_ns()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_ns = getattr(context, "_span_start_ns", None)
+    if start_ns is not None:
+        tracer.record("db.query", start_ns, time.time_ns(), **_statement_attributes(statement, executemany))
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    start_ns = getattr(context, "_span_start_ns", None)
+    if start_ns is not None:
+        error = f"{type(exception_context.original_exception).__name__}: {exception_context.original_exception}"
+        tracer.record("db.query", start_ns, time.time_ns(), error=error, **_statement_attributes(exception_context.statement or "", False))
+
+
+def _statement_attributes(statement: str, executemany: bool) -> dict:
+    return {
+        "db.operation": statement.split(None, 1)[0].upper() if statement else "",
+        "db.statement": statement[:300],
+        "db.executemany": executemany,
+    }
+
+
+def instrument_engine(engine):
+    """Records every statement run on `engine` (sync or async) as a `db.query` span."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(sync_engine, name, listener):
+            event.listen(sync_engine, name, listener)
+    return engine
+
+
+# --- Analysis ---
+def load_spans(path: str | Path) -> list[Span]:
+    with open(path) as f:
+        return [Span(**json.loads(line)) for line in f if line.strip()]
+
+
+def stage_breakdown(spans: list[Span]) -> list[tuple[str, int, float, float, float]]:
+    """(name, count, total s, p50 ms, p95 ms) per span name, slowest total first."""
+    by_name: dict[str, list[float]] = defaultdict(list)
+    for s in spans:
+        by_name[s.name].append(s.seconds)
+    rows = []
+    for name, seconds in by_name.items():
+        seconds.sort()
+        p50 = seconds[len(seconds) // 2]
+        p95 = seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))]
+        rows.append((name, len(seconds), sum(seconds), p50 * 1000, p95 * 1000))
+    return sorted(rows, key=lambda row: -row[2])
+
+
+def timeline(spans: list[Span], trace_id: str, width: int = 40) -> list[str]:
+    """One line per span of the trace, indented by depth, with a bar over the trace's duration."""
+    trace = [s for s in spans if s.trace_id == trace_id]
+    if not trace:
+        return []
+    children: dict[str | None, list[Span]] = defaultdict(list)
+    ids = {s.span_id for s in trace}
+    for s in sorted(trace, key=lambda s: s.start_ns):
+        children[s.parent_id if s.parent_id in ids else None].append(s)
+    start = min(s.start_ns for s in trace)
+    total = max(s.end_ns for s in trace) - start or 1
+
+    lines = []
+    def walk(parent: str | None, depth: int):
+        for s in children[parent]:
+            left = int((s.start_ns - start) / total * width)
+            bar = " " * left + "#" * max(1, int((s.end_ns - s.start_ns) / total * width))
+            label = ("  " * depth + s.name)[:48]
+            lines.append(f"{label:<48} {(s.start_ns - start) / 1e6:>9.1f} {s.seconds * 1000:>9.1f}  |{bar:<{width}}|{' !' if s.error else ''}")
+            walk(s.span_id, depth + 1)
+    walk(None, 0)
+    return lines
+
+
+def chrome_trace(spans: list[Span]) -> dict:
+    """Complete ("X") events in the Chrome trace format, one row per trace."""
+    rows = {trace_id: i for i, trace_id in enumerate(dict.fromkeys(s.trace_id for s in spans))}
+    return {"traceEvents": [{
+        "name": s.name, "ph": "X", "pid": 1, "tid": rows[s.trace_id],
+        "ts": s.start_ns / 1000, "dur": (s.end_ns - s.start_ns) / 1000,
+        "args": {**s.attributes, **({"error": s.error} if s.error else {})},
+    } for s in spans]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency and timelines from a span file.")
+    parser.add_argument("path", nargs="?", default=TRACING_FILE)
+    parser.add_argument("--trace", help="Trace ID for the timeline (default: the slowest trace)")
+    parser.add_argument("--chrome", help="Also write a Chrome trace JSON to this path")
+    args = parser.parse_args()
+
+    spans = load_spans(args.path)
+    if not spans:
+        print(f"No spans in {args.path}")
+        return
+    print(f"{'span':<32} | {'count':>7} | {'total s':>9} | {'p50 ms':>9} | {'p95 ms':>9}")
+    for name, count, total, p50, p95 in stage_breakdown(spans):
+        print(f"{name[:32]:<32} | {count:>7} | {total:>9.2f} | {p50:>9.1f} | {p95:>9.1f}")
+
+    roots = [s for s in spans if s.parent_id is None]
+    trace_id = args.trace or max(roots or spans, key=lambda s: s.seconds).trace_id
+    print(f"\nTrace {trace_id}\n{'span':<48} {'start ms':>9} {'dur ms':>9}")
+    print("\n".join(timeline(spans, trace_id)))
+
+    if args.chrome:
+        Path(args.chrome).write_text(json.dumps(chrome_trace(spans)))
+        print(f"\nWrote {args.chrome}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Question answering over the news corpus (/chat).
+A question is embedded once; that vector is looked up in the semantic cache and, on a miss,
+used to retrieve the top-k chunks from the vector index. The answer is generated from those
+chunks only and cached together with the IDs of the stories behind them.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.agents.llm import get_llm
+from src.agents.usage import track_usage
+from src.config.config import CHAT_TOP_K, LLM, LLM_TEMPERATURE
+from src.db.models import StorySource
+from src.services.semantic_cache import CachedAnswer, SemanticCache, get_chat_cache
+from src.services.vector_index import SearchHit, VectorRetriever, open_retriever
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ChatAnswer:
+    answer: str
+    sources: list[dict] = field(default_factory=list)
+    cached: bool = False
+    similarity: float | None = None     # Cosine to the cached question it was served from
+
+
+def chat_messages(question: str, hits: list[SearchHit], texts: list[str]) -> list[BaseMessage]:
+    passages = "\n\n".join(f"[{i}] ({hit.kind} {hit.id})\n{text}" for i, (hit, text) in enumerate(zip(hits, texts), 1) if text)
+    return [
+        SystemMessage("You answer questions about recent AI news using only the numbered passages provided. "
+                      "Cite the passages you use as [n]. If they don't contain the answer, say so."),
+        HumanMessage(f"PASSAGES:\n{passages or '(none)'}\n\nQUESTION: {question}"),
+    ]
+
+
+class ChatService:
+    def __init__(
+        self,
+        retriever: VectorRetriever,
+        cache: SemanticCache,
+        k: int = CHAT_TOP_K,
+        model: str = LLM,
+        temperature: float = LLM_TEMPERATURE,
+    ):
+        self.retriever = retriever
+        self.cache = cache
+        self.k = k
+        self.model = model
+        self.temperature = temperature
+
+    async def _embed(self, texts: list[str]):
+        return await asyncio.to_thread(self.retriever.embedder.embed, texts)
+
+    async def story_ids(self, session: AsyncSession, hits: list[SearchHit]) -> frozenset[str]:
+        """Stories an answer depends on: the ones retrieved, and those built from retrieved articles."""
+        stories = {str(hit.id) for hit in hits if hit.kind == "story"}
+        article_ids = [hit.id for hit in hits if hit.kind == "article"]
+        if article_ids:
+            result = await session.execute(select(StorySource.story_id).where(StorySource.raw_article_id.in_(article_ids)))
+            stories.update(str(story_id) for story_id in result.scalars())
+        return frozenset(stories)
+
+    async def answer(self, session: AsyncSession, question: str) -> ChatAnswer:
+        vector = (await self._embed([question]))[0]
+        cached = await self.cache.lookup(vector)
+        if cached is not None:
+            return ChatAnswer(cached.answer, cached.sources, cached=True, similarity=cached.similarity)
+
+        # Pick up chunks the indexer appended since the last question
+        self.retriever.index.refresh()
+        hits = await asyncio.to_thread(self.retriever.index.search, vector, self.k)
+        texts = await self.retriever.chunk_texts(session, hits)
+        with track_usage("chat"):
+            response = await get_llm(self.model, self.temperature).ainvoke(chat_messages(question, hits, texts))
+
+        sources = [{"id": str(hit.id), "kind": hit.kind, "chunk": hit.chunk, "score": hit.score} for hit in hits]
+        story_ids = await self.story_ids(session, hits)
+        await self.cache.store(vector, CachedAnswer(question, response.content, sources, story_ids))
+        return ChatAnswer(response.content, sources)
+
+    async def invalidate_near_stories(self, stories: list[dict]) -> int:
+        """Drops cached answers to questions close to newly published stories."""
+        vectors = await self._embed([f"{story['title']}\n{story['summary']}" for story in stories])
+        dropped = await self.cache.invalidate_near(vectors)
+        if dropped:
+            logger.info(f"Dropped {dropped} cached chat answer(s) made stale by {len(stories)} new stories")
+        return dropped
+
+
+_chat_service: ChatService | None = None
+
+
+def get_chat_service() -> ChatService:
+    """The process-wide chat service (also usable as a FastAPI dependency)."""
+    global _chat_service
+    if _chat_service is None:
+        _chat_service = ChatService(open_retriever(), get_chat_cache())
+    return _chat_service
+
+
+async def invalidate_chat_answers(stories: list[dict]) -> int:
+    """Called after stories are published; loads the embedding model only if answers are cached."""
+    if not stories or not await get_chat_cache().size():
+        return 0
+    return await get_chat_service().invalidate_near_stories(stories)
@@ -0,0 +1,202 @@
+"""
+Near-duplicate clustering of unprocessed articles (Processor Step 1).
+Groups articles that report the same event using MinHash signatures over shingled titles and
+content, with Locality-Sensitive Hashing so only likely matches are ever compared.
+An optional embedding backend swaps MinHash for random-hyperplane LSH over dense vectors.
+"""
+
+import re
+import zlib
+from dataclasses import dataclass, field
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.agents.state import AgentState
+from src.config.config import (
+    CLUSTER_CONTENT_WORDS,
+    CLUSTER_LSH_BANDS,
+    CLUSTER_NUM_PERM,
+    CLUSTER_SHINGLE_SIZE,
+    CLUSTER_SIMILARITY_THRESHOLD,
+)
+from src.db.models import RawArticle
+from src.services.embeddings import EmbeddingBackend
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+_WORD = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+@dataclass
+class ArticleCluster:
+    """Articles judged to describe the same event."""
+    articles: list[dict] = field(default_factory=list)
+
+    @property
+    def article_ids(self) -> list[str]:
+        return [article["id"] for article in self.articles]
+
+    def to_agent_state(self) -> AgentState:
+        """Each cluster enters the LangGraph workflow as its own state."""
+        return {
+            "raw_articles": self.articles,
+            "draft_story": None,
+            "editor_feedback": None,
+            "is_approved": False,
+            "iteration_count": 0,
+            "citation_verified": False,
+            "precheck_passed": False,
+            "usage": {},
+        }
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+class NearDuplicateClusterer:
+    """
+    Clusters articles in roughly O(n * bands) time: each article is hashed into one bucket per
+    LSH band, and only articles sharing a bucket are compared against that bucket's first member.
+    """
+    def __init__(
+        self,
+        num_perm: int = CLUSTER_NUM_PERM,
+        bands: int = CLUSTER_LSH_BANDS,
+        threshold: float = CLUSTER_SIMILARITY_THRESHOLD,
+        shingle_size: int = CLUSTER_SHINGLE_SIZE,
+        content_words: int = CLUSTER_CONTENT_WORDS,
+        embedder: EmbeddingBackend | None = None,
+        seed: int = 42,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands}).")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.content_words = content_words
+        self.embedder = embedder
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        # (a * x + b) mod p with a, b < 2^32 and 32-bit shingle hashes never overflows uint64
+        self._a = rng.integers(1, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self._planes: dict[int, np.ndarray] = {}     # Embedding dimension -> hyperplanes, drawn on first use
+
+    # --- MinHash ---
+    def _text(self, article: dict) -> str:
+        words = _WORD.findall((article.get("content") or "").lower())[:self.content_words]
+        return f"{article.get('title') or ''} {' '.join(words)}"
+
+    def shingles(self, text: str) -> np.ndarray:
+        """32-bit hashes of the text's word k-grams."""
+        words = _WORD.findall(text.lower())
+        k = min(self.shingle_size, len(words)) or 1
+        grams = {" ".join(words[i:i + k]) for i in range(max(len(words) - k + 1, 1))}
+        return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self.shingles(text)
+        return ((self._a * hashes + self._b) % _MERSENNE_PRIME).min(axis=1)
+
+    # --- Clustering ---
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One hashable key per (article, band): the band's slice of the signature as raw bytes."""
+        rows = signatures.shape[1] // self.bands
+        return np.ascontiguousarray(signatures).view(f"V{rows * signatures.dtype.itemsize}").reshape(len(signatures), self.bands)
+
+    def _link_buckets(self, band_keys: np.ndarray, similar) -> _UnionFind:
+        groups = _UnionFind(len(band_keys))
+        for band in range(self.bands):
+            buckets: dict[bytes, int] = {}
+            for i, key in enumerate(band_keys[:, band].tolist()):
+                first = buckets.setdefault(key, i)
+                if first != i and groups.find(first) != groups.find(i) and similar(first, i):
+                    groups.union(first, i)
+        return groups
+
+    def _minhash_groups(self, articles: list[dict]) -> _UnionFind:
+        signatures = np.vstack([self.signature(self._text(a)) for a in articles])
+        return self._link_buckets(
+            self._band_keys(signatures),
+            lambda i, j: np.mean(signatures[i] == signatures[j]) >= self.threshold,
+        )
+
+    def _hyperplanes(self, dim: int) -> np.ndarray:
+        """The same planes for every batch, so a batch always gets the same candidate pairs."""
+        if dim not in self._planes:
+            self._planes[dim] = np.random.default_rng([self.seed, dim]).standard_normal((dim, self.num_perm)).astype(np.float32)
+        return self._planes[dim]
+
+    def _embedding_groups(self, articles: list[dict]) -> _UnionFind:
+        vectors = np.asarray(self.embedder.embed([self._text(a) for a in articles]), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+        # Random-hyperplane LSH: articles with high cosine similarity share sign patterns
+        bits = (vectors @ self._hyperplanes(vectors.shape[1]) > 0).astype(np.uint8)
+        return self._link_buckets(
+            self._band_keys(bits),
+            lambda i, j: float(vectors[i] @ vectors[j]) >= self.threshold,
+        )
+
+    def cluster(self, articles: list[dict]) -> list[ArticleCluster]:
+        """Returns clusters (largest first); articles without a near-duplicate form singleton clusters."""
+        if not articles:
+            return []
+        groups = self._embedding_groups(articles) if self.embedder else self._minhash_groups(articles)
+
+        clusters: dict[int, ArticleCluster] = {}
+        for i, article in enumerate(articles):
+            clusters.setdefault(groups.find(i), ArticleCluster()).articles.append(article)
+        result = sorted(clusters.values(), key=lambda c: len(c.articles), reverse=True)
+        logger.info(f"Clustered {len(articles)} articles into {len(result)} events")
+        return result
+
+
+def article_to_dict(article: RawArticle) -> dict:
+    """The article shape the agents expect in `AgentState.raw_articles`."""
+    return {
+        "id": str(article.id),
+        "title": article.title,
+        "content": article.content or "",
+        "url": article.url,
+        "source_id": article.source_id,
+    }
+
+
+async def load_unprocessed_articles(session: AsyncSession, limit: int | None = None, skip_locked: bool = False) -> list[dict]:
+    """
+    Oldest unprocessed articles first. With `skip_locked` the rows are claimed
+    (`FOR UPDATE SKIP LOCKED`) until the transaction ends, so parallel workers never share one.
+    """
+    stmt = select(RawArticle).where(RawArticle.processed.is_(False)).order_by(RawArticle.ingested_at)
+    if limit:
+        stmt = stmt.limit(limit)
+    if skip_locked:
+        stmt = stmt.with_for_update(skip_locked=True)
+    result = await session.execute(stmt)
+    return [article_to_dict(article) for article in result.scalars().all()]
+
+
+async def build_cluster_states(session: AsyncSession, limit: int | None = None, clusterer: NearDuplicateClusterer | None = None) -> list[AgentState]:
+    """Loads unprocessed articles and returns one `AgentState` per event cluster."""
+    articles = await load_unprocessed_articles(session, limit)
+    clusters = (clusterer or NearDuplicateClusterer()).cluster(articles)
+    return [cluster.to_agent_state() for cluster in clusters]
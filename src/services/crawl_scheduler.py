@@ -0,0 +1,168 @@
+"""
+Incremental crawl scheduler, the long-running ingestion entry point.
+Each run loads the per-query watermarks (newest `publishedAt` seen) from the database, asks
+NewsAPI only for articles published since then (see `CrawlWindow`), stores what is new through
+the ingestion pipeline, then advances the watermarks and records a `CrawlRun` row, so crawl
+cost follows new content rather than total query volume. Watermarks only move after a run
+succeeds. A run in which some query stopped short (page caps, crawl budget, a failed page) is
+recorded as "partial"; the older articles it missed are stored as that query's backfill range,
+which the following runs page through alongside the new articles.
+Run from the project root:
+
+    python -m src.services.crawl_scheduler          # one crawl every CRAWL_INTERVAL_SECONDS
+    python -m src.services.crawl_scheduler --once
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import CRAWL_INTERVAL_SECONDS, NEWS_QUERIES
+from src.db.models import CrawlRun, CrawlWatermark
+from src.services.news_api import CrawlBudget, CrawlWindow
+from src.services.news_fetcher import NewsFetcherService
+from src.services.pipeline import SessionFactory
+from src.logger.custom_logger import get_logger
+from src.logger.tracing import span
+
+logger = get_logger(__name__)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def load_window(session: AsyncSession, queries: list[str]) -> CrawlWindow:
+    rows = (await session.execute(select(CrawlWatermark).where(CrawlWatermark.query.in_(queries)))).scalars().all()
+    return CrawlWindow(
+        since={row.query: _utc(row.published_at) for row in rows},
+        known={row.query: {url: datetime.fromisoformat(ts) for url, ts in (row.recent_urls or {}).items()} for row in rows},
+        backfill={row.query: (_utc(row.backfill_from), _utc(row.backfill_to)) for row in rows if row.backfill_from is not None},
+    )
+
+
+async def save_window(session: AsyncSession, window: CrawlWindow, queries: list[str]) -> int:
+    """Upserts the advanced watermarks; returns how many queries moved forward."""
+    advanced = 0
+    now = datetime.now(timezone.utc)
+    for query in queries:
+        latest = window.latest(query)
+        if latest is None:
+            continue
+        advanced += latest != window.since.get(query)
+        recent = {url: published.isoformat() for url, published in window.recent(query).items()}
+        backfill_from, backfill_to = window.next_backfill(query) or (None, None)
+        await session.merge(CrawlWatermark(
+            query=query, published_at=latest, recent_urls=recent,
+            backfill_from=backfill_from, backfill_to=backfill_to, updated_at=now,
+        ))
+    return advanced
+
+
+class CrawlScheduler:
+    def __init__(
+        self,
+        fetcher: NewsFetcherService,
+        session_factory: SessionFactory,
+        queries: list[str] = NEWS_QUERIES,
+        limit: int | None = None,
+        interval: float = CRAWL_INTERVAL_SECONDS,
+        **pipeline_options,
+    ):
+        self.fetcher = fetcher
+        self.session_factory = session_factory
+        self.queries = list(queries)
+        self.limit = limit              # Articles per query; None leaves it to the NewsAPI page caps
+        self.interval = interval
+        self.pipeline_options = pipeline_options
+
+    async def run_once(self) -> CrawlRun:
+        """One incremental crawl. A failed run is recorded and re-raised, leaving the watermarks as they were."""
+        async with self.session_factory() as session:
+            window = await load_window(session, self.queries)
+            run = CrawlRun(
+                started_at=datetime.now(timezone.utc),
+                status="running",
+                queries=self.queries,
+                incremental_queries=len(window.since),
+            )
+            session.add(run)
+            await session.commit()
+
+        budget = CrawlBudget()
+        try:
+            with span("crawl.run", queries=len(self.queries), incremental=len(window.since)):
+                report = await self.fetcher.run_ingestion(
+                    session_factory=self.session_factory,
+                    limit=self.limit,
+                    queries=self.queries,
+                    crawl_options={"budget": budget, "window": window},
+                    **self.pipeline_options,
+                )
+        except Exception as e:
+            run.status, run.error = "failed", repr(e)
+            await self._finish(run, budget, window)
+            raise
+
+        async with self.session_factory() as session:
+            advanced = await save_window(session, window, self.queries)
+            await session.commit()
+        run.status = "partial" if window.partial else "succeeded"
+        if window.partial:
+            logger.warning(f"Crawl stopped short for {', '.join(window.partial)}; the articles they missed are asked for again next run")
+        run.fetched = report.metrics["fetch"]["processed"]
+        run.inserted, run.skipped, run.failed = report.inserted, report.skipped, report.failed
+        await self._finish(run, budget, window)
+        logger.info(
+            f"Crawl run finished: {run.inserted} new articles from {run.newsapi_requests} NewsAPI requests, "
+            f"{run.overlap_skipped} overlap duplicates dropped, {advanced}/{len(self.queries)} watermarks advanced"
+        )
+        return run
+
+    async def _finish(self, run: CrawlRun, budget: CrawlBudget, window: CrawlWindow):
+        run.finished_at = datetime.now(timezone.utc)
+        run.newsapi_requests = budget.used
+        run.overlap_skipped = window.overlap_skipped
+        async with self.session_factory() as session:
+            await session.merge(run)
+            await session.commit()
+
+    async def run_forever(self):
+        """Crawls every `interval` seconds; a failed run is logged and retried on the next tick."""
+        while True:
+            start = time.monotonic()
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Crawl run failed: {e!r}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - start)))
+
+
+async def main():
+    from src.db.session import AsyncSessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Incremental NewsAPI crawler.")
+    parser.add_argument("--once", action="store_true", help="Run a single crawl and exit")
+    parser.add_argument("--interval", type=float, default=CRAWL_INTERVAL_SECONDS, help="Seconds between crawls")
+    parser.add_argument("--limit", type=int, default=None, help="Max articles per query")
+    args = parser.parse_args()
+
+    await init_db()
+    fetcher = NewsFetcherService()
+    scheduler = CrawlScheduler(fetcher, AsyncSessionLocal, limit=args.limit, interval=args.interval)
+    try:
+        if args.once:
+            await scheduler.run_once()
+        else:
+            await scheduler.run_forever()
+    finally:
+        await fetcher.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
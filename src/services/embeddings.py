@@ -0,0 +1,85 @@
+"""
+Local text embedding backends, shared by clustering and the vector index.
+Everything runs on the CPU in-process: a sentence-transformers model when that package is
+installed, or a dependency-free feature-hashing embedder (offline runs, tests, benchmarks).
+The default "auto" backend picks the model when `sentence-transformers` is installed and the
+hashing embedder otherwise, so a default install can index and answer /chat.
+"""
+
+import re
+import zlib
+from typing import Protocol
+
+import numpy as np
+
+from src.config.config import VECTOR_EMBED_BATCH_SIZE, VECTOR_EMBEDDING_BACKEND, VECTOR_EMBEDDING_MODEL
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+_WORD = re.compile(r"\w+")
+_fallback_logged = False
+
+
+class EmbeddingBackend(Protocol):
+    """Anything that turns texts into a (n, dim) float array, e.g. a local sentence-transformers model."""
+    def embed(self, texts: list[str]) -> np.ndarray: ...
+
+
+class SentenceTransformerBackend:
+    """Local embedding backend; requires the optional `sentence-transformers` package."""
+    def __init__(self, model_name: str = VECTOR_EMBEDDING_MODEL, batch_size: int = VECTOR_EMBED_BATCH_SIZE):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("Install `sentence-transformers` to embed with a local model.") from e
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.batch_size = batch_size
+        self.name = f"sentence-transformers:{model_name}"
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True)
+
+
+class HashingEmbedder:
+    """
+    Signed feature hashing of word unigrams and bigrams into `dim` buckets, L2-normalized.
+    Lexical rather than semantic, but deterministic across processes (CRC32, not `hash()`),
+    so vectors written to disk stay comparable with later queries.
+    """
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.name = f"hashing:{dim}"
+
+    def _features(self, text: str) -> list[int]:
+        words = _WORD.findall(text.lower())
+        return [zlib.crc32(f.encode()) for f in words + [f"{a} {b}" for a, b in zip(words, words[1:])]]
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            hashes = np.array(self._features(text), dtype=np.uint32)
+            if not len(hashes):
+                continue
+            signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+            np.add.at(vectors[i], (hashes >> 1) % self.dim, signs)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+        return vectors
+
+
+def get_embedder(backend: str = VECTOR_EMBEDDING_BACKEND) -> EmbeddingBackend:
+    global _fallback_logged
+    if backend == "hashing":
+        return HashingEmbedder()
+    if backend == "sentence-transformers":
+        return SentenceTransformerBackend()
+    if backend == "auto":
+        try:
+            return SentenceTransformerBackend()
+        except ImportError:
+            if not _fallback_logged:
+                logger.warning("`sentence-transformers` is not installed; embedding with the lexical hashing embedder")
+                _fallback_logged = True
+            return HashingEmbedder()
+    raise ValueError(f"Unknown embedding backend {backend!r}; use 'auto', 'sentence-transformers' or 'hashing'.")
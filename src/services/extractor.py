@@ -0,0 +1,142 @@
+"""
+Concurrent full-text extraction for news article URLs.
+Downloads go through one pooled `httpx.AsyncClient` bounded by a global and a per-host limit,
+while the CPU-bound `trafilatura.extract` step runs in a process pool so it never blocks the event loop.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.config.config import (
+    EXTRACT_MAX_CONCURRENCY,
+    EXTRACT_PER_HOST_CONCURRENCY,
+    EXTRACT_PROCESS_WORKERS,
+    EXTRACT_TIMEOUT_SECONDS,
+    EXTRACT_USER_AGENT,
+)
+from src.logger.custom_logger import get_logger
+from src.logger.tracing import span
+
+logger = get_logger(__name__)
+
+
+def _extract_html(html: str, url: str) -> str | None:
+    """Runs inside a worker process, so it must stay a picklable module-level function."""
+    # Imported here: trafilatura (and lxml) load only in the processes that extract
+    import trafilatura
+
+    return trafilatura.extract(html, url=url)
+
+
+class ArticleExtractor:
+    """
+    Downloads article pages concurrently and extracts their main body text.
+    One instance should be shared per ingestion run so the HTTP connection pool and the
+    process pool are reused across every URL.
+    """
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        max_concurrency: int = EXTRACT_MAX_CONCURRENCY,
+        per_host_concurrency: int = EXTRACT_PER_HOST_CONCURRENCY,
+        timeout: float = EXTRACT_TIMEOUT_SECONDS,
+        executor: Executor | None = None,
+        process_workers: int | None = EXTRACT_PROCESS_WORKERS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.timeout = timeout
+        self.process_workers = process_workers
+
+        self._client = client
+        self._owns_client = client is None
+        self._executor = executor
+        self._owns_executor = executor is None
+
+        self._global_limit = asyncio.Semaphore(max_concurrency)
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared, pooled HTTP client (created on first use)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                timeout=httpx.Timeout(self.timeout),
+                headers={"User-Agent": EXTRACT_USER_AGENT},
+                follow_redirects=True,
+            )
+        return self._client
+
+    @property
+    def executor(self) -> Executor | None:
+        """The process pool for `trafilatura.extract`. `process_workers=0` runs it in a thread instead."""
+        if self._executor is None and self.process_workers != 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._executor
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_limits[host]
+
+    async def _download(self, url: str, deadline: asyncio.Timeout) -> str | None:
+        # Take the per-host slot first so a busy publisher doesn't hold global slots while queueing
+        async with self._host_limit(url), self._global_limit:
+            # The URL's time budget starts once it has its slots, not while it queues for them
+            deadline.reschedule(asyncio.get_running_loop().time() + self.timeout)
+            response = await self.client.get(url)
+            response.raise_for_status()
+            return response.text
+
+    async def _extract(self, html: str, url: str) -> str | None:
+        if self.executor is None:
+            return await asyncio.to_thread(_extract_html, html, url)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _extract_html, html, url)
+
+    async def extract(self, url: str) -> str | None:
+        """Downloads a single URL and returns its extracted text, or None if anything fails."""
+        try:
+            # One deadline for download and parse together, in a worker process or a thread
+            async with asyncio.timeout(None) as deadline:
+                with span("extract.download"):
+                    html = await self._download(url, deadline)
+                if not html:
+                    return None
+                with span("extract.parse", html_bytes=len(html)):
+                    return await self._extract(html, url)
+        except TimeoutError:
+            logger.warning(f"Extraction timed out after {self.timeout}s: {url}")
+        except httpx.HTTPError as e:
+            logger.warning(f"Download failed for {url}: {e}")
+        except Exception as e:
+            logger.error(f"Extraction failed for {url}: {e}")
+        return None
+
+    async def extract_many(self, urls: list[str]) -> dict[str, str | None]:
+        """Extracts every URL concurrently (within the configured limits)."""
+        results = await asyncio.gather(*(self.extract(url) for url in urls))
+        return dict(zip(urls, results))
+
+    async def aclose(self):
+        """Releases the HTTP connection pool and the process pool if this instance created them."""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,247 @@
+"""
+Response cache for /feed pages.
+Stories are only written when the processor runs, so encoded pages are kept (with their ETag)
+instead of being rebuilt from the database on every read. Keyset pagination makes
+invalidation precise: new stories are always newer than every existing cursor, so they can
+only change the first page. Publishing drops the first-page entries and nothing else.
+
+Backends: an in-process LRU (default), or Redis so several API workers and the processor
+share one cache. With the in-process backend in a separate API process, first pages also
+expire after `FEED_CACHE_HEAD_TTL_SECONDS` as the processor cannot reach that memory.
+Cursor pages do change when stories are edited, archived or restored, so they expire after
+`FEED_CACHE_PAGE_TTL_SECONDS` (archive and restore also clear the cache).
+
+Every `invalidate_head` and `clear` bumps a version. A reader reads it before querying the
+database and passes it to `set`, which stores nothing once it is stale: otherwise a page built
+just before a publish could be written back right after its invalidation.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from src.config.config import (
+    FEED_CACHE_BACKEND,
+    FEED_CACHE_HEAD_TTL_SECONDS,
+    FEED_CACHE_MAX_BYTES,
+    FEED_CACHE_MAX_ENTRIES,
+    FEED_CACHE_PAGE_TTL_SECONDS,
+    FEED_CACHE_REDIS_URL,
+)
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    body: bytes
+    etag: str
+    head: bool                  # First page (no cursor): the only kind new stories invalidate
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def page_key(limit: int, cursor: str | None, include_content: bool) -> str:
+    return f"{limit}:{int(include_content)}:{cursor or ''}"
+
+
+class FeedCache(Protocol):
+    async def get(self, key: str) -> CachedPage | None: ...
+    async def version(self) -> int: ...
+    async def set(self, key: str, body: bytes, head: bool, version: int | None = None) -> CachedPage: ...
+    async def invalidate_head(self) -> int: ...
+    async def clear(self): ...
+    async def stats(self) -> dict: ...
+
+
+class InMemoryFeedCache:
+    """LRU bounded by entry count and by total body bytes."""
+    def __init__(
+        self,
+        max_entries: int = FEED_CACHE_MAX_ENTRIES,
+        max_bytes: int = FEED_CACHE_MAX_BYTES,
+        head_ttl_seconds: float | None = FEED_CACHE_HEAD_TTL_SECONDS,
+        page_ttl_seconds: float | None = FEED_CACHE_PAGE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.head_ttl_seconds = head_ttl_seconds
+        self.page_ttl_seconds = page_ttl_seconds
+        self._version = 0
+        self._entries: OrderedDict[str, tuple[CachedPage, float]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _drop(self, key: str):
+        page, _ = self._entries.pop(key)
+        self.bytes -= len(page.body)
+
+    async def get(self, key: str) -> CachedPage | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            page, stored_at = entry
+            ttl = self.head_ttl_seconds if page.head else self.page_ttl_seconds
+            if ttl is not None and time.monotonic() - stored_at > ttl:
+                self._drop(key)
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return page
+        self.misses += 1
+        return None
+
+    async def version(self) -> int:
+        return self._version
+
+    async def set(self, key: str, body: bytes, head: bool, version: int | None = None) -> CachedPage:
+        page = CachedPage(body=body, etag=make_etag(body), head=head)
+        if version is not None and version != self._version:
+            return page
+        if key in self._entries:
+            self._drop(key)
+        if len(body) > self.max_bytes:
+            return page
+        self._entries[key] = (page, time.monotonic())
+        self.bytes += len(body)
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+        return page
+
+    async def invalidate_head(self) -> int:
+        heads = [key for key, (page, _) in self._entries.items() if page.head]
+        for key in heads:
+            self._drop(key)
+        self._version += 1
+        self.invalidations += len(heads)
+        return len(heads)
+
+    async def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+        self._version += 1
+
+    async def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class RedisFeedCache:
+    """
+    Shared cache in Redis; requires the optional `redis` package. Redis does the LRU eviction
+    (configure `maxmemory-policy allkeys-lru`); first-page keys are tracked in a set so
+    `invalidate_head` deletes exactly those. The version check and the write run in one Lua
+    script, so an invalidation cannot slip in between them.
+    """
+    # KEYS: version, page, heads; ARGV: expected version ("" to skip the check), body, etag, head, ttl
+    _SET_SCRIPT = """
+    if ARGV[1] ~= "" and (redis.call("GET", KEYS[1]) or "0") ~= ARGV[1] then
+        return 0
+    end
+    redis.call("DEL", KEYS[2])
+    redis.call("HSET", KEYS[2], "body", ARGV[2], "etag", ARGV[3], "head", ARGV[4])
+    if ARGV[4] == "1" then
+        redis.call("SADD", KEYS[3], KEYS[2])
+    elseif tonumber(ARGV[5]) > 0 then
+        redis.call("EXPIRE", KEYS[2], ARGV[5])
+    end
+    return 1
+    """
+
+    def __init__(
+        self,
+        url: str = FEED_CACHE_REDIS_URL,
+        prefix: str = "sentinel:feed",
+        page_ttl_seconds: int | None = FEED_CACHE_PAGE_TTL_SECONDS,
+    ):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise ImportError("Install `redis` to use the Redis feed cache backend.") from e
+        self.redis = Redis.from_url(url)
+        self.prefix = prefix
+        self.page_ttl_seconds = page_ttl_seconds
+        self._set_script = self.redis.register_script(self._SET_SCRIPT)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:page:{key}"
+
+    async def get(self, key: str) -> CachedPage | None:
+        stored = await self.redis.hmget(self._key(key), "body", "etag", "head")
+        if stored[0] is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedPage(body=stored[0], etag=stored[1].decode(), head=stored[2] == b"1")
+
+    async def version(self) -> int:
+        return int(await self.redis.get(f"{self.prefix}:version") or 0)
+
+    async def set(self, key: str, body: bytes, head: bool, version: int | None = None) -> CachedPage:
+        page = CachedPage(body=body, etag=make_etag(body), head=head)
+        await self._set_script(
+            keys=[f"{self.prefix}:version", self._key(key), f"{self.prefix}:heads"],
+            args=["" if version is None else version, body, page.etag, int(head), self.page_ttl_seconds or 0],
+        )
+        return page
+
+    async def invalidate_head(self) -> int:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(f"{self.prefix}:version")
+            pipe.smembers(f"{self.prefix}:heads")
+            _, heads = await pipe.execute()
+        if heads:
+            await self.redis.delete(*heads)
+            await self.redis.srem(f"{self.prefix}:heads", *heads)
+        self.invalidations += len(heads)
+        return len(heads)
+
+    async def clear(self):
+        await self.redis.incr(f"{self.prefix}:version")
+        keys = [key async for key in self.redis.scan_iter(f"{self.prefix}:*") if key != f"{self.prefix}:version".encode()]
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        memory = await self.redis.info("memory")
+        return {
+            "backend": "redis",
+            "head_entries": await self.redis.scard(f"{self.prefix}:heads"),
+            "bytes": memory.get("used_memory"),     # Whole Redis instance
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+_feed_cache: FeedCache | None = None
+
+
+def get_feed_cache() -> FeedCache:
+    """The process-wide feed cache (also usable as a FastAPI dependency)."""
+    global _feed_cache
+    if _feed_cache is None:
+        _feed_cache = RedisFeedCache() if FEED_CACHE_BACKEND == "redis" else InMemoryFeedCache()
+    return _feed_cache
@@ -0,0 +1,365 @@
+"""
+Streaming NewsAPI client.
+Fans out over many queries and result pages concurrently through one pooled `httpx.AsyncClient`,
+backs off exponentially on 429s, stops at a per-crawl request budget, and yields articles
+as soon as their page arrives. A `CrawlWindow` narrows each query to articles published since
+its watermark, plus any older range an earlier crawl could not finish.
+"""
+
+import asyncio
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+import httpx
+
+from src.config.config import (
+    NEWS_API_BACKOFF_BASE_SECONDS,
+    NEWS_API_BACKOFF_MAX_SECONDS,
+    NEWS_API_BASE_URL,
+    NEWS_API_CRAWL_BUDGET,
+    NEWS_API_MAX_CONCURRENCY,
+    NEWS_API_MAX_PAGES,
+    NEWS_API_MAX_RETRIES,
+    NEWS_API_PAGE_SIZE,
+    NEWS_API_WATERMARK_OVERLAP_MINUTES,
+)
+from src.logger.custom_logger import get_logger
+from src.logger.tracing import span
+
+logger = get_logger(__name__)
+
+_DONE = object()
+HEAD, BACKFILL = "head", "backfill"     # The two ranges a `CrawlWindow` can ask one query for
+
+
+class CrawlBudget:
+    """Caps the number of HTTP requests a single crawl may send to NewsAPI (retries included)."""
+    def __init__(self, max_requests: int = NEWS_API_CRAWL_BUDGET):
+        self.max_requests = max_requests
+        self.used = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.used >= self.max_requests
+
+    def try_spend(self) -> bool:
+        if self.exhausted:
+            return False
+        self.used += 1
+        return True
+
+
+def _published_at(article: dict) -> datetime | None:
+    try:
+        published = datetime.fromisoformat(article["publishedAt"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return published if published.tzinfo else published.replace(tzinfo=timezone.utc)
+
+
+def _timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class CrawlWindow:
+    """
+    Per-query "since last run" bounds for one crawl.
+    Each query with a watermark is asked only for articles published after it, minus `overlap`
+    to catch articles NewsAPI indexes late. Articles inside the overlap that the previous run
+    already returned (`known`, url -> publishedAt per query) are dropped in memory, before any
+    database check or download. What the crawl returns is collected per query, so the next
+    watermark and overlap set can be taken from it.
+    Results come newest first, so when a query's crawl stops short (more results than the page
+    caps allow, an exhausted budget, a failed page) the articles it missed are the oldest ones.
+    The watermark still moves to the newest article, and the range between the old watermark and
+    the oldest article of the unbroken leading pages is kept as the query's `backfill`. Later runs
+    page through it with NewsAPI's `to` next to the new range, narrowing it until it is complete.
+    A query has one backfill range: if the new range is cut short again while an older backfill
+    is pending, the newer gap wins and the older one is given up (with a warning).
+    """
+    def __init__(
+        self,
+        since: dict[str, datetime] | None = None,
+        known: dict[str, dict[str, datetime]] | None = None,
+        backfill: dict[str, tuple[datetime, datetime]] | None = None,
+        overlap: timedelta = timedelta(minutes=NEWS_API_WATERMARK_OVERLAP_MINUTES),
+    ):
+        self.since = since or {}
+        self.backfill = backfill or {}
+        self.overlap = overlap
+        self.seen: dict[str, dict[str, datetime]] = {query: dict(urls) for query, urls in (known or {}).items()}
+        self.known_urls: set[str] = {url for urls in self.seen.values() for url in urls}
+        self.overlap_skipped = 0
+        self.page_oldest: dict[tuple[str, str], dict[int, datetime]] = {}    # (query, range) -> page -> oldest publishedAt
+        self.first_missing: dict[tuple[str, str], int] = {}                 # (query, range) -> first page not fetched
+
+    @property
+    def partial(self) -> list[str]:
+        """Queries whose crawl did not reach the oldest matching article of a range."""
+        return sorted({query for query, _ in self.first_missing})
+
+    def ranges(self, query: str) -> list[str]:
+        """The ranges to crawl for `query`: the new articles, and its backfill if one is pending."""
+        return [HEAD, BACKFILL] if query in self.backfill else [HEAD]
+
+    def params(self, query: str, part: str = HEAD) -> dict:
+        if part == BACKFILL:
+            since, until = self.backfill[query]
+            return {"from": _timestamp(since - self.overlap), "to": _timestamp(until), "sortBy": "publishedAt"}
+        since = self.since.get(query)
+        if since is None:
+            return {}
+        return {"from": _timestamp(since - self.overlap), "sortBy": "publishedAt"}
+
+    def observe(self, query: str, articles: list[dict], part: str = HEAD, page: int = 1):
+        seen = self.seen.setdefault(query, {})
+        dates = []
+        for article in articles:
+            published = _published_at(article)
+            if published is not None and article.get("url"):
+                seen[article["url"]] = published
+                dates.append(published)
+        if dates:
+            self.page_oldest.setdefault((query, part), {})[page] = min(dates)
+
+    def truncated(self, query: str, page: int, part: str = HEAD):
+        """Records that `page` and everything after it were not fetched for one of `query`'s ranges."""
+        key = (query, part)
+        self.first_missing[key] = min(page, self.first_missing.get(key, page))
+
+    def _fetched_down_to(self, query: str, part: str) -> datetime | None:
+        """Oldest article of the pages before the first missing one; None if the first page is missing."""
+        first_missing = self.first_missing[(query, part)]
+        pages = self.page_oldest.get((query, part), {})
+        return min((oldest for page, oldest in pages.items() if page < first_missing), default=None)
+
+    def latest(self, query: str) -> datetime | None:
+        """The query's next watermark, never older than the current one."""
+        current = self.since.get(query)
+        if (query, HEAD) in self.first_missing and self._fetched_down_to(query, HEAD) is None:
+            return current
+        candidates = [*self.seen.get(query, {}).values(), *([current] if current else [])]
+        return max(candidates, default=None)
+
+    def next_backfill(self, query: str) -> tuple[datetime, datetime] | None:
+        """The range the next run still has to page through for `query`, if any."""
+        pending = self.backfill.get(query)
+        if pending is not None:
+            if (query, BACKFILL) not in self.first_missing:
+                pending = None      # Paged through to its oldest article
+            elif (oldest := self._fetched_down_to(query, BACKFILL)) is not None:
+                pending = (pending[0], oldest) if oldest > pending[0] else None
+
+        since = self.since.get(query)
+        # Without a watermark (the first run) there is nothing to fill in below what was fetched
+        if since is None or (query, HEAD) not in self.first_missing:
+            return pending
+        oldest = self._fetched_down_to(query, HEAD)
+        if oldest is None or oldest <= since:
+            return pending
+        if pending is not None:
+            logger.warning(f"Giving up the backfill of '{query}' from {pending[0]} to {pending[1]}: newer articles were cut short too")
+        return since, oldest
+
+    def recent(self, query: str) -> dict[str, datetime]:
+        """The query's articles the next run will be asked for again (url -> publishedAt)."""
+        latest = self.latest(query)
+        if latest is None:
+            return {}
+        return {url: published for url, published in self.seen.get(query, {}).items() if published >= latest - self.overlap}
+
+
+class NewsAPIClient:
+    """
+    Async client for NewsAPI's `/v2/everything` endpoint.
+    A single instance owns one connection pool; share it for the lifetime of a crawl.
+    """
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = NEWS_API_BASE_URL,
+        client: httpx.AsyncClient | None = None,
+        max_concurrency: int = NEWS_API_MAX_CONCURRENCY,
+        page_size: int = NEWS_API_PAGE_SIZE,
+        max_pages: int = NEWS_API_MAX_PAGES,
+        max_retries: int = NEWS_API_MAX_RETRIES,
+        backoff_base: float = NEWS_API_BACKOFF_BASE_SECONDS,
+        backoff_max: float = NEWS_API_BACKOFF_MAX_SECONDS,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._client = client
+        self._owns_client = client is None
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared, pooled HTTP client (created on first use)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+                timeout=httpx.Timeout(30.0),
+            )
+        return self._client
+
+    def _backoff_delay(self, attempt: int, response: httpx.Response | None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def fetch_page(self, query: str, page: int, page_size: int, budget: CrawlBudget, **params) -> dict | None:
+        """Fetches one result page, retrying 429s and 5xx with backoff. Returns None if it gives up."""
+        request_params = {
+            "q": query,
+            "language": "en",
+            "page": page,
+            "pageSize": page_size,
+            "apiKey": self.api_key,
+            **params,
+        }
+        for attempt in range(self.max_retries + 1):
+            if not budget.try_spend():
+                logger.warning(f"Crawl budget of {budget.max_requests} requests exhausted; skipping '{query}' page {page}")
+                return None
+
+            response = None
+            try:
+                async with self._limit:
+                    with span("newsapi.request", query=query, page=page, attempt=attempt) as s:
+                        response = await self.client.get(self.base_url, params=request_params)
+                        s.set(status=response.status_code)
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return response.json()
+            except httpx.TransportError as e:
+                logger.warning(f"NewsAPI transport error for '{query}' page {page}: {e}")
+            except httpx.HTTPStatusError as e:
+                logger.error(f"NewsAPI rejected '{query}' page {page}: {e}")
+                return None
+
+            if attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, response)
+                status = response.status_code if response is not None else "error"
+                logger.warning(f"NewsAPI {status} for '{query}' page {page}; retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        logger.error(f"Giving up on '{query}' page {page} after {self.max_retries} retries")
+        return None
+
+    async def _crawl_query(
+        self,
+        query: str,
+        queue: asyncio.Queue,
+        budget: CrawlBudget,
+        max_results: int | None,
+        params: dict,
+        window: CrawlWindow | None = None,
+        part: str = HEAD,
+    ):
+        if window is not None:
+            params = {**params, **window.params(query, part)}
+        page_size = min(self.page_size, max_results) if max_results else self.page_size
+        max_pages = self.max_pages
+        if max_results:
+            max_pages = min(max_pages, math.ceil(max_results / page_size))
+
+        async def deliver(articles: list[dict], page: int):
+            if window is not None:
+                window.observe(query, articles, part, page)
+            await queue.put(articles)
+
+        def missed(page: int):
+            if window is not None:
+                window.truncated(query, page, part)
+
+        first = await self.fetch_page(query, 1, page_size, budget, **params)
+        if first is None:
+            missed(1)
+            return
+        await deliver(first.get("articles", []), 1)
+
+        total_results = first.get("totalResults", 0)
+        total_pages = min(max_pages, math.ceil(total_results / page_size))
+        # Stopping at the caller's `max_results` is what was asked for; only the page caps cut a range short
+        if min(total_results, max_results or total_results) > total_pages * page_size:
+            missed(total_pages + 1)
+            if window is not None:
+                logger.warning(f"'{query}' has {total_results} results in its {part} range; only {total_pages * page_size} are fetched")
+        if total_pages <= 1:
+            return
+
+        async def crawl_page(page: int):
+            data = await self.fetch_page(query, page, page_size, budget, **params)
+            if data is None:
+                missed(page)
+            else:
+                await deliver(data.get("articles", []), page)
+
+        async with asyncio.TaskGroup() as tg:
+            for page in range(2, total_pages + 1):
+                tg.create_task(crawl_page(page))
+
+    async def stream(
+        self,
+        queries: list[str],
+        max_results: int | None = None,
+        budget: CrawlBudget | None = None,
+        window: CrawlWindow | None = None,
+        **params,
+    ) -> AsyncIterator[dict]:
+        """
+        Yields articles for every query as their pages arrive. Articles already yielded
+        by an overlapping query, or known from the previous run's `window`, are dropped by URL.
+        `max_results` caps the articles requested per query; extra `params` go straight to NewsAPI.
+        """
+        budget = budget or CrawlBudget()
+        # Bounded so a slow consumer applies backpressure to the crawl
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, len(queries)))
+
+        async def crawl_all():
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for query in queries:
+                        for part in window.ranges(query) if window is not None else [HEAD]:
+                            tg.create_task(self._crawl_query(query, queue, budget, max_results, params, window, part))
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(_DONE)
+
+        producer = asyncio.create_task(crawl_all())
+        seen_urls: set[str] = set()
+        try:
+            while (articles := await queue.get()) is not _DONE:
+                if isinstance(articles, Exception):
+                    raise articles
+                for article in articles:
+                    url = article.get("url")
+                    if url in seen_urls:
+                        continue
+                    if window is not None and url in window.known_urls:
+                        window.overlap_skipped += 1
+                        seen_urls.add(url)
+                        continue
+                    seen_urls.add(url)
+                    yield article
+        finally:
+            # Stops in-flight page requests if the consumer bails out early
+            producer.cancel()
+        logger.info(f"Crawl finished: {len(seen_urls)} unique articles, {budget.used} NewsAPI requests")
+
+    async def aclose(self):
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
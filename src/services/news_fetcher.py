@@ -1,105 +1,165 @@
 import os
-import httpx
-import trafilatura
 from datetime import datetime, timezone
+from typing import AsyncIterator
+from uuid import uuid4
 from dateutil import parser
+from pydantic import HttpUrl, TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.api.schemas import RawArticleCreate
+from src.config.config import NEWS_API_BASE_URL, NEWS_QUERIES, RAW_JSON_COMPACT
+from src.db.bulk import insert_ignore_conflicts
 from src.db.models import RawArticle
+from src.services.extractor import ArticleExtractor
+from src.services.news_api import NewsAPIClient
+from src.services.pipeline import BatchResult, IngestionPipeline, IngestionReport, SessionFactory, shared_session_factory
 from src.logger.custom_logger import get_logger
+from src.logger.tracing import span
 
 # Set up a logger
 logger = get_logger(__name__)
 
+_HTTP_URL = TypeAdapter(HttpUrl)
+
+# NewsAPI payload fields that `raw_article` already stores in columns
+_COLUMN_FIELDS = ("title", "url", "urlToImage", "publishedAt")
+
+
+def compact_payload(article_data: dict) -> dict:
+    """The NewsAPI payload without the fields kept in columns; `expand_payload` restores them."""
+    payload = {key: value for key, value in article_data.items() if key not in _COLUMN_FIELDS}
+    source = payload.pop("source", None) or {}
+    # `source_id` holds the id, or the name when there is no id
+    if source.get("id") and source.get("name"):
+        payload["source"] = {"name": source["name"]}
+    return payload
+
+
+def expand_payload(article: RawArticle) -> dict:
+    """The full NewsAPI payload of a stored article (from a compact or a full `raw_json`)."""
+    payload = dict(article.raw_json or {})
+    if "url" in payload:
+        return payload
+    name = (payload.pop("source", None) or {}).get("name")
+    published_at = article.published_at
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=timezone.utc)
+    return {
+        "source": {"id": article.source_id if name else None, "name": name or article.source_id},
+        **payload,
+        "title": article.title,
+        "url": article.url,
+        "urlToImage": article.urlToImage,
+        "publishedAt": published_at.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
 class NewsFetcherService:
     """
     This service is responsible for fetching news articles from external APIs (like NewsAPI),
     extracting the full text using Trafilatura, validating the data with Pydantic, 
     and saving it to the database using SQLAlchemy.
     """
-    def __init__(self):
+    def __init__(self, extractor: ArticleExtractor | None = None, news_api: NewsAPIClient | None = None):
         self.api_key = os.getenv("NEWS_API_KEY")
         if not self.api_key:
             raise ValueError("NEWS_API_KEY is not set in the environment.")
-        self.base_url = "https://newsapi.org/v2/everything"
+        self.base_url = NEWS_API_BASE_URL
+        self.extractor = extractor or ArticleExtractor()
+        self.news_api = news_api or NewsAPIClient(api_key=self.api_key, base_url=self.base_url)
 
     async def fetch_news_api(self, query: str = "Artificial Intelligence", limit: int = 5) -> list[dict]:
         """Fetches raw JSON from NewsAPI."""
         logger.info(f"Fetching news for query: {query}")
-        params = {
-            "q": query,
-            "language": "en",
-            "pageSize": limit,
-            "apiKey": self.api_key
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.base_url, params=params)
-            response.raise_for_status()
-            return response.json().get("articles", [])
+        with span("newsapi.fetch", query=query) as s:
+            articles = [article async for article in self.news_api.stream([query], max_results=limit)]
+            s.set(articles=len(articles))
+        return articles
+
+    def stream_news(self, queries: list[str] = NEWS_QUERIES, limit: int | None = None, **params) -> AsyncIterator[dict]:
+        """Streams articles for many queries concurrently; see `NewsAPIClient.stream`."""
+        logger.info(f"Streaming news for {len(queries)} queries")
+        return self.news_api.stream(queries, max_results=limit, **params)
 
-    def extract_full_text(self, url: str) -> str | None:
+    async def extract_full_text(self, url: str) -> str | None:
         """Uses `trafilatura` to extract the main article body."""
         logger.info(f"Extracting text from: {url}")
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded is None:
+        with span("extract", url=url) as s:
+            text = await self.extractor.extract(url)
+            s.set(extracted=text is not None)
+        return text
+
+    async def aclose(self):
+        """Closes the shared NewsAPI and extraction HTTP clients and the process pool."""
+        await self.news_api.aclose()
+        await self.extractor.aclose()
+
+    @staticmethod
+    def normalize_url(url: str) -> str | None:
+        """Normalizes a URL the same way Pydantic will store it (None if it is invalid)."""
+        try:
+            return str(_HTTP_URL.validate_python(url))
+        except ValidationError:
+            logger.error(f"Invalid URL, skipping: {url}")
             return None
-        return trafilatura.extract(downloaded)
-
-    async def run_ingestion(self, session: AsyncSession, limit: int = 5):
-        """The main pipeline: Fetch -> Extract -> Validate -> Save"""
-        raw_articles = await self.fetch_news_api(limit=limit)
-        
-        saved_count = 0
-        for article_data in raw_articles:
-            # Skip articles that were removed or don't have a URL
-            if article_data.get("title") == "[Removed]" or not article_data.get("url"):
-                continue
-
-            url = article_data["url"]
-            
-            # 1. Extract Full Text
-            full_text = self.extract_full_text(url)
-            
-            # 2. Validate Data with Pydantic
-            try:
-                # We use dateutil.parser because NewsAPI dates can sometimes vary in format
-                published_at = parser.parse(article_data["publishedAt"])
-                
-                validated_data = RawArticleCreate(
-                    source_id=article_data["source"].get("id") or article_data["source"].get("name", "unknown"),
-                    url=url,
-                    title=article_data["title"],
-                    published_at=published_at,
-                    content=full_text,
-                    raw_json=article_data,
-                    urlToImage=article_data.get("urlToImage")
-                )
-            except Exception as e:
-                logger.error(f"Validation failed for {url}: {e}")
-                continue
-
-            # 3. Save to Database (SQLAlchemy)
-            # Check if it already exists to avoid UniqueConstraint errors on the URL
-            from sqlalchemy import select
-            existing = await session.execute(select(RawArticle).where(RawArticle.url == str(validated_data.url)))
-            if existing.scalar_one_or_none():
-                logger.info(f"Article already exists in DB, skipping: {url}")
-                continue
-
-            new_article = RawArticle(
-                source_id=validated_data.source_id,
-                url=str(validated_data.url),
-                title=validated_data.title,
-                content=validated_data.content,
-                raw_json=validated_data.raw_json,
-                published_at=validated_data.published_at,
-                urlToImage=validated_data.urlToImage,
-                ingested_at=datetime.now(timezone.utc)
+
+    def validate_article(self, article_data: dict, full_text: str | None) -> dict | None:
+        """Validates one NewsAPI article with Pydantic and returns it as a `raw_article` row."""
+        url = article_data["url"]
+        try:
+            # We use dateutil.parser because NewsAPI dates can sometimes vary in format
+            published_at = parser.parse(article_data["publishedAt"])
+
+            validated_data = RawArticleCreate(
+                source_id=article_data["source"].get("id") or article_data["source"].get("name", "unknown"),
+                url=url,
+                title=article_data["title"],
+                published_at=published_at,
+                content=full_text,
+                raw_json=article_data,
+                urlToImage=article_data.get("urlToImage")
             )
-            session.add(new_article)
-            saved_count += 1
+        except Exception as e:
+            logger.error(f"Validation failed for {url}: {e}")
+            return None
+
+        return {
+            "id": uuid4(),
+            "source_id": validated_data.source_id,
+            "url": str(validated_data.url),
+            "title": validated_data.title,
+            "content": validated_data.content,
+            "raw_json": compact_payload(validated_data.raw_json) if RAW_JSON_COMPACT else validated_data.raw_json,
+            "published_at": validated_data.published_at,
+            "urlToImage": validated_data.urlToImage,
+            "ingested_at": datetime.now(timezone.utc),
+            "processed": False,
+        }
+
+    async def store_rows(self, session: AsyncSession, rows: list[dict]) -> BatchResult:
+        """Saves validated rows with one INSERT; the unique url index absorbs duplicates."""
+        inserted_ids = await insert_ignore_conflicts(session, RawArticle, rows, ["url"], returning=RawArticle.id)
+        return BatchResult(inserted=len(inserted_ids), skipped=len(rows) - len(inserted_ids))
+
+    async def run_ingestion(
+        self,
+        session: AsyncSession | None = None,
+        limit: int = 5,
+        queries: list[str] | None = None,
+        session_factory: SessionFactory | None = None,
+        **pipeline_options,
+    ) -> IngestionReport:
+        """
+        The main pipeline: Fetch -> Extract -> Validate -> Save
+        Runs as concurrent stages joined by bounded queues (see `IngestionPipeline`), committing
+        every few rows. Pass a `session_factory` to give each store worker its own session;
+        a single `session` is shared between stages instead. `limit` caps the articles per query.
+        """
+        if session_factory is None:
+            if session is None:
+                raise ValueError("run_ingestion needs either a session or a session_factory.")
+            session_factory = shared_session_factory(session)
 
-        # Commit the transaction
-        await session.commit()
-        logger.info(f"Ingestion complete. Saved {saved_count} new articles to the database.")
\ No newline at end of file
+        pipeline = IngestionPipeline(self, session_factory, **pipeline_options)
+        report = await pipeline.run(queries or NEWS_QUERIES, limit=limit)
+        logger.info(f"Ingestion complete. Saved {report.inserted} new articles to the database.")
+        return report
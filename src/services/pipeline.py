@@ -0,0 +1,316 @@
+"""
+Staged ingestion pipeline: fetch -> extract -> validate -> store.
+Stages are connected by bounded `asyncio.Queue`s, so a slow stage applies backpressure upstream
+and memory stays flat no matter how large the crawl is. Each stage has its own worker count,
+and the store stage commits in periodic batches so a late failure only loses the current batch.
+"""
+
+import asyncio
+import inspect
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncContextManager, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import (
+    INGEST_BATCH_SIZE,
+    INGEST_SKIP_EXISTING,
+    PIPELINE_COMMIT_EVERY,
+    PIPELINE_EXTRACT_WORKERS,
+    PIPELINE_FLUSH_INTERVAL_SECONDS,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_STORE_WORKERS,
+    PIPELINE_VALIDATE_WORKERS,
+)
+from src.db.bulk import existing_values
+from src.db.models import RawArticle
+from src.logger.custom_logger import get_logger
+from src.logger.tracing import span
+
+if TYPE_CHECKING:
+    from src.services.news_fetcher import NewsFetcherService
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+@dataclass
+class BatchResult:
+    """Per-batch ingestion outcome."""
+    inserted: int = 0
+    skipped: int = 0   # Already stored, or duplicated within the crawl
+    failed: int = 0    # Invalid URL or failed validation
+
+
+@dataclass
+class StageMetrics:
+    """Throughput and queue-depth counters for one pipeline stage."""
+    name: str
+    workers: int
+    processed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+    queue: "MeteredQueue | None" = field(default=None, repr=False)  # The stage's input queue
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Items per second of wall time since the stage started."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "throughput_per_sec": round(self.throughput, 2),
+            "busy_seconds": round(self.busy_seconds, 3),
+            "elapsed_seconds": round(self.elapsed, 3),
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.queue.max_depth if self.queue else 0,
+        }
+
+
+class MeteredQueue(asyncio.Queue):
+    """A bounded queue that remembers its high-water mark."""
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.max_depth = 0
+
+    async def put(self, item):
+        await super().put(item)
+        self.max_depth = max(self.max_depth, self.qsize())
+
+
+@dataclass
+class IngestionReport:
+    batches: list[BatchResult]
+    metrics: dict[str, dict]
+
+    @property
+    def inserted(self) -> int:
+        return sum(b.inserted for b in self.batches)
+
+    @property
+    def skipped(self) -> int:
+        return self.metrics["fetch"]["skipped"] + sum(b.skipped for b in self.batches)
+
+    @property
+    def failed(self) -> int:
+        return self.metrics["fetch"]["failed"] + self.metrics["validate"]["failed"]
+
+
+def shared_session_factory(session: AsyncSession) -> SessionFactory:
+    """Lets every stage share one caller-owned session; the lock keeps its use sequential."""
+    lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def factory():
+        async with lock:
+            yield session
+
+    return factory
+
+
+class IngestionPipeline:
+    """
+    Runs one crawl through the fetch -> extract -> validate -> store stages.
+    The `fetcher` supplies the stage logic; this class only owns the queues, workers and metrics.
+    """
+    def __init__(
+        self,
+        fetcher: "NewsFetcherService",
+        session_factory: SessionFactory,
+        extract_workers: int = PIPELINE_EXTRACT_WORKERS,
+        validate_workers: int = PIPELINE_VALIDATE_WORKERS,
+        store_workers: int = PIPELINE_STORE_WORKERS,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        commit_every: int = PIPELINE_COMMIT_EVERY,
+        flush_interval: float = PIPELINE_FLUSH_INTERVAL_SECONDS,
+        dedup_batch_size: int = INGEST_BATCH_SIZE,
+        skip_existing: bool = INGEST_SKIP_EXISTING,
+        crawl_options: dict | None = None,
+    ):
+        self.fetcher = fetcher
+        self.session_factory = session_factory
+        self.queue_size = queue_size
+        self.commit_every = commit_every
+        self.flush_interval = flush_interval
+        self.dedup_batch_size = dedup_batch_size
+        self.skip_existing = skip_existing
+        self.crawl_options = crawl_options or {}   # Passed to `stream_news`, e.g. a CrawlBudget or CrawlWindow
+
+        self.stages = {
+            "fetch": StageMetrics("fetch", 1),
+            "extract": StageMetrics("extract", extract_workers),
+            "validate": StageMetrics("validate", validate_workers),
+            "store": StageMetrics("store", store_workers),
+        }
+        self.batches: list[BatchResult] = []
+
+    def metrics(self) -> dict[str, dict]:
+        """Per-stage throughput and queue-depth snapshot; safe to call while the pipeline runs."""
+        return {name: stage.snapshot() for name, stage in self.stages.items()}
+
+    async def run(self, queries: list[str], limit: int | None = None, metrics_interval: float | None = None) -> IngestionReport:
+        extract_q = MeteredQueue(self.queue_size)
+        validate_q = MeteredQueue(self.queue_size)
+        store_q = MeteredQueue(self.queue_size)
+        self.stages["extract"].queue = extract_q
+        self.stages["validate"].queue = validate_q
+        self.stages["store"].queue = store_q
+
+        monitor = asyncio.create_task(self._monitor(metrics_interval)) if metrics_interval else None
+        try:
+            with span("ingestion.run", queries=len(queries)):
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(self._fetch_stage(queries, limit, extract_q))
+                    tg.create_task(self._worker_stage("extract", self._extract, extract_q, validate_q))
+                    tg.create_task(self._worker_stage("validate", self._validate, validate_q, store_q))
+                    tg.create_task(self._store_stage(store_q))
+        finally:
+            if monitor:
+                monitor.cancel()
+
+        report = IngestionReport(batches=self.batches, metrics=self.metrics())
+        logger.info(f"Ingestion pipeline finished: inserted {report.inserted}, skipped {report.skipped}, failed {report.failed}", stages=report.metrics)
+        return report
+
+    async def _monitor(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            logger.info("Ingestion pipeline progress", stages=self.metrics())
+
+    async def _stop_consumers(self, stage: str, queue: asyncio.Queue):
+        for _ in range(self.stages[stage].workers):
+            await queue.put(_STOP)
+
+    # --- STAGES ---
+    async def _fetch_stage(self, queries: list[str], limit: int | None, out_q: asyncio.Queue):
+        metrics = self.stages["fetch"]
+        metrics.started_at = time.perf_counter()
+        seen_urls: set[str] = set()
+        pending: list[dict] = []
+
+        async def forward_new(batch: list[dict]):
+            # One `url IN (...)` check per batch drops stored URLs before any download
+            existing = set()
+            if self.skip_existing:
+                start = time.perf_counter()
+                async with self.session_factory() as session:
+                    existing = await existing_values(session, RawArticle.url, [a["url"] for a in batch])
+                metrics.busy_seconds += time.perf_counter() - start
+                metrics.skipped += len(existing)
+            for article_data in batch:
+                if article_data["url"] not in existing:
+                    await out_q.put(article_data)
+
+        async for article_data in self.fetcher.stream_news(queries, limit=limit, **self.crawl_options):
+            # Skip articles that were removed or don't have a URL
+            if article_data.get("title") == "[Removed]" or not article_data.get("url"):
+                metrics.skipped += 1
+                continue
+            url = self.fetcher.normalize_url(article_data["url"])
+            if url is None:
+                metrics.failed += 1
+                continue
+            if url in seen_urls:
+                metrics.skipped += 1
+                continue
+            seen_urls.add(url)
+            metrics.processed += 1
+            pending.append({**article_data, "url": url})
+            if len(pending) >= self.dedup_batch_size:
+                await forward_new(pending)
+                pending = []
+        if pending:
+            await forward_new(pending)
+
+        metrics.finished_at = time.perf_counter()
+        await self._stop_consumers("extract", out_q)
+
+    async def _extract(self, article_data: dict):
+        full_text = await self.fetcher.extract_full_text(article_data["url"])
+        if full_text is None:
+            # Still stored (without content), like the sequential flow did
+            self.stages["extract"].failed += 1
+        return article_data, full_text
+
+    def _validate(self, item: tuple[dict, str | None]):
+        return self.fetcher.validate_article(*item)
+
+    async def _worker_stage(self, stage: str, handle: Callable, in_q: asyncio.Queue, out_q: asyncio.Queue):
+        metrics = self.stages[stage]
+        metrics.started_at = time.perf_counter()
+
+        async def worker():
+            while (item := await in_q.get()) is not _STOP:
+                start = time.perf_counter()
+                result = handle(item)
+                if inspect.isawaitable(result):
+                    result = await result
+                metrics.busy_seconds += time.perf_counter() - start
+                if result is None:
+                    metrics.failed += 1
+                    continue
+                metrics.processed += 1
+                await out_q.put(result)
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(metrics.workers):
+                tg.create_task(worker())
+
+        metrics.finished_at = time.perf_counter()
+        next_stage = {"extract": "validate", "validate": "store"}[stage]
+        await self._stop_consumers(next_stage, out_q)
+
+    async def _store_stage(self, in_q: asyncio.Queue):
+        metrics = self.stages["store"]
+        metrics.started_at = time.perf_counter()
+
+        async def worker():
+            buffer: list[dict] = []
+            while True:
+                try:
+                    item = await asyncio.wait_for(in_q.get(), timeout=self.flush_interval)
+                except TimeoutError:
+                    item = None  # Idle: commit whatever is buffered
+                if item is not _STOP and item is not None:
+                    buffer.append(item)
+                if buffer and (item is None or item is _STOP or len(buffer) >= self.commit_every):
+                    await self._commit(buffer)
+                    buffer = []
+                if item is _STOP:
+                    return
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(metrics.workers):
+                tg.create_task(worker())
+        metrics.finished_at = time.perf_counter()
+
+    async def _commit(self, rows: list[dict]):
+        metrics = self.stages["store"]
+        start = time.perf_counter()
+        with span("ingestion.commit", rows=len(rows)):
+            async with self.session_factory() as session:
+                result = await self.fetcher.store_rows(session, rows)
+                await session.commit()
+        metrics.busy_seconds += time.perf_counter() - start
+        metrics.processed += result.inserted
+        metrics.skipped += result.skipped
+        self.batches.append(result)
+        logger.info(f"Batch {len(self.batches)}: inserted {result.inserted}, skipped {result.skipped}")
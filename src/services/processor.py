@@ -0,0 +1,192 @@
+"""
+Processor service: turns unprocessed RawArticles into published Stories.
+Each batch is one transaction: claim the oldest unprocessed rows (`FOR UPDATE SKIP LOCKED`,
+so several workers can run side by side), cluster them, run every cluster through the agent
+graph, bulk-insert the Story and StorySource rows and flip `processed`, then commit.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.agents.runner import run_graph_batch
+from src.agents.state import AgentState
+from src.config.config import GRAPH_BATCH_CONCURRENCY, METRICS_PORT, PROCESSOR_BATCH_SIZE
+from src.db.models import RawArticle, Story, StorySource
+from src.services.chat import invalidate_chat_answers
+from src.services.clustering import NearDuplicateClusterer, load_unprocessed_articles
+from src.services.feed_cache import get_feed_cache
+from src.services.pipeline import SessionFactory
+from src.services.semantic_cache import warn_if_process_local
+from src.logger.custom_logger import get_logger
+from src.logger.metrics import serve_metrics
+from src.logger.tracing import traced
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ProcessingReport:
+    claimed: int = 0                # Articles locked by this worker
+    clusters: int = 0
+    stories: int = 0
+    processed: int = 0              # Articles flipped to processed=True
+    failed_clusters: int = 0        # Left unprocessed for a later batch
+    seconds: float = 0.0
+    llm_cost_usd: float = 0.0       # Estimated spend of the batch's graph runs
+
+    def add(self, other: "ProcessingReport"):
+        for name in ("claimed", "clusters", "stories", "processed", "failed_clusters", "seconds", "llm_cost_usd"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+@dataclass
+class _StoryRows:
+    stories: list[dict] = field(default_factory=list)
+    links: list[dict] = field(default_factory=list)
+    article_ids: list[UUID] = field(default_factory=list)
+
+
+def story_rows(states: list[AgentState], results: list[AgentState | None]) -> _StoryRows:
+    """Story + StorySource rows for every finished cluster, and the articles they consumed."""
+    rows = _StoryRows()
+    now = datetime.now(timezone.utc)
+    for state, result in zip(states, results):
+        if result is None or result.get("draft_story") is None:
+            continue
+        story = result["draft_story"]
+        cluster_ids = [str(a["id"]) for a in state["raw_articles"]]
+        # Only link IDs that really belong to the cluster; if the model cited none, the
+        # story was still written from the whole cluster
+        members = set(cluster_ids)
+        cited = [i for i in dict.fromkeys(story.source_article_ids) if i in members] or cluster_ids
+        story_id = uuid4()
+        usage = result.get("usage") or {}
+        rows.stories.append({
+            "id": story_id,
+            "title": story.title,
+            "summary": story.summary,
+            "created_at": now,
+            "citation_verified": bool(result.get("citation_verified")),
+            "llm_usage": usage,
+            "llm_cost_usd": usage.get("total", {}).get("cost_usd", 0.0),
+        })
+        rows.links.extend({"story_id": story_id, "raw_article_id": UUID(i)} for i in cited)
+        rows.article_ids.extend(UUID(i) for i in cluster_ids)
+    return rows
+
+
+class ProcessorService:
+    def __init__(
+        self,
+        clusterer: NearDuplicateClusterer | None = None,
+        batch_size: int = PROCESSOR_BATCH_SIZE,
+        concurrency: int = GRAPH_BATCH_CONCURRENCY,
+        checkpointer: "BaseCheckpointSaver | None" = None,
+        graph=None,
+    ):
+        self.clusterer = clusterer or NearDuplicateClusterer()
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.checkpointer = checkpointer
+        self.graph = graph
+
+    async def persist(self, session: AsyncSession, rows: _StoryRows):
+        """Three set-based statements regardless of how many stories the batch produced."""
+        if rows.stories:
+            await session.execute(insert(Story), rows.stories)
+            await session.execute(insert(StorySource), rows.links)
+        if rows.article_ids:
+            await session.execute(
+                update(RawArticle).where(RawArticle.id.in_(rows.article_ids)).values(processed=True)
+            )
+
+    @traced("processor.batch")
+    async def process_batch(self, session: AsyncSession) -> ProcessingReport:
+        """Claims, processes and commits one batch. Articles of failed clusters stay unprocessed."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        report = ProcessingReport()
+        try:
+            articles = await load_unprocessed_articles(session, self.batch_size, skip_locked=True)
+            report.claimed = len(articles)
+            if not articles:
+                await session.rollback()
+                return report
+
+            states = [cluster.to_agent_state() for cluster in self.clusterer.cluster(articles)]
+            run = await run_graph_batch(states, self.concurrency, graph=self.graph, checkpointer=self.checkpointer)
+            rows = story_rows(states, run.results)
+            await self.persist(session, rows)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+        # New stories only ever change the first feed page, and answers to nearby questions
+        if rows.stories:
+            await get_feed_cache().invalidate_head()
+            await invalidate_chat_answers(rows.stories)
+
+        # Finished threads are only worth keeping until their stories are committed
+        if self.checkpointer is not None:
+            from src.agents.checkpoint import thread_id
+
+            for state, result in zip(states, run.results):
+                if result is not None:
+                    await self.checkpointer.adelete_thread(thread_id(state))
+
+        report.clusters = len(states)
+        report.stories = len(rows.stories)
+        report.processed = len(rows.article_ids)
+        report.failed_clusters = len(run.errors)
+        report.seconds = loop.time() - start
+        report.llm_cost_usd = run.usage.get("total", {}).get("cost_usd", 0.0)
+        logger.info(
+            f"Processed batch: {report.claimed} articles -> {report.clusters} clusters -> "
+            f"{report.stories} stories ({report.failed_clusters} failed) in {report.seconds:.1f}s, "
+            f"~${report.llm_cost_usd:.4f} of LLM calls"
+        )
+        return report
+
+    async def run(self, session_factory: SessionFactory, max_batches: int | None = None) -> ProcessingReport:
+        """Processes batches until nothing unprocessed is left to claim (or `max_batches` is hit)."""
+        total = ProcessingReport()
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            async with session_factory() as session:
+                report = await self.process_batch(session)
+            total.add(report)
+            batches += 1
+            # Stop when the queue is drained or nothing in the batch could be processed
+            if report.claimed == 0 or report.processed == 0:
+                break
+        logger.info(
+            f"Processor finished: {total.stories} stories from {total.processed} articles in {batches} batch(es), "
+            f"~${total.llm_cost_usd:.4f} of LLM calls"
+        )
+        return total
+
+
+async def main():
+    from src.agents.checkpoint import open_checkpointer
+    from src.db.session import AsyncSessionLocal, init_db
+
+    warn_if_process_local("processor")
+    await init_db()
+    if METRICS_PORT:
+        serve_metrics(METRICS_PORT)
+    async with open_checkpointer() as checkpointer:
+        await ProcessorService(checkpointer=checkpointer).run(AsyncSessionLocal)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
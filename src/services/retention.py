@@ -0,0 +1,274 @@
+"""
+Retention: moves old rows out of the live tables into compressed JSONL archives, and back.
+`archive` takes the processed articles ingested more than RETENTION_DAYS ago that no story
+links to. Stories stay in the feed unless STORY_RETENTION_DAYS is set: then stories created
+before that cutoff (with their source links) are archived first, which also frees the old
+articles they were keeping. Each batch is
+written to its own part file (zstd, or gzip without the optional `zstandard` package) before
+its rows are deleted in the same step, so a crash never loses rows that are not archived yet.
+`restore` re-inserts an archive idempotently, and `compact` rewrites rows stored before
+compression and compact `raw_json` were switched on. Run from the project root:
+
+    python -m src.services.retention archive --days 90
+    python -m src.services.retention archive --days 90 --story-days 365
+    python -m src.services.retention restore archive/20261017T220000
+    python -m src.services.retention compact
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import DateTime, LargeBinary, Table, Uuid, delete, exists, select, type_coerce, update
+
+from src.config.config import ARCHIVE_DIR, RETENTION_BATCH_SIZE, RETENTION_DAYS, STORY_RETENTION_DAYS
+from src.db.bulk import existing_values, insert_ignore_conflicts
+from src.db.models import RawArticle, Story, StorySource
+from src.db.types import compress_text, zstandard
+from src.services.feed_cache import get_feed_cache
+from src.services.news_fetcher import compact_payload
+from src.services.pipeline import SessionFactory
+from src.services.semantic_cache import get_chat_cache, warn_if_process_local
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+_ARTICLES: Table = RawArticle.__table__
+_STORIES: Table = Story.__table__
+
+
+@dataclass
+class RetentionReport:
+    path: Path
+    stories: int = 0
+    articles: int = 0
+    parts: int = 0
+    bytes_written: int = 0
+
+
+def _encode(row) -> dict:
+    return {key: value.isoformat() if isinstance(value, datetime) else str(value) if isinstance(value, UUID) else value
+            for key, value in row.items()}
+
+
+def _decode(table: Table, record: dict) -> dict:
+    row = {}
+    for column in table.columns:
+        value = record.get(column.key)
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column.type, Uuid):
+            value = UUID(value)
+        row[column.key] = value
+    return row
+
+
+def _write_part(run_dir: Path, number: int, records: list[dict]) -> int:
+    data = "".join(json.dumps(record) + "\n" for record in records).encode()
+    if zstandard is not None:
+        path, data = run_dir / f"part-{number:05d}.jsonl.zst", zstandard.ZstdCompressor(level=12).compress(data)
+    else:
+        path, data = run_dir / f"part-{number:05d}.jsonl.gz", gzip.compress(data)
+    # Complete on disk before the rows it holds are deleted
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return len(data)
+
+
+def _read_part(path: Path) -> list[dict]:
+    data = path.read_bytes()
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed; install `zstandard` to restore it.")
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    elif path.suffix == ".gz":
+        data = gzip.decompress(data)
+    return [json.loads(line) for line in data.decode().splitlines() if line]
+
+
+async def archive(
+    session_factory: SessionFactory,
+    older_than_days: int = RETENTION_DAYS,
+    archive_dir: str | Path = ARCHIVE_DIR,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    now: datetime | None = None,
+    story_older_than_days: int = STORY_RETENTION_DAYS,
+) -> RetentionReport:
+    """Archives unlinked processed articles, and stories too when `story_older_than_days` is set (> 0)."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=older_than_days)
+    report = RetentionReport(Path(archive_dir) / now.strftime("%Y%m%dT%H%M%S"))
+    report.path.mkdir(parents=True, exist_ok=True)
+    story_ids: list[UUID] = []
+
+    # Stories first: their links are what keeps old articles referenced
+    story_cutoff = now - timedelta(days=story_older_than_days)
+    while story_older_than_days > 0:
+        async with session_factory() as session:
+            stmt = select(_STORIES).where(Story.created_at < story_cutoff).order_by(Story.created_at).limit(batch_size)
+            stories = (await session.execute(stmt)).mappings().all()
+            if not stories:
+                break
+            ids = [story["id"] for story in stories]
+            links = await session.execute(select(StorySource.story_id, StorySource.raw_article_id).where(StorySource.story_id.in_(ids)))
+            sources = defaultdict(list)
+            for story_id, article_id in links.all():
+                sources[story_id].append(str(article_id))
+
+            records = [{"kind": "story", **_encode(story), "source_ids": sources[story["id"]]} for story in stories]
+            report.parts += 1
+            report.bytes_written += _write_part(report.path, report.parts, records)
+            await session.execute(delete(StorySource).where(StorySource.story_id.in_(ids)))
+            await session.execute(delete(Story).where(Story.id.in_(ids)))
+            await session.commit()
+        report.stories += len(ids)
+        story_ids.extend(ids)
+
+    linked = exists().where(StorySource.raw_article_id == RawArticle.id)
+    while True:
+        async with session_factory() as session:
+            stmt = (
+                select(_ARTICLES)
+                .where(RawArticle.processed.is_(True), RawArticle.ingested_at < cutoff, ~linked)
+                .order_by(RawArticle.ingested_at)
+                .limit(batch_size)
+            )
+            articles = (await session.execute(stmt)).mappings().all()
+            if not articles:
+                break
+            report.parts += 1
+            report.bytes_written += _write_part(report.path, report.parts, [{"kind": "article", **_encode(a)} for a in articles])
+            await session.execute(delete(RawArticle).where(RawArticle.id.in_([a["id"] for a in articles])))
+            await session.commit()
+        report.articles += len(articles)
+
+    if story_ids:
+        # Deeper feed pages and answers citing the archived stories are stale now
+        await get_feed_cache().clear()
+        await get_chat_cache().invalidate_stories(story_ids)
+    if not report.parts:
+        report.path.rmdir()
+    logger.info(
+        f"Archived {report.stories} stories and {report.articles} articles older than {older_than_days} days "
+        f"to {report.path} ({report.parts} parts, {report.bytes_written / 1e6:.1f} MB)"
+    )
+    return report
+
+
+async def restore(session_factory: SessionFactory, path: str | Path) -> RetentionReport:
+    """
+    Re-inserts an archive (a run directory or one part file); rows that exist already are skipped.
+    An article whose URL was ingested again under a new id since it was archived is not restored;
+    the restored stories link to the live row instead.
+    """
+    path = Path(path)
+    parts = sorted(p for p in path.glob("part-*.jsonl.*") if p.suffix != ".tmp") if path.is_dir() else [path]
+    report = RetentionReport(path, parts=len(parts))
+    links: list[dict] = []
+    replaced: dict[UUID, UUID] = {}     # Archived article id -> id of the live row with its URL
+    for part in parts:
+        records = _read_part(part)
+        articles = [_decode(_ARTICLES, r) for r in records if r["kind"] == "article"]
+        stories = [_decode(_STORIES, r) for r in records if r["kind"] == "story"]
+        links += [{"story_id": UUID(r["id"]), "raw_article_id": UUID(a)} for r in records if r["kind"] == "story" for a in r["source_ids"]]
+        async with session_factory() as session:
+            # Batched like the archive parts, well below bound-parameter limits
+            archived = {a["url"]: a["id"] for a in articles}
+            live = await session.execute(select(RawArticle.url, RawArticle.id).where(RawArticle.url.in_(list(archived))))
+            replaced.update({archived[url]: live_id for url, live_id in live.all() if archived[url] != live_id})
+            articles = [a for a in articles if a["id"] not in replaced]
+            await insert_ignore_conflicts(session, RawArticle, articles, ["id"])
+            await insert_ignore_conflicts(session, Story, stories, ["id"])
+            await session.commit()
+        report.articles += len(articles)
+        report.stories += len(stories)
+
+    async with session_factory() as session:
+        for start in range(0, len(links), RETENTION_BATCH_SIZE):
+            batch = [{**link, "raw_article_id": replaced.get(link["raw_article_id"], link["raw_article_id"])}
+                     for link in links[start:start + RETENTION_BATCH_SIZE]]
+            # Links to articles that were never archived (or are gone) cannot be restored
+            present = await existing_values(session, RawArticle.id, list({link["raw_article_id"] for link in batch}))
+            batch = [link for link in batch if link["raw_article_id"] in present]
+            await insert_ignore_conflicts(session, StorySource, batch, ["story_id", "raw_article_id"])
+        await session.commit()
+
+    if report.stories:
+        await get_feed_cache().clear()
+    if replaced:
+        logger.info(f"Skipped {len(replaced)} archived articles whose URL was ingested again; their stories link to the live rows")
+    logger.info(f"Restored {report.stories} stories and {report.articles} articles from {path}")
+    return report
+
+
+async def compact(session_factory: SessionFactory, batch_size: int = RETENTION_BATCH_SIZE) -> int:
+    """Recompresses plain-text `content` and strips column fields from full `raw_json` payloads."""
+    raw_content = type_coerce(RawArticle.content, LargeBinary)
+    compacted = 0
+    last_id = None
+    while True:
+        async with session_factory() as session:
+            stmt = select(RawArticle.id, raw_content, RawArticle.raw_json).order_by(RawArticle.id).limit(batch_size)
+            if last_id is not None:
+                stmt = stmt.where(RawArticle.id > last_id)
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            changes = []
+            for article_id, content, raw_json in rows:
+                # Plain UTF-8 is stale only if `compress_text` would store it compressed (not below the size threshold)
+                plain = content is not None and bytes(content[:1]) != b"\x00"
+                stale_content = plain and compress_text(bytes(content).decode()) != bytes(content)
+                stale_payload = raw_json is not None and "url" in raw_json
+                if stale_content or stale_payload:
+                    change = {"id": article_id}
+                    if stale_content:
+                        change["content"] = bytes(content).decode()
+                    if stale_payload:
+                        change["raw_json"] = compact_payload(raw_json)
+                    changes.append(change)
+            # Rows of one statement need the same keys
+            for keys in {tuple(change) for change in changes}:
+                await session.execute(update(RawArticle), [c for c in changes if tuple(c) == keys])
+            await session.commit()
+        compacted += len(changes)
+    logger.info(f"Compacted {compacted} articles")
+    return compacted
+
+
+async def main():
+    from src.db.session import AsyncSessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Archive, restore or compact stored articles.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive_cmd = commands.add_parser("archive", help="Move old processed articles (and optionally stories) to archive files")
+    archive_cmd.add_argument("--days", type=int, default=RETENTION_DAYS)
+    archive_cmd.add_argument("--story-days", type=int, default=STORY_RETENTION_DAYS, help="Also archive older stories; 0 keeps them")
+    archive_cmd.add_argument("--dir", default=ARCHIVE_DIR)
+    restore_cmd = commands.add_parser("restore", help="Re-insert an archive run directory or part file")
+    restore_cmd.add_argument("path")
+    commands.add_parser("compact", help="Compress and compact rows written before compact storage")
+    args = parser.parse_args()
+
+    if args.command == "archive":
+        warn_if_process_local("retention")
+    await init_db()
+    if args.command == "archive":
+        await archive(AsyncSessionLocal, args.days, args.dir, story_older_than_days=args.story_days)
+    elif args.command == "restore":
+        await restore(AsyncSessionLocal, args.path)
+    else:
+        await compact(AsyncSessionLocal)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,377 @@
+"""
+Semantic cache for /chat answers.
+Questions are embedded, and a new question whose embedding is within
+`CHAT_CACHE_SIMILARITY` (cosine) of a recently answered one gets that answer back instead
+of another retrieval + LLM call. Entries expire after `CHAT_CACHE_TTL_SECONDS` and the least
+recently used are evicted beyond `CHAT_CACHE_MAX_ENTRIES`.
+
+Answers go stale when their stories do, so every entry records the Story IDs it was built
+from: `invalidate_stories` drops the answers resting on changed or deleted rows, and
+`invalidate_near` drops those whose question is close to a newly published story.
+
+Backends: an in-process cache (default), or Redis so every API worker shares answers. With
+Redis the question vectors are mirrored into each worker and only re-read when the shared
+version counter moves, so a lookup is one round trip plus a local matrix-vector product.
+The in-process cache lives in the API process, out of reach of the processor that publishes
+stories and archives them: the processor's invalidations run against its own, empty cache,
+so answers cached by the API only leave when `CHAT_CACHE_TTL_SECONDS` runs out. Deployments
+with a separate processor should use Redis; the processor warns at startup otherwise.
+"""
+
+import json
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Iterable, Protocol
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from src.config.config import (
+    CHAT_CACHE_BACKEND,
+    CHAT_CACHE_INVALIDATE_SIMILARITY,
+    CHAT_CACHE_MAX_ENTRIES,
+    CHAT_CACHE_REDIS_URL,
+    CHAT_CACHE_SIMILARITY,
+    CHAT_CACHE_TTL_SECONDS,
+)
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+_LATENCY_WINDOW = 1000              # Recent lookups kept for the latency percentiles
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    answer: str
+    sources: list[dict] = field(default_factory=list)   # What /chat returned alongside the answer
+    story_ids: frozenset[str] = frozenset()             # Stories the answer was built from
+    similarity: float = 1.0         # Cosine between the stored and the incoming question
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    return vector / (np.linalg.norm(vector) + 1e-12)
+
+
+class _Metrics:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def lookup(self, hit: bool, seconds: float):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._latencies.append(seconds)
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        latencies = np.array(self._latencies) * 1000 if self._latencies else np.zeros(1)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_llm_calls": self.hits,       # Every hit is one answer not generated
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "lookup_ms_p50": float(np.percentile(latencies, 50)),
+            "lookup_ms_p95": float(np.percentile(latencies, 95)),
+        }
+
+
+class SemanticCache(Protocol):
+    threshold: float
+
+    async def lookup(self, vector: np.ndarray) -> CachedAnswer | None: ...
+    async def store(self, vector: np.ndarray, answer: CachedAnswer): ...
+    async def invalidate_stories(self, story_ids: Iterable[UUID | str]) -> int: ...
+    async def invalidate_near(self, vectors: np.ndarray, threshold: float = CHAT_CACHE_INVALIDATE_SIMILARITY) -> int: ...
+    async def size(self) -> int: ...
+    async def clear(self): ...
+    async def stats(self) -> dict: ...
+
+
+class _VectorTable:
+    """Question vectors in a growable matrix, one row per entry key, for brute-force lookup."""
+    def __init__(self):
+        self.keys: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.matrix: np.ndarray | None = None
+        self.stored_at = np.empty(16)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, vector: np.ndarray, stored_at: float = 0.0):
+        if self.matrix is None:
+            self.matrix = np.empty((16, len(vector)), dtype=np.float32)
+        elif len(self.keys) == len(self.matrix):
+            self.matrix = np.concatenate([self.matrix, np.empty_like(self.matrix)])
+            self.stored_at = np.concatenate([self.stored_at, np.empty_like(self.stored_at)])
+        self.rows[key] = len(self.keys)
+        self.matrix[len(self.keys)] = vector
+        self.stored_at[len(self.keys)] = stored_at
+        self.keys.append(key)
+
+    def remove(self, key: str):
+        # Swap the last row into the hole so the live rows stay contiguous
+        row = self.rows.pop(key)
+        last = self.keys.pop()
+        if last != key:
+            self.matrix[row] = self.matrix[len(self.keys)]
+            self.stored_at[row] = self.stored_at[len(self.keys)]
+            self.keys[row] = last
+            self.rows[last] = row
+
+    def stored_before(self, cutoff: float) -> list[str]:
+        return [self.keys[row] for row in np.flatnonzero(self.stored_at[:len(self.keys)] < cutoff)]
+
+    def near(self, vectors: np.ndarray, threshold: float) -> list[str]:
+        """Keys within `threshold` of any of `vectors`."""
+        if not self.keys:
+            return []
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        vectors = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+        close = (self.matrix[:len(self.keys)] @ vectors.T).max(axis=1) >= threshold
+        return [key for key, is_close in zip(self.keys, close) if is_close]
+
+    def nearest(self, vector: np.ndarray, stored_after: float | None = None) -> tuple[str | None, float]:
+        """The closest key (and its cosine), ignoring rows stored before `stored_after`."""
+        if not self.keys:
+            return None, 0.0
+        scores = self.matrix[:len(self.keys)] @ vector
+        if stored_after is not None:
+            scores[self.stored_at[:len(self.keys)] < stored_after] = -np.inf
+        best = int(np.argmax(scores))
+        return (self.keys[best], float(scores[best])) if np.isfinite(scores[best]) else (None, 0.0)
+
+
+class InMemorySemanticCache:
+    """Per-process cache: exact nearest-neighbour search over at most `max_entries` questions."""
+    def __init__(
+        self,
+        threshold: float = CHAT_CACHE_SIMILARITY,
+        ttl_seconds: float | None = CHAT_CACHE_TTL_SECONDS,
+        max_entries: int = CHAT_CACHE_MAX_ENTRIES,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedAnswer] = OrderedDict()   # LRU order
+        self._vectors = _VectorTable()
+        self._metrics = _Metrics()
+
+    def _drop(self, key: str):
+        del self._entries[key]
+        self._vectors.remove(key)
+
+    def _cutoff(self) -> float | None:
+        return time.monotonic() - self.ttl_seconds if self.ttl_seconds is not None else None
+
+    async def lookup(self, vector: np.ndarray) -> CachedAnswer | None:
+        start = time.perf_counter()
+        # Expired rows are masked here and only removed when the next answer is stored
+        key, score = self._vectors.nearest(_unit(vector), self._cutoff())
+        hit = key is not None and score >= self.threshold
+        if hit:
+            self._entries.move_to_end(key)
+            answer = self._entries[key]
+        self._metrics.lookup(hit, time.perf_counter() - start)
+        return CachedAnswer(answer.question, answer.answer, answer.sources, answer.story_ids, score) if hit else None
+
+    async def store(self, vector: np.ndarray, answer: CachedAnswer):
+        if (cutoff := self._cutoff()) is not None:
+            for expired in self._vectors.stored_before(cutoff):
+                self._drop(expired)
+        key = uuid4().hex
+        self._entries[key] = answer
+        self._vectors.add(key, _unit(vector), time.monotonic())
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self._metrics.evictions += 1
+
+    async def invalidate_stories(self, story_ids: Iterable[UUID | str]) -> int:
+        changed = {str(i) for i in story_ids}
+        stale = [key for key, answer in self._entries.items() if answer.story_ids & changed]
+        for key in stale:
+            self._drop(key)
+        self._metrics.invalidations += len(stale)
+        return len(stale)
+
+    async def invalidate_near(self, vectors: np.ndarray, threshold: float = CHAT_CACHE_INVALIDATE_SIMILARITY) -> int:
+        stale = self._vectors.near(vectors, threshold)
+        for key in stale:
+            self._drop(key)
+        self._metrics.invalidations += len(stale)
+        return len(stale)
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+    async def clear(self):
+        self._entries.clear()
+        self._vectors = _VectorTable()
+
+    async def stats(self) -> dict:
+        return {"backend": "memory", "entries": len(self._entries), **self._metrics.as_dict()}
+
+
+class RedisSemanticCache:
+    """
+    Shared cache in Redis; requires the optional `redis` package. Entries expire through
+    Redis TTLs, a sorted set of last-use times drives LRU eviction, and a set per story lists
+    the entries built from it.
+    """
+    def __init__(
+        self,
+        url: str = CHAT_CACHE_REDIS_URL,
+        threshold: float = CHAT_CACHE_SIMILARITY,
+        ttl_seconds: float | None = CHAT_CACHE_TTL_SECONDS,
+        max_entries: int = CHAT_CACHE_MAX_ENTRIES,
+        prefix: str = "sentinel:chat",
+    ):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise ImportError("Install `redis` to use the Redis chat cache backend.") from e
+        self.redis = Redis.from_url(url)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self._vectors = _VectorTable()
+        self._version: bytes | None = None
+        self._metrics = _Metrics()
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    async def _sync(self):
+        """Re-reads the question vectors if another worker changed them."""
+        # No version key yet (nothing stored since Redis was emptied) counts as version 0
+        version = await self.redis.get(self._key("version")) or b"0"
+        if version == self._version:
+            return
+        self._vectors = _VectorTable()
+        for key, vector in (await self.redis.hgetall(self._key("vectors"))).items():
+            self._vectors.add(key.decode(), np.frombuffer(vector, dtype=np.float32))
+        self._version = version
+
+    async def _delete(self, keys: list[str]):
+        if not keys:
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(self._key("vectors"), *keys)
+            pipe.zrem(self._key("used"), *keys)
+            pipe.delete(*(self._key("entry", key) for key in keys))
+            pipe.incr(self._key("version"))
+            await pipe.execute()
+        for key in keys:
+            if key in self._vectors.rows:
+                self._vectors.remove(key)
+
+    async def lookup(self, vector: np.ndarray) -> CachedAnswer | None:
+        start = time.perf_counter()
+        await self._sync()
+        key, score = self._vectors.nearest(_unit(vector))
+        stored = None
+        if key is not None and score >= self.threshold:
+            stored = await self.redis.hgetall(self._key("entry", key))
+            if stored:
+                await self.redis.zadd(self._key("used"), {key: time.time()})
+            else:
+                await self._delete([key])           # Expired in Redis; drop its vector too
+        self._metrics.lookup(bool(stored), time.perf_counter() - start)
+        if not stored:
+            return None
+        return CachedAnswer(
+            question=stored[b"question"].decode(),
+            answer=stored[b"answer"].decode(),
+            sources=json.loads(stored[b"sources"]),
+            story_ids=frozenset(json.loads(stored[b"story_ids"])),
+            similarity=score,
+        )
+
+    async def store(self, vector: np.ndarray, answer: CachedAnswer):
+        key = uuid4().hex
+        ttl = int(self.ttl_seconds) if self.ttl_seconds is not None else None
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key("vectors"), key, _unit(vector).tobytes())
+            pipe.hset(self._key("entry", key), mapping={
+                "question": answer.question,
+                "answer": answer.answer,
+                "sources": json.dumps(answer.sources),
+                "story_ids": json.dumps(sorted(answer.story_ids)),
+            })
+            if ttl:
+                pipe.expire(self._key("entry", key), ttl)
+            for story_id in answer.story_ids:
+                pipe.sadd(self._key("story", story_id), key)
+                if ttl:
+                    pipe.expire(self._key("story", story_id), ttl)
+            pipe.zadd(self._key("used"), {key: time.time()})
+            pipe.incr(self._key("version"))
+            await pipe.execute()
+
+        excess = await self.redis.zcard(self._key("used")) - self.max_entries
+        if excess > 0:
+            evicted = [key.decode() for key, _ in await self.redis.zpopmin(self._key("used"), excess)]
+            await self._delete(evicted)
+            self._metrics.evictions += len(evicted)
+
+    async def invalidate_stories(self, story_ids: Iterable[UUID | str]) -> int:
+        story_keys = [self._key("story", str(i)) for i in story_ids]
+        if not story_keys:
+            return 0
+        stale = [key.decode() for key in await self.redis.sunion(*story_keys)]
+        await self._delete(stale)
+        await self.redis.delete(*story_keys)
+        self._metrics.invalidations += len(stale)
+        return len(stale)
+
+    async def invalidate_near(self, vectors: np.ndarray, threshold: float = CHAT_CACHE_INVALIDATE_SIMILARITY) -> int:
+        await self._sync()
+        stale = self._vectors.near(vectors, threshold)
+        await self._delete(stale)
+        self._metrics.invalidations += len(stale)
+        return len(stale)
+
+    async def size(self) -> int:
+        return await self.redis.zcard(self._key("used"))
+
+    async def clear(self):
+        keys = [key async for key in self.redis.scan_iter(f"{self.prefix}:*")]
+        if keys:
+            await self.redis.delete(*keys)
+        self._vectors = _VectorTable()
+        self._version = None
+
+    async def stats(self) -> dict:
+        return {"backend": "redis", "entries": await self.size(), **self._metrics.as_dict()}
+
+
+_chat_cache: SemanticCache | None = None
+
+
+def warn_if_process_local(entry_point: str):
+    """Called at startup by processes that invalidate answers but do not serve /chat."""
+    if CHAT_CACHE_BACKEND != "redis":
+        logger.warning(
+            f"{entry_point}: CHAT_CACHE_BACKEND={CHAT_CACHE_BACKEND!r} is per process, so cached /chat answers "
+            f"in the API are not invalidated from here and stay up to {CHAT_CACHE_TTL_SECONDS}s; use 'redis'"
+        )
+
+
+def get_chat_cache() -> SemanticCache:
+    """The process-wide chat answer cache (also usable as a FastAPI dependency)."""
+    global _chat_cache
+    if _chat_cache is None:
+        _chat_cache = RedisSemanticCache() if CHAT_CACHE_BACKEND == "redis" else InMemorySemanticCache()
+    return _chat_cache
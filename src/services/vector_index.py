@@ -0,0 +1,445 @@
+"""
+Local vector index over article and story chunks (retrieval for /chat).
+`RawArticle.content` and `Story.summary` are split into overlapping word chunks, embedded on
+the CPU in batches and appended to a memory-mapped matrix on disk (float32, or int8 with one
+scale per row), so searches read through the page cache instead of holding the matrix in
+every process. An IVF index (spherical k-means centroids, one inverted list per centroid)
+scans only the `nprobe` lists nearest to the query; small indexes are searched exactly.
+
+Each vector maps back to its source row's UUID and chunk number. Chunking is deterministic,
+so chunk text is rebuilt from the database rather than stored twice. Indexing is incremental:
+a (timestamp, id) watermark per table means each run embeds only rows added since the last.
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import (
+    VECTOR_CHUNK_OVERLAP_WORDS,
+    VECTOR_CHUNK_WORDS,
+    VECTOR_INDEX_BATCH_ROWS,
+    VECTOR_INDEX_DIR,
+    VECTOR_INDEX_DTYPE,
+    VECTOR_IVF_MIN_TRAIN,
+    VECTOR_IVF_NPROBE,
+    VECTOR_IVF_RETRAIN_GROWTH,
+)
+from src.db.models import RawArticle, Story
+from src.services.embeddings import EmbeddingBackend, get_embedder
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+KINDS = ("article", "story")
+_ROW_DTYPE = np.dtype([("id", np.uint8, (16,)), ("kind", np.uint8), ("chunk", np.uint16)])
+_BLOCK_ROWS = 8_192                # Rows scored per matrix product in exact search / assignment
+_TRAIN_POINTS_PER_LIST = 40         # k-means sample size per centroid
+_KMEANS_ITERATIONS = 10
+
+
+def chunk_text(text: str, size: int = VECTOR_CHUNK_WORDS, overlap: int = VECTOR_CHUNK_OVERLAP_WORDS) -> list[str]:
+    """Windows of `size` words, consecutive windows sharing `overlap` words."""
+    words = text.split()
+    if not words:
+        return []
+    step = max(size - overlap, 1)
+    return [" ".join(words[i:i + size]) for i in range(0, max(len(words) - overlap, 1), step)]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    id: UUID                        # RawArticle.id or Story.id
+    kind: str                       # "article" or "story"
+    chunk: int                      # Position in `chunk_text` of the row's text
+    score: float                    # Cosine similarity
+
+
+def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        rows, scores = rows[keep], scores[keep]
+    order = np.argsort(-scores, kind="stable")
+    return rows[order], scores[order]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12)
+
+
+class VectorIndex:
+    """
+    Append-only index in a directory: `vectors.bin` (n x dim), `scales.bin` (int8 only),
+    `rows.bin` (UUID, kind, chunk per vector), and after training `centroids.npy` plus
+    `lists.bin` (inverted list of every vector). `manifest.json` is written last on every
+    change, so a crash mid-append leaves the previous state intact.
+    """
+    def __init__(
+        self,
+        path: str = VECTOR_INDEX_DIR,
+        dim: int = 384,
+        dtype: str = VECTOR_INDEX_DTYPE,
+        model: str = "",
+        nprobe: int = VECTOR_IVF_NPROBE,
+        min_train: int = VECTOR_IVF_MIN_TRAIN,
+        retrain_growth: float = VECTOR_IVF_RETRAIN_GROWTH,
+    ):
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported vector dtype {dtype!r}; use 'float32' or 'int8'.")
+        self.path = path
+        self.nprobe = nprobe
+        self.min_train = min_train
+        self.retrain_growth = retrain_growth
+        os.makedirs(path, exist_ok=True)
+
+        manifest = self._read_manifest()
+        if manifest is None:
+            manifest = {"dim": dim, "dtype": dtype, "model": model, "count": 0, "trained_count": 0, "watermarks": {}}
+        elif (manifest["dim"], manifest["dtype"], manifest["model"]) != (dim, dtype, model):
+            raise ValueError(
+                f"Index at {path} holds {manifest['dim']}-d {manifest['dtype']} vectors from "
+                f"{manifest['model']!r}; delete it to re-index with {dim}-d {dtype} vectors from {model!r}."
+            )
+        self.manifest = manifest
+        self._load()
+
+    # --- Storage ---
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_manifest(self) -> dict | None:
+        try:
+            with open(self._file("manifest.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_manifest(self):
+        tmp = self._file("manifest.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp, self._file("manifest.json"))
+        self._manifest_mtime = os.stat(self._file("manifest.json")).st_mtime_ns
+
+    def _map(self, name: str, dtype, width: int | None = None) -> np.ndarray:
+        shape = (self.count, width) if width else (self.count,)
+        if self.count == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=shape)
+
+    def _load(self):
+        manifest = self._file("manifest.json")
+        self._manifest_mtime = os.stat(manifest).st_mtime_ns if os.path.exists(manifest) else None
+        self._vectors = self._map("vectors.bin", self.dtype, self.dim)
+        self._scales = self._map("scales.bin", np.float32) if self.dtype == "int8" else None
+        self._rows = self._map("rows.bin", _ROW_DTYPE)
+        trained = self.manifest["trained_count"] > 0
+        self.centroids = np.load(self._file("centroids.npy")) if trained else None
+        self._lists = self._map("lists.bin", np.int32) if trained else None
+        self._inverted = None
+
+    def _append(self, name: str, array: np.ndarray, offset_rows: int):
+        """Writes `array` after the first `offset_rows` rows, dropping anything an interrupted append left."""
+        row_bytes = array.dtype.itemsize * (array.shape[1] if array.ndim > 1 else 1)
+        with open(self._file(name), "r+b" if os.path.exists(self._file(name)) else "wb") as f:
+            f.seek(offset_rows * row_bytes)
+            f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate()
+
+    def _replace(self, name: str, array: np.ndarray):
+        # Searches holding the old map keep reading the old file until they reload
+        tmp = self._file(name + ".tmp")
+        with open(tmp, "wb") as f:
+            if name.endswith(".npy"):
+                np.save(f, array)
+            else:
+                f.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp, self._file(name))
+
+    @property
+    def count(self) -> int:
+        return self.manifest["count"]
+
+    @property
+    def dim(self) -> int:
+        return self.manifest["dim"]
+
+    @property
+    def dtype(self) -> str:
+        return self.manifest["dtype"]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def refresh(self) -> bool:
+        """Picks up vectors another process appended; returns whether anything changed."""
+        try:
+            mtime = os.stat(self._file("manifest.json")).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._manifest_mtime:
+            return False
+        self.manifest = self._read_manifest()
+        self._load()
+        return True
+
+    def watermark(self, kind: str) -> tuple[datetime, UUID] | None:
+        """Position of the last indexed row of `kind` in (timestamp, id) order."""
+        stored = self.manifest["watermarks"].get(kind)
+        return (datetime.fromisoformat(stored[0]), UUID(stored[1])) if stored else None
+
+    # --- Vectors ---
+    def _quantize(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        if self.dtype == "float32":
+            return vectors, None
+        scales = np.abs(vectors).max(axis=1) / 127.0 + 1e-12
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    def _dense(self, rows: slice | np.ndarray) -> np.ndarray:
+        vectors = np.asarray(self._vectors[rows], dtype=np.float32)
+        return vectors * self._scales[rows][:, None] if self._scales is not None else vectors
+
+    def _scores(self, query: np.ndarray, rows: slice | np.ndarray) -> np.ndarray:
+        # Scale after the product: one multiply per row instead of per element
+        scores = np.asarray(self._vectors[rows]).astype(np.float32, copy=False) @ query
+        return scores * self._scales[rows] if self._scales is not None else scores
+
+    def add(
+        self,
+        vectors: np.ndarray,
+        ids: list[UUID],
+        kind: str,
+        chunks: list[int],
+        watermark: tuple[datetime, UUID] | None = None,
+    ):
+        """Appends one vector per (id, chunk) and, if given, advances `kind`'s watermark with it."""
+        vectors = _normalize(vectors).reshape(-1, self.dim)
+        start = self.count
+        if len(vectors):
+            stored, scales = self._quantize(vectors)
+            rows = np.zeros(len(vectors), dtype=_ROW_DTYPE)
+            rows["id"] = np.frombuffer(b"".join(i.bytes for i in ids), dtype=np.uint8).reshape(-1, 16)
+            rows["kind"] = KINDS.index(kind)
+            rows["chunk"] = chunks
+            self._append("vectors.bin", stored, start)
+            if scales is not None:
+                self._append("scales.bin", scales, start)
+            self._append("rows.bin", rows, start)
+            if self.centroids is not None:
+                self._append("lists.bin", self._nearest(vectors, self.centroids), start)
+            self.manifest["count"] = start + len(vectors)
+        if watermark is not None:
+            self.manifest["watermarks"][kind] = [watermark[0].isoformat(), watermark[1].hex]
+        self._write_manifest()
+        self._load()
+
+    # --- IVF ---
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        return np.concatenate([
+            np.argmax(vectors[i:i + _BLOCK_ROWS] @ centroids.T, axis=1).astype(np.int32)
+            for i in range(0, len(vectors), _BLOCK_ROWS)
+        ]) if len(vectors) else np.empty(0, dtype=np.int32)
+
+    def train(self, nlist: int | None = None, seed: int = 0):
+        """Clusters the vectors into ~sqrt(n) inverted lists and assigns every vector to one."""
+        if not self.count:
+            return
+        nlist = min(nlist or max(int(np.sqrt(self.count)), 1), self.count)
+        rng = np.random.default_rng(seed)
+        sample = self._dense(np.sort(rng.choice(self.count, min(self.count, nlist * _TRAIN_POINTS_PER_LIST), replace=False)))
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            assign = self._nearest(sample, centroids)
+            counts = np.bincount(assign, minlength=nlist)
+            filled = counts > 0
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            sums = np.add.reduceat(sample[np.argsort(assign, kind="stable")], starts[filled], axis=0)
+            centroids = centroids.copy()
+            centroids[filled] = _normalize(sums)
+            # Re-seed empty lists so every centroid ends up covering some vectors
+            centroids[~filled] = sample[rng.choice(len(sample), int((~filled).sum()))]
+
+        lists = np.concatenate([
+            self._nearest(self._dense(slice(i, i + _BLOCK_ROWS)), centroids)
+            for i in range(0, self.count, _BLOCK_ROWS)
+        ])
+        self._replace("centroids.npy", centroids.astype(np.float32))
+        self._replace("lists.bin", lists)
+        self.manifest["trained_count"] = self.count
+        self._write_manifest()
+        self._load()
+        logger.info(f"Trained vector index: {self.count} vectors in {nlist} lists")
+
+    def maybe_train(self) -> bool:
+        """(Re)trains once the index is big enough, or has outgrown its lists."""
+        trained_count = self.manifest["trained_count"]
+        if self.count < self.min_train or (trained_count and self.count < trained_count * self.retrain_growth):
+            return False
+        self.train()
+        return True
+
+    def _inverted_lists(self) -> tuple[np.ndarray, np.ndarray]:
+        """Vector rows grouped by list (CSR layout), rebuilt lazily after appends."""
+        if self._inverted is None:
+            lists = np.asarray(self._lists)
+            order = np.argsort(lists, kind="stable")
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(lists, minlength=len(self.centroids)))])
+            self._inverted = (order, offsets)
+        return self._inverted
+
+    # --- Search ---
+    def exact_search(self, query: np.ndarray, k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """Brute-force scan of every vector: (rows, scores), best first."""
+        query = _normalize(query)
+        best_rows, best_scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        for start in range(0, self.count, _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, self.count)
+            best_rows, best_scores = _top_k(
+                np.concatenate([best_rows, np.arange(start, stop)]),
+                np.concatenate([best_scores, self._scores(query, slice(start, stop))]),
+                k,
+            )
+        return best_rows, best_scores
+
+    def search_rows(self, query: np.ndarray, k: int = 10, nprobe: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k: (rows, scores), best first. Exact until the index is trained."""
+        if self.centroids is None:
+            return self.exact_search(query, k)
+        query = _normalize(query)
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        order, offsets = self._inverted_lists()
+        # Sorted rows turn the memmap gather into forward reads
+        rows = np.sort(np.concatenate([order[offsets[i]:offsets[i + 1]] for i in probe]))
+        return _top_k(rows, self._scores(query, rows), k)
+
+    def hits(self, rows: np.ndarray, scores: np.ndarray) -> list[SearchHit]:
+        meta = self._rows[rows]
+        return [
+            SearchHit(id=UUID(bytes=m["id"].tobytes()), kind=KINDS[m["kind"]], chunk=int(m["chunk"]), score=float(s))
+            for m, s in zip(meta, scores)
+        ]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int | None = None) -> list[SearchHit]:
+        return self.hits(*self.search_rows(query, k, nprobe))
+
+
+@dataclass
+class IndexingReport:
+    articles: int = 0
+    stories: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+
+# kind -> (model, watermark column, title column, body column)
+_SOURCES = {
+    "article": (RawArticle, RawArticle.ingested_at, RawArticle.title, RawArticle.content),
+    "story": (Story, Story.created_at, Story.title, Story.summary),
+}
+
+
+class VectorRetriever:
+    """Keeps a `VectorIndex` in step with the database and answers text queries against it."""
+    def __init__(
+        self,
+        index: VectorIndex,
+        embedder: EmbeddingBackend,
+        batch_rows: int = VECTOR_INDEX_BATCH_ROWS,
+        chunk_words: int = VECTOR_CHUNK_WORDS,
+        overlap_words: int = VECTOR_CHUNK_OVERLAP_WORDS,
+    ):
+        self.index = index
+        self.embedder = embedder
+        self.batch_rows = batch_rows
+        self.chunk_words = chunk_words
+        self.overlap_words = overlap_words
+
+    def chunks(self, title: str, body: str | None) -> list[str]:
+        return chunk_text(f"{title}\n{body or ''}", self.chunk_words, self.overlap_words)
+
+    def _add_batch(self, kind: str, rows) -> int:
+        texts, ids, positions = [], [], []
+        for row in rows:
+            for position, chunk in enumerate(self.chunks(row.title, row.body)):
+                texts.append(chunk)
+                ids.append(row.id)
+                positions.append(position)
+        vectors = self.embedder.embed(texts) if texts else np.empty((0, self.index.dim), dtype=np.float32)
+        self.index.add(vectors, ids, kind, positions, watermark=(rows[-1].ts, rows[-1].id))
+        return len(texts)
+
+    async def index_new_rows(self, session: AsyncSession) -> IndexingReport:
+        """Embeds every article and story past the index's watermarks, one batch of rows at a time."""
+        start = time.perf_counter()
+        report = IndexingReport()
+        for kind, (model, ts, title, body) in _SOURCES.items():
+            while True:
+                stmt = (
+                    select(model.id, ts.label("ts"), title.label("title"), body.label("body"))
+                    .order_by(ts, model.id)
+                    .limit(self.batch_rows)
+                )
+                watermark = self.index.watermark(kind)
+                if watermark is not None:
+                    stmt = stmt.where(tuple_(ts, model.id) > tuple_(*watermark))
+                rows = (await session.execute(stmt)).all()
+                if not rows:
+                    break
+                # Embedding is CPU-bound; keep the event loop free while it runs
+                report.chunks += await asyncio.to_thread(self._add_batch, kind, rows)
+                if kind == "article":
+                    report.articles += len(rows)
+                else:
+                    report.stories += len(rows)
+        await asyncio.to_thread(self.index.maybe_train)
+        report.seconds = time.perf_counter() - start
+        logger.info(
+            f"Indexed {report.articles} articles and {report.stories} stories "
+            f"({report.chunks} chunks) in {report.seconds:.1f}s; index holds {len(self.index)} vectors"
+        )
+        return report
+
+    def search(self, query: str, k: int = 10, nprobe: int | None = None) -> list[SearchHit]:
+        return self.index.search(self.embedder.embed([query])[0], k, nprobe)
+
+    async def chunk_texts(self, session: AsyncSession, hits: list[SearchHit]) -> list[str]:
+        """The text of every hit, re-chunked from its database row ("" if the row is gone)."""
+        texts: dict[tuple[str, UUID], list[str]] = {}
+        for kind, (model, _, title, body) in _SOURCES.items():
+            ids = {hit.id for hit in hits if hit.kind == kind}
+            if ids:
+                result = await session.execute(select(model.id, title, body).where(model.id.in_(ids)))
+                texts.update({(kind, row[0]): self.chunks(row[1], row[2]) for row in result.all()})
+        return [
+            chunks[hit.chunk] if hit.chunk < len(chunks := texts.get((hit.kind, hit.id), [])) else ""
+            for hit in hits
+        ]
+
+
+def open_retriever(embedder: EmbeddingBackend | None = None, path: str = VECTOR_INDEX_DIR) -> VectorRetriever:
+    """The on-disk index for the configured embedding model."""
+    embedder = embedder or get_embedder()
+    return VectorRetriever(VectorIndex(path, dim=embedder.dim, model=embedder.name), embedder)
+
+
+async def main():
+    from src.db.session import AsyncSessionLocal, init_db
+
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        await open_retriever().index_new_rows(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
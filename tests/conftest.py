@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from src.db.models import Base
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    """A throwaway SQLite database; engines must be created inside the test's event loop."""
+    return f"sqlite+aiosqlite:///{tmp_path / 'sentinel.db'}"
+
+
+async def make_sessionmaker(url: str) -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture(autouse=True)
+def no_llm_response_cache(monkeypatch):
+    """Tests count model calls, so the on-disk response cache must not answer them."""
+    from src.agents.llm import registry
+    monkeypatch.setattr(registry, "cache", None)
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from src.agents.cache import ResponseCache, cached
+from src.agents.fake_llm import FakeChatModel
+from src.agents.graph import app
+from src.agents.llm import registry
+from src.agents.state import SynthesizedStory
+from tests.test_nodes import cluster_state
+
+
+def test_structured_and_message_outputs_round_trip(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    story = SynthesizedStory(title="Chips", summary="## Fabs\n\nExpanding.", source_article_ids=["a", "b"])
+    structured = cached(RunnableLambda(lambda _: story), cache, "m:0:SynthesizedStory", SynthesizedStory)
+    text = cached(RunnableLambda(
+        lambda _: AIMessage("APPROVED", usage_metadata={"input_tokens": 3, "output_tokens": 1, "total_tokens": 4})
+    ), cache, "m:0:text")
+
+    prompt = [HumanMessage("Write  the\n story")]
+    assert structured.invoke(prompt) == story
+    assert text.invoke(prompt).content == "APPROVED"
+
+    replay = ResponseCache(str(tmp_path / "cache.sqlite"))
+    assert cached(RunnableLambda(lambda _: None), replay, "m:0:SynthesizedStory", SynthesizedStory).invoke([HumanMessage("Write the story")]) == story
+    message = cached(RunnableLambda(lambda _: None), replay, "m:0:text").invoke(prompt)
+    assert isinstance(message, AIMessage) and message.usage_metadata["total_tokens"] == 4
+    assert replay.stats()["hits"] == 2 and replay.stats()["misses"] == 0
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl_seconds=None, max_entries=2)
+    for key in "abc":
+        cache.put(key, key)
+        time.sleep(0.01)
+    assert cache.get("a") is None and cache.get("c") == "c"
+    assert cache.stats()["entries"] == 2 and cache.evictions == 1
+
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+    assert cache.get("b") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_hits_defer_their_access_time_but_still_protect_from_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl_seconds=None, max_entries=2)
+    cache.put("a", "a")
+    time.sleep(0.01)
+    cache.put("b", "b")
+    time.sleep(0.01)
+    assert cache.get("a") == "a"
+    stored = cache._connection().execute("SELECT accessed_at FROM llm_responses WHERE key = 'a'").fetchone()[0]
+    assert stored < cache._touched["a"]
+
+    cache.put("c", "c")
+    assert cache.get("a") == "a" and cache.get("b") is None
+
+
+def test_async_calls_use_the_cache_off_the_event_loop(tmp_path):
+    threads = set()
+
+    class RecordingCache(ResponseCache):
+        def get(self, key):
+            threads.add(threading.get_ident())
+            return super().get(key)
+
+        def put(self, key, payload):
+            threads.add(threading.get_ident())
+            super().put(key, payload)
+
+    cache = RecordingCache(str(tmp_path / "cache.sqlite"))
+    chain = cached(RunnableLambda(lambda _: AIMessage("APPROVED")), cache, "m:0:text")
+
+    async def run():
+        loop_thread = threading.get_ident()
+        first = await chain.ainvoke([HumanMessage("Check")])
+        second = await chain.ainvoke([HumanMessage("Check")])
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(run())
+    assert first.content == second.content == "APPROVED" and cache.stats()["hits"] == 1
+    assert threads and loop_thread not in threads
+
+
+def test_full_run_replays_without_model_calls(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "cache", ResponseCache(str(tmp_path / "cache.sqlite")))
+    try:
+        first = FakeChatModel(reject_first=1)
+        registry.register(first)
+        expected = app.invoke(cluster_state())
+        assert len(first.stats.calls) == 4
+
+        replay = FakeChatModel(reject_first=1)
+        registry.register(replay)
+        final_state = app.invoke(cluster_state())
+    finally:
+        registry.clear()
+
+    assert replay.stats.calls == []
+    assert final_state["draft_story"] == expected["draft_story"] and final_state["is_approved"]
+    assert registry.cache.stats()["hits"] == 4
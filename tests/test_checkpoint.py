@@ -0,0 +1,54 @@
+import asyncio
+import sqlite3
+from src.agents.checkpoint import open_checkpointer
+from src.agents.fake_llm import FakeChatModel
+from src.agents.llm import registry
+from src.agents.runner import run_graph_batch
+from tests.test_nodes import cluster_state
+
+
+class CrashingModel(FakeChatModel):
+    """Dies on the second Editor call, like a process killed mid-loop."""
+    def _respond(self, messages):
+        if self.structured_schema is None and self.stats.editor_calls == 1:
+            raise RuntimeError("worker killed")
+        return super()._respond(messages)
+
+
+def clusters() -> list[dict]:
+    states = [cluster_state(articles=3) for _ in range(2)]
+    for index, state in enumerate(states):
+        for article in state["raw_articles"]:
+            article["id"] = f"cluster-{index}-{article['id']}"
+    return states
+
+
+def test_restarted_batch_resumes_from_last_completed_node(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+
+    async def run(llm: FakeChatModel, states: list[dict]):
+        registry.register(llm)
+        async with open_checkpointer(path) as checkpointer:
+            return await run_graph_batch(states, concurrency=1, checkpointer=checkpointer)
+
+    try:
+        crashed = CrashingModel(reject_first=1)
+        first = asyncio.run(run(crashed, clusters()[:1]))
+        assert list(first.errors) == [0]
+        assert [c.kind for c in crashed.stats.calls] == ["researcher", "editor", "researcher"]
+
+        resumed = FakeChatModel()
+        second = asyncio.run(run(resumed, clusters()))
+    finally:
+        registry.clear()
+
+    assert second.succeeded == 2
+    # Cluster 0 only needs its pending Editor review; cluster 1 runs from scratch
+    assert [c.kind for c in resumed.stats.calls].count("researcher") == 1
+    assert resumed.stats.editor_calls == 2
+    assert second.results[0]["iteration_count"] == 2 and second.results[0]["raw_articles"] == clusters()[0]["raw_articles"]
+
+    with sqlite3.connect(path) as conn:
+        blobs = b"".join(row[0] for row in conn.execute("SELECT checkpoint FROM checkpoints"))
+        blobs += b"".join(row[0] for row in conn.execute("SELECT value FROM writes"))
+    assert b"cluster-0-article-0" in blobs and b"590 thousand wafers" not in blobs
@@ -0,0 +1,41 @@
+from src.agents.citations import CitationIndex
+from src.agents.fake_llm import FakeChatModel
+from src.agents.graph import app
+from src.agents.llm import registry
+from src.agents.state import SynthesizedStory
+from tests.test_clustering import ARTICLES, FED, STARSHIP
+from tests.test_nodes import cluster_state
+
+
+def story(summary: str, ids: list[str]) -> SynthesizedStory:
+    return SynthesizedStory(title="Digest", summary=summary, source_article_ids=ids)
+
+
+def test_index_flags_unknown_and_unsupported_citations():
+    index = CitationIndex(ARTICLES)
+    summary = f"## Key developments\n\n{STARSHIP}. The company plans another flight next month."
+
+    report = index.check(story(summary, ["cnn", "bbc", "wsj", "ghost"]))
+    assert report.unknown_ids == ["ghost"] and report.unsupported_ids == ["wsj"]
+    assert report.unsupported_sentences == ["The company plans another flight next month."]
+    assert not report.verified and "ghost" in report.feedback() and "wsj" in report.feedback()
+
+    assert index.check(story(f"{STARSHIP}. {FED}.", ["cnn", "wsj"])).verified
+
+
+def test_invalid_citations_return_to_researcher_without_editor_call():
+    class GhostCitingModel(FakeChatModel):
+        def _draft(self, prompt: str) -> str:
+            draft = super()._draft(prompt)
+            return draft if "PREVIOUS DRAFT" in prompt else draft.replace('"source_article_ids": [', '"source_article_ids": ["ghost-1", ')
+
+    llm = GhostCitingModel()
+    registry.register(llm)
+    try:
+        final_state = app.invoke(cluster_state(articles=3))
+    finally:
+        registry.clear()
+
+    assert [c.kind for c in llm.stats.calls] == ["researcher", "researcher", "editor"]
+    assert final_state["citation_verified"] and final_state["is_approved"]
+    assert final_state["draft_story"].source_article_ids == ["article-0", "article-1", "article-2"]
@@ -0,0 +1,47 @@
+import numpy as np
+from src.services.clustering import NearDuplicateClusterer
+
+STARSHIP = (
+    "SpaceX launched its Starship rocket from the Starbase facility in Texas on Tuesday and the vehicle "
+    "reached orbit for the first time before splashing down in the Indian Ocean as planned"
+)
+FED = "The Federal Reserve held interest rates steady on Wednesday citing persistent inflation and a cooling labor market"
+
+ARTICLES = [
+    {"id": "cnn", "title": "SpaceX launches Starship", "content": STARSHIP},
+    {"id": "bbc", "title": "Starship flight successful", "content": STARSHIP.replace("as planned", "as engineers had hoped")},
+    {"id": "wsj", "title": "Fed holds rates", "content": FED},
+]
+
+
+def test_minhash_groups_same_event_from_different_publishers():
+    clusters = NearDuplicateClusterer().cluster(ARTICLES)
+
+    assert [sorted(c.article_ids) for c in clusters] == [["bbc", "cnn"], ["wsj"]]
+    state = clusters[0].to_agent_state()
+    assert state["raw_articles"] == clusters[0].articles
+    assert (state["draft_story"], state["iteration_count"], state["is_approved"]) == (None, 0, False)
+
+
+def test_embedding_backend_clusters_by_cosine_similarity():
+    class TopicEmbedder:
+        def embed(self, texts):
+            return np.array([[1.0, 0.05] if "Starship" in t else [0.0, 1.0] for t in texts])
+
+    clusters = NearDuplicateClusterer(embedder=TopicEmbedder(), threshold=0.9).cluster(ARTICLES)
+    assert [sorted(c.article_ids) for c in clusters] == [["bbc", "cnn"], ["wsj"]]
+
+
+def test_embedding_clusters_are_reproducible():
+    class NoisyPairEmbedder:
+        """Pairs of articles around a shared direction, at cosines near the threshold."""
+        def embed(self, texts):
+            ids = [int(t.split()[0]) for t in texts]
+            return np.array([np.random.default_rng(i // 2).standard_normal(16) + 0.9 * np.random.default_rng(1000 + i).standard_normal(16) for i in ids])
+
+    articles = [{"id": str(i), "title": str(i), "content": ""} for i in range(40)]
+    clusterer = NearDuplicateClusterer(embedder=NoisyPairEmbedder(), threshold=0.5)
+
+    runs = [[sorted(c.article_ids) for c in clusterer.cluster(articles)] for _ in range(5)]
+    fresh = NearDuplicateClusterer(embedder=NoisyPairEmbedder(), threshold=0.5).cluster(articles)
+    assert all(run == runs[0] for run in runs) and runs[0] == [sorted(c.article_ids) for c in fresh]
@@ -0,0 +1,52 @@
+from src.agents.context import ContextBuilder, RegexTokenizer
+
+tokenizer = RegexTokenizer()
+
+SHARED = "Nvidia reported record data center revenue driven by demand for its Blackwell chips."
+
+
+def article(i: int, sentences: int = 40) -> dict:
+    body = [SHARED, "Subscribe to our newsletter for daily updates."]
+    body += [f"Analyst {i} noted that supply chain constraint number {j} could limit shipments next quarter." for j in range(sentences)]
+    return {"id": str(i), "title": f"Nvidia earnings coverage {i}", "content": " ".join(body)}
+
+
+def test_context_fits_budget_and_cuts_tokens():
+    articles = [article(i) for i in range(12)]
+    built = ContextBuilder(token_budget=1500, min_article_tokens=40, tokenizer=tokenizer).build(articles)
+
+    assert built.original_tokens > 1500
+    assert built.tokens <= 1500
+    assert built.tokens < built.original_tokens / 3
+    # Every source keeps its ID so the Researcher can still cite it
+    assert all(f"ID: {i}\n" in built.text for i in range(12))
+    assert all(tokens >= 40 for tokens in built.article_tokens.values())
+
+
+def test_boilerplate_and_cross_source_repeats_are_dropped():
+    built = ContextBuilder(token_budget=100_000, tokenizer=tokenizer).build([article(i, sentences=2) for i in range(3)])
+
+    assert built.text.count(SHARED) == 1
+    assert "Subscribe" not in built.text
+    assert built.dropped_sentences == 5  # 3 newsletter lines + 2 repeats of the shared sentence
+    assert built.tokens < built.original_tokens
+
+
+def test_budget_favours_articles_that_share_the_cluster_story():
+    on_topic = [article(i) for i in range(3)]
+    off_topic = {"id": "x", "title": "Unrelated", "content": " ".join(f"Gardening tip {j} about tomatoes and basil." for j in range(200))}
+    built = ContextBuilder(token_budget=1200, min_article_tokens=20, tokenizer=tokenizer).build(on_topic + [off_topic])
+
+    assert built.article_tokens["x"] < min(built.article_tokens[str(i)] for i in range(3))
+
+
+def test_large_cluster_stays_within_budget():
+    articles = [article(i, sentences=5) for i in range(200)]
+    built = ContextBuilder(token_budget=6000, min_article_tokens=60, tokenizer=tokenizer).build(articles)
+
+    assert built.tokens <= 6000
+    assert 0 < built.dropped_articles < 200
+    # The lowest-ranked sources are left out whole; every one included keeps some content
+    kept = len(built.article_tokens)
+    assert built.text.count("ID: ") == kept == 200 - built.dropped_articles
+    assert all(tokens > 0 for tokens in built.article_tokens.values())
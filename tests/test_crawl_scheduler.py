@@ -0,0 +1,191 @@
+import asyncio
+from datetime import datetime, timezone
+import httpx
+import pytest
+from sqlalchemy import select
+from src.db.models import CrawlRun, CrawlWatermark, RawArticle
+from src.services.crawl_scheduler import CrawlScheduler
+from src.services.news_api import NewsAPIClient
+from src.services.news_fetcher import NewsFetcherService
+from tests.conftest import make_sessionmaker
+from tests.test_news_fetcher import RecordingExtractor
+
+
+def article(slug: str, published: str) -> dict:
+    return {
+        "source": {"id": None, "name": "Publisher"},
+        "title": f"Headline {slug}",
+        "url": f"https://news.example/{slug}",
+        "urlToImage": None,
+        "publishedAt": published,
+    }
+
+
+class TimelineNewsAPI:
+    """Answers each query with the published articles between `from` and `to`, newest first."""
+    def __init__(self):
+        self.articles: list[dict] = []
+        self.requests = []
+        self.fail = False
+        self.failing_pages: set[int] = set()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        self.requests.append(params)
+        if self.fail:
+            raise RuntimeError("NewsAPI is down")
+        since, until = params.get("from"), params.get("to")
+        matching = [
+            a for a in self.articles
+            if (since is None or a["publishedAt"][:19] >= since) and (until is None or a["publishedAt"][:19] <= until)
+        ]
+        matching.sort(key=lambda a: a["publishedAt"], reverse=True)
+        page, size = int(params.get("page", 1)), int(params.get("pageSize", 100))
+        if page in self.failing_pages:
+            return httpx.Response(400, json={"status": "error"})
+        return httpx.Response(200, json={
+            "status": "ok", "totalResults": len(matching), "articles": matching[(page - 1) * size:page * size],
+        })
+
+
+@pytest.fixture
+def crawl(monkeypatch, sqlite_url):
+    monkeypatch.setenv("NEWS_API_KEY", "test-key")
+    api = TimelineNewsAPI()
+    client = NewsAPIClient(api_key="test", client=httpx.AsyncClient(transport=httpx.MockTransport(api.handler)))
+    fetcher = NewsFetcherService(extractor=RecordingExtractor(), news_api=client)
+
+    async def run(sessionmaker, limit=None):
+        scheduler = CrawlScheduler(fetcher, sessionmaker, queries=["ai"], limit=limit)
+        return await scheduler.run_once()
+
+    return api, fetcher, run
+
+
+def hourly(*hours: int) -> list[dict]:
+    return [article(f"{hour:02d}", f"2026-10-17T{hour:02d}:00:00Z") for hour in hours]
+
+
+async def watermark_of(sessionmaker) -> CrawlWatermark | None:
+    async with sessionmaker() as session:
+        return await session.get(CrawlWatermark, "ai")
+
+
+def hours_of(watermark: CrawlWatermark) -> tuple:
+    """Watermark hour and backfill hours, for compact assertions."""
+    backfill = (watermark.backfill_from.hour, watermark.backfill_to.hour) if watermark.backfill_from else None
+    return watermark.published_at.hour, backfill
+
+
+def test_runs_only_fetch_articles_newer_than_the_watermark(crawl, sqlite_url):
+    api, fetcher, run_once = crawl
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        api.articles = [article("a", "2026-10-17T10:00:00Z"), article("b", "2026-10-17T08:30:00Z")]
+        first = await run_once(sessionmaker)
+
+        # 10:00 comes back inside the one-hour overlap and is dropped before download
+        api.articles.append(article("c", "2026-10-17T11:00:00Z"))
+        fetcher.extractor.urls.clear()
+        second = await run_once(sessionmaker)
+
+        api.fail = True
+        with pytest.raises(ExceptionGroup):
+            await run_once(sessionmaker)
+
+        async with sessionmaker() as session:
+            watermark = await session.get(CrawlWatermark, "ai")
+            runs = (await session.execute(select(CrawlRun).order_by(CrawlRun.started_at))).scalars().all()
+            stored = (await session.execute(select(RawArticle.url))).scalars().all()
+        return first, second, watermark, runs, stored
+
+    first, second, watermark, runs, stored = asyncio.run(run())
+
+    assert "from" not in api.requests[0]
+    assert (api.requests[1]["from"], api.requests[1]["sortBy"]) == ("2026-10-17T09:00:00", "publishedAt")
+    assert (first.inserted, first.incremental_queries) == (2, 0)
+    assert (second.fetched, second.overlap_skipped, second.inserted, second.incremental_queries) == (1, 1, 1, 1)
+    assert fetcher.extractor.urls == ["https://news.example/c"]
+    assert sorted(stored) == [f"https://news.example/{slug}" for slug in "abc"]
+
+    # The failed run is recorded but leaves the watermark where the last good run put it
+    assert [r.status for r in runs] == ["succeeded", "succeeded", "failed"]
+    assert runs[2].error and runs[2].newsapi_requests == 1
+    assert watermark.published_at.replace(tzinfo=timezone.utc) == datetime(2026, 10, 17, 11, tzinfo=timezone.utc)
+    assert set(watermark.recent_urls) == {"https://news.example/a", "https://news.example/c"}
+
+
+def test_truncated_or_failed_pages_are_backfilled_while_the_watermark_advances(crawl, sqlite_url):
+    api, fetcher, run_once = crawl
+    fetcher.news_api.page_size, fetcher.news_api.max_pages = 2, 2
+    api.articles = hourly(1, 2, 3)
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        runs, states = [], []
+        for new, failing_pages in [((), set()), (range(4, 10), set()), ((), set()), (range(10, 14), {2}), ((), set())]:
+            api.articles += hourly(*new)
+            api.failing_pages = failing_pages
+            runs.append(await run_once(sessionmaker))
+            states.append(hours_of(await watermark_of(sessionmaker)))
+        async with sessionmaker() as session:
+            stored = (await session.execute(select(RawArticle.url))).scalars().all()
+        return runs, states, stored
+
+    runs, states, stored = asyncio.run(run())
+
+    # Newest first: the cut-short run gets 09:00..06:00, moves on to 09:00 and leaves 03:00..06:00 to backfill.
+    # The next run pages back through it with `to`, and the failed page of the fourth run is filled in by the fifth.
+    assert [r.status for r in runs] == ["succeeded", "partial", "partial", "partial", "partial"]
+    assert [r.inserted for r in runs] == [3, 4, 2, 2, 2]
+    assert states == [(3, None), (9, (3, 6)), (9, None), (13, (9, 12)), (13, None)]
+    assert ("2026-10-17T02:00:00", "2026-10-17T06:00:00") in [(r.get("from"), r.get("to")) for r in api.requests]
+    assert sorted(url.rsplit("/", 1)[1] for url in stored) == [f"{hour:02d}" for hour in range(1, 14)]
+
+
+def test_a_caller_limit_is_not_a_truncated_crawl(crawl, sqlite_url):
+    api, fetcher, run_once = crawl
+    api.articles = hourly(*range(1, 9))
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        first = await run_once(sessionmaker, limit=3)
+        after_first = hours_of(await watermark_of(sessionmaker))
+        api.articles += hourly(9, 10)
+        second = await run_once(sessionmaker, limit=3)
+        return first, after_first, second, hours_of(await watermark_of(sessionmaker))
+
+    first, after_first, second, after_second = asyncio.run(run())
+
+    assert (first.status, first.inserted, after_first) == ("succeeded", 3, (8, None))
+    assert api.requests[-1]["from"] == "2026-10-17T07:00:00"
+    assert (second.status, second.inserted, after_second) == ("succeeded", 2, (10, None))
+
+
+def test_always_truncated_query_keeps_advancing(crawl, sqlite_url):
+    api, fetcher, run_once = crawl
+    fetcher.news_api.page_size, fetcher.news_api.max_pages = 2, 2
+    api.articles = hourly(0)
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        await run_once(sessionmaker)
+        states, recent = [], []
+        for start in (1, 7, 13):
+            # Six new articles per run, two more than the page caps allow
+            api.articles += hourly(*range(start, start + 6))
+            await run_once(sessionmaker)
+            watermark = await watermark_of(sessionmaker)
+            states.append(hours_of(watermark))
+            recent.append(len(watermark.recent_urls))
+        async with sessionmaker() as session:
+            stored = (await session.execute(select(RawArticle.url))).scalars().all()
+        return states, recent, stored
+
+    states, recent, stored = asyncio.run(run())
+
+    # Each run moves to its newest article; the older gap it misses is backfilled by the next one
+    assert states == [(6, (0, 3)), (12, (6, 9)), (18, (12, 15))]
+    assert max(recent) <= 2
+    assert sorted(url.rsplit("/", 1)[1] for url in stored) == [f"{hour:02d}" for hour in range(19) if hour not in (13, 14)]
@@ -0,0 +1,83 @@
+import asyncio
+import httpx
+from src.services.extractor import ArticleExtractor
+
+ARTICLE_HTML = """<html><body><article><h1>AI hits a new milestone</h1>
+<p>Artificial intelligence has reached a new milestone in reasoning capabilities according to a recent paper.</p>
+<p>Researchers say this will change how developers write code over the next few years.</p>
+</article></body></html>"""
+
+
+def make_transport(delay: float = 0.0, in_flight: dict | None = None):
+    """A mock transport that tracks how many requests are in flight overall and per host."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if in_flight is not None:
+            in_flight["total"] += 1
+            in_flight[host] = in_flight.get(host, 0) + 1
+            in_flight["max_total"] = max(in_flight.get("max_total", 0), in_flight["total"])
+            in_flight[f"max_{host}"] = max(in_flight.get(f"max_{host}", 0), in_flight[host])
+        try:
+            await asyncio.sleep(delay)
+            if request.url.path == "/missing":
+                return httpx.Response(404)
+            return httpx.Response(200, text=ARTICLE_HTML)
+        finally:
+            if in_flight is not None:
+                in_flight["total"] -= 1
+                in_flight[host] -= 1
+
+    return httpx.MockTransport(handler)
+
+
+def test_extract_many_respects_global_and_per_host_limits():
+    in_flight = {"total": 0}
+    urls = [f"https://site{i % 3}.example/article-{i}" for i in range(30)]
+
+    async def run():
+        async with httpx.AsyncClient(transport=make_transport(delay=0.01, in_flight=in_flight)) as client:
+            extractor = ArticleExtractor(client=client, max_concurrency=5, per_host_concurrency=2, process_workers=0)
+            return await extractor.extract_many(urls)
+
+    results = asyncio.run(run())
+
+    assert set(results) == set(urls)
+    assert all(text and "reasoning capabilities" in text for text in results.values())
+    assert in_flight["max_total"] <= 5
+    assert all(in_flight[f"max_site{i}.example"] <= 2 for i in range(3))
+
+
+def test_extract_returns_none_on_http_error_and_timeout():
+    async def run():
+        async with httpx.AsyncClient(transport=make_transport(delay=0.2)) as client:
+            extractor = ArticleExtractor(client=client, timeout=0.05, process_workers=0)
+            slow = await extractor.extract("https://slow.example/article")
+        async with httpx.AsyncClient(transport=make_transport()) as client:
+            extractor = ArticleExtractor(client=client, process_workers=0)
+            missing = await extractor.extract("https://site.example/missing")
+        return slow, missing
+
+    assert asyncio.run(run()) == (None, None)
+
+
+def test_timeout_covers_download_and_parse_together(monkeypatch):
+    import time
+    from src.services import extractor as extractor_module
+
+    def slow_parse(html, url):
+        time.sleep(0.3)
+        return "parsed"
+
+    monkeypatch.setattr(extractor_module, "_extract_html", slow_parse)
+
+    async def run():
+        async with httpx.AsyncClient(transport=make_transport(delay=0.3)) as client:
+            # Each step alone fits in 0.4s, both together don't; parsing runs in a thread here
+            extractor = ArticleExtractor(client=client, timeout=0.4, process_workers=0)
+            start = time.perf_counter()
+            result = await extractor.extract("https://slow.example/article")
+            return result, time.perf_counter() - start
+
+    result, seconds = asyncio.run(run())
+    assert result is None
+    assert seconds < 0.55
@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import httpx
+from sqlalchemy import event
+from src.api.main import app
+from src.db.models import Story
+from src.db.session import get_session
+from src.services.feed_cache import InMemoryFeedCache, get_feed_cache
+from tests.conftest import make_sessionmaker
+from tests.test_clustering import ARTICLES
+from tests.test_processor import raw_article
+
+
+async def seed(sessionmaker, stories: int):
+    now = datetime.now(timezone.utc)
+    async with sessionmaker() as session:
+        articles = [raw_article(a) for a in ARTICLES]
+        for i in range(stories):
+            # Pairs of stories share a timestamp, so ordering must fall back to the id
+            session.add(Story(id=uuid4(), title=f"Story {i}", summary="...", created_at=now - timedelta(minutes=i // 2), sources=articles[:2]))
+        await session.commit()
+
+
+def run_feed(sqlite_url, requests, cache=None):
+    cache = cache or InMemoryFeedCache()
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        await seed(sessionmaker, stories=7)
+        statements = []
+        event.listen(sessionmaker.kw["bind"].sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async def session_override():
+            async with sessionmaker() as session:
+                yield session
+
+        app.dependency_overrides[get_session] = session_override
+        app.dependency_overrides[get_feed_cache] = lambda: cache
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                return await requests(client, sessionmaker), statements
+        finally:
+            app.dependency_overrides.clear()
+
+    return asyncio.run(run())
+
+
+def test_keyset_pagination_walks_every_story_once_in_order(sqlite_url):
+    async def walk(client, _):
+        pages, cursor = [], None
+        while True:
+            response = await client.get("/feed", params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+            assert response.status_code == 200
+            pages.append(response.json())
+            cursor = pages[-1]["next_cursor"]
+            if cursor is None:
+                return pages
+
+    pages, statements = run_feed(sqlite_url, walk)
+
+    items = [item for page in pages for item in page["items"]]
+    assert [len(page["items"]) for page in pages] == [3, 3, 1]
+    assert len({item["id"] for item in items}) == 7
+    assert [(item["created_at"], item["id"]) for item in items] == sorted(((i["created_at"], i["id"]) for i in items), reverse=True)
+    # One query for the stories and one selectinload for all of their sources, per page
+    assert len(statements) == 2 * len(pages)
+    assert all(len(item["sources"]) == 2 and "content" not in item["sources"][0] for item in items)
+    assert "content" not in statements[1].split("FROM")[0]
+
+
+def test_content_is_opt_in_and_bad_cursors_are_rejected(sqlite_url):
+    async def requests(client, _):
+        return await client.get("/feed", params={"include_content": True, "limit": 1}), await client.get("/feed", params={"cursor": "nope"})
+
+    (with_content, bad_cursor), _ = run_feed(sqlite_url, requests)
+
+    contents = {source["content"] for source in with_content.json()["items"][0]["sources"]}
+    assert contents == {ARTICLES[0]["content"], ARTICLES[1]["content"]}
+    assert bad_cursor.status_code == 400
+
+
+def test_cached_pages_revalidate_and_only_the_first_page_is_invalidated(sqlite_url):
+    cache = InMemoryFeedCache()
+
+    async def requests(client, sessionmaker):
+        first = await client.get("/feed", params={"limit": 3})
+        cursor = first.json()["next_cursor"]
+        second = await client.get("/feed", params={"limit": 3, "cursor": cursor})
+        revalidated = await client.get("/feed", params={"limit": 3}, headers={"If-None-Match": first.headers["etag"]})
+
+        async with sessionmaker() as session:
+            session.add(Story(id=uuid4(), title="Breaking", summary="...", created_at=datetime.now(timezone.utc) + timedelta(minutes=1)))
+            await session.commit()
+        assert await cache.invalidate_head() == 1
+
+        after_publish = await client.get("/feed", params={"limit": 3}, headers={"If-None-Match": first.headers["etag"]})
+        second_again = await client.get("/feed", params={"limit": 3, "cursor": cursor})
+        return first, second, revalidated, after_publish, second_again
+
+    (first, second, revalidated, after_publish, second_again), statements = run_feed(sqlite_url, requests, cache)
+
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert after_publish.status_code == 200 and after_publish.json()["items"][0]["title"] == "Breaking"
+    assert second_again.content == second.content and second_again.headers["etag"] == second.headers["etag"]
+    assert "max-age=3600" in second.headers["cache-control"] and "must-revalidate" in first.headers["cache-control"]
+    # Three misses (first page twice, the cursor page once) at two statements each, plus the INSERT
+    assert len(statements) == 3 * 2 + 1
+    stats = asyncio.run(cache.stats())
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 3, 2)
+    assert stats["bytes"] == len(after_publish.content) + len(second.content)
+
+
+def test_in_memory_cache_evicts_least_recently_used_pages_by_size():
+    cache = InMemoryFeedCache(max_entries=10, max_bytes=10)
+
+    async def run():
+        await cache.set("a", b"12345", head=False)
+        await cache.set("b", b"12345", head=False)
+        await cache.get("a")
+        await cache.set("c", b"123", head=True)
+        return [await cache.get(key) for key in "abc"]
+
+    a, b, c = asyncio.run(run())
+    assert a is not None and b is None and c.head
+    assert cache.bytes == 8 and cache.evictions == 1
+
+
+def test_pages_built_before_an_invalidation_are_not_stored_and_cursor_pages_expire():
+    cache = InMemoryFeedCache(page_ttl_seconds=0.05)
+
+    async def run():
+        version = await cache.version()
+        await cache.invalidate_head()
+        stale = await cache.set("head", b"old", head=True, version=version)
+        await cache.set("cursor", b"page", head=False, version=await cache.version())
+        fresh = await cache.get("cursor")
+        await asyncio.sleep(0.1)
+        return stale, await cache.get("head"), fresh, await cache.get("cursor")
+
+    stale, head, fresh, expired = asyncio.run(run())
+    assert stale.body == b"old" and head is None
+    assert fresh is not None and expired is None
@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+from langchain_core.messages import HumanMessage
+from src.agents.fake_llm import FakeChatModel
+from src.agents.llm import LLMRegistry
+from src.config.config import LLM_BASE_URL
+from src.agents.state import SynthesizedStory
+
+
+def test_registry_reuses_clients_and_structured_runnables():
+    registry = LLMRegistry()
+
+    assert registry.model("m", 0, backend="fake") is registry.model("m", 0.0, backend="fake")
+    assert registry.model("m", 0, backend="fake") is not registry.model("m", 0.7, backend="fake")
+    structured = registry.runnable(SynthesizedStory, "m", 0, backend="fake")
+    assert structured is registry.runnable(SynthesizedStory, "m", 0, backend="fake")
+
+    story = structured.invoke([HumanMessage("ID: 7\nTitle: Chips\nContent: Fabs expand.")])
+    assert isinstance(story, SynthesizedStory) and story.source_article_ids == ["7"]
+
+
+def test_registry_caps_concurrent_requests():
+    registry = LLMRegistry(max_concurrency=2)
+    in_flight = {"now": 0, "max": 0}
+
+    class TrackingModel(FakeChatModel):
+        async def _agenerate(self, *args, **kwargs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            try:
+                return await super()._agenerate(*args, **kwargs)
+            finally:
+                in_flight["now"] -= 1
+
+    registry.register(TrackingModel(latency=0.01), "m", 0, backend="fake")
+    llm = registry.runnable(None, "m", 0, backend="fake")
+
+    async def run():
+        return await asyncio.gather(*(llm.ainvoke("Do you approve?") for _ in range(10)))
+
+    assert all(reply.content == "APPROVED" for reply in asyncio.run(run()))
+    assert in_flight["max"] == 2
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        LLMRegistry().model("m", 0, backend="carrier-pigeon")
+
+
+@pytest.mark.parametrize("backend, class_name", [("groq", "ChatGroq"), ("openai", "ChatOpenAI"), ("fake", "FakeChatModel")])
+def test_every_backend_builds(monkeypatch, backend, class_name):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    chat_model = LLMRegistry().model("m", 0, backend=backend)
+
+    assert type(chat_model).__name__ == class_name
+    if backend == "openai":
+        assert chat_model.openai_api_base == LLM_BASE_URL and chat_model.model_name == "m"
@@ -0,0 +1,46 @@
+import json
+import logging
+import threading
+import pytest
+from src.logger.custom_logger import CustomLogger, get_logger
+
+
+@pytest.fixture
+def production_logging(tmp_path):
+    CustomLogger.shutdown()
+    CustomLogger.configure(mode="production", log_dir=tmp_path / "production")
+    yield tmp_path / "production"
+    CustomLogger.shutdown()
+    CustomLogger.configure(log_dir=tmp_path / "development")
+
+
+def test_production_mode_writes_from_a_background_thread(production_logging, monkeypatch):
+    writers = set()
+    emit = logging.FileHandler.emit
+    monkeypatch.setattr(logging.FileHandler, "emit", lambda self, record: writers.add(threading.current_thread().name) or emit(self, record))
+    monkeypatch.setattr("random.random", iter([0.05, 0.5]).__next__)
+
+    logger = get_logger("tests.logging")
+    logger.info("Article stored", words=850)
+    logger.info("llm_call", prompt_tokens=10)      # kept at a 0.1 sample rate
+    logger.info("llm_call", prompt_tokens=20)      # sampled away
+    logger.warning("Article skipped", reason="too short")
+    logging.getLogger("httpx").info("HTTP Request: %s %s", "GET", "https://example.com")
+    CustomLogger.shutdown()
+
+    events = [json.loads(line) for (path,) in [list(production_logging.iterdir())] for line in path.read_text().splitlines()]
+    assert [e["event"] for e in events] == ["Article stored", "llm_call", "Article skipped", "HTTP Request: GET https://example.com"]
+    assert events[1]["prompt_tokens"] == 10 and events[1]["sample_rate"] == 0.1
+    # Callsite info only from LOG_CALLSITE_MIN_LEVEL up
+    assert "lineno" not in events[0]
+    assert events[2]["func_name"] == "test_production_mode_writes_from_a_background_thread"
+    assert threading.main_thread().name not in writers and writers
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    CustomLogger.shutdown()
+    try:
+        with pytest.raises(ValueError):
+            CustomLogger.configure(mode="verbose", log_dir=tmp_path)
+    finally:
+        CustomLogger.configure(log_dir=tmp_path)
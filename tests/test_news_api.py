@@ -0,0 +1,64 @@
+import asyncio
+import httpx
+from src.services.news_api import CrawlBudget, NewsAPIClient
+
+
+class MockNewsAPI:
+    """A local `/v2/everything` stand-in: paginates `total` articles per query and can rate-limit."""
+    def __init__(self, total: int = 25, rate_limit_first: int = 0):
+        self.total = total
+        self.rate_limit_remaining = rate_limit_first
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        self.requests.append(dict(params))
+        if self.rate_limit_remaining > 0:
+            self.rate_limit_remaining -= 1
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={"status": "error", "code": "rateLimited"})
+
+        query, page, page_size = params["q"], int(params["page"]), int(params["pageSize"])
+        start = (page - 1) * page_size
+        articles = [
+            {"title": f"{query} {i}", "url": f"https://news.example/{query.replace(' ', '-')}/{i}"}
+            for i in range(start, min(start + page_size, self.total))
+        ]
+        return httpx.Response(200, json={"status": "ok", "totalResults": self.total, "articles": articles})
+
+    def client(self, **kwargs) -> NewsAPIClient:
+        transport = httpx.MockTransport(self.handler)
+        return NewsAPIClient(api_key="test", client=httpx.AsyncClient(transport=transport), backoff_base=0.001, **kwargs)
+
+
+def collect(client: NewsAPIClient, queries, **kwargs) -> list[dict]:
+    async def run():
+        return [article async for article in client.stream(queries, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_stream_paginates_every_query():
+    api = MockNewsAPI(total=25)
+    articles = collect(api.client(page_size=10, max_pages=5), ["ai", "chips", "robots"])
+
+    assert len(articles) == 75
+    assert len(api.requests) == 9  # 3 pages per query
+    assert {r["pageSize"] for r in api.requests} == {"10"}
+
+
+def test_stream_retries_429_with_backoff():
+    api = MockNewsAPI(total=5, rate_limit_first=2)
+    articles = collect(api.client(), ["ai"])
+
+    assert len(articles) == 5
+    assert len(api.requests) == 3
+
+
+def test_stream_stops_at_crawl_budget_and_dedups_urls():
+    api = MockNewsAPI(total=50)
+    budget = CrawlBudget(max_requests=3)
+    articles = collect(api.client(page_size=10), ["ai", "ai"], budget=budget)
+
+    assert len(api.requests) == 3
+    assert budget.exhausted
+    # Both queries are identical, so every URL is yielded at most once
+    assert len(articles) == len({a["url"] for a in articles}) <= 30
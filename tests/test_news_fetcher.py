@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from sqlalchemy import func, select
+from src.db.models import RawArticle
+from src.services.news_fetcher import NewsFetcherService
+from tests.conftest import make_sessionmaker
+
+
+def newsapi_article(i: int) -> dict:
+    return {
+        "source": {"id": None, "name": f"Publisher {i % 3}"},
+        "title": f"Headline {i}",
+        "url": f"https://news{i % 3}.example/story-{i}",
+        "urlToImage": None,
+        "publishedAt": "2026-02-19T12:00:00Z",
+    }
+
+
+def fake_stream(articles: list[dict]):
+    async def stream(*args, **kwargs):
+        for article in articles:
+            yield article
+    return stream
+
+
+class RecordingExtractor:
+    """Stands in for ArticleExtractor and records which URLs were downloaded."""
+    def __init__(self):
+        self.urls = []
+
+    async def extract(self, url):
+        self.urls.append(url)
+        return f"Full text of {url}"
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    monkeypatch.setenv("NEWS_API_KEY", "test-key")
+    return NewsFetcherService(extractor=RecordingExtractor())
+
+
+def test_run_ingestion_batches_dedup_and_bulk_insert(fetcher, monkeypatch, sqlite_url):
+    articles = [newsapi_article(i) for i in range(7)] + [newsapi_article(0)]  # duplicate within the crawl
+    monkeypatch.setattr(fetcher, "stream_news", fake_stream(articles))
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        async with sessionmaker() as session:
+            first = await fetcher.run_ingestion(session, commit_every=4, extract_workers=4)
+        downloaded_first = list(fetcher.extractor.urls)
+
+        fetcher.extractor.urls.clear()
+        async with sessionmaker() as session:
+            second = await fetcher.run_ingestion(session, commit_every=4)
+            count = await session.scalar(select(func.count()).select_from(RawArticle))
+        return first, downloaded_first, second, count
+
+    first, downloaded_first, second, count = asyncio.run(run())
+
+    assert sorted(b.inserted for b in first.batches) == [3, 4]
+    assert (first.inserted, first.skipped) == (7, 1)
+    assert len(downloaded_first) == 7
+    assert count == 7
+    # Second crawl: everything is already stored, so nothing is downloaded or written at all
+    assert (second.inserted, second.skipped, second.batches) == (0, 8, [])
+    assert fetcher.extractor.urls == []
+
+
+def test_on_conflict_absorbs_duplicates_when_precheck_is_disabled(fetcher, monkeypatch, sqlite_url):
+    monkeypatch.setattr(fetcher, "stream_news", fake_stream([newsapi_article(i) for i in range(3)]))
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        async with sessionmaker() as session:
+            await fetcher.run_ingestion(session)
+            return await fetcher.run_ingestion(session, skip_existing=False)
+
+    report = asyncio.run(run())
+    assert [(b.inserted, b.skipped) for b in report.batches] == [(0, 3)]
+    assert len(fetcher.extractor.urls) == 6
+
+
+def test_pipeline_bounds_queues_and_reports_stage_metrics(fetcher, monkeypatch, sqlite_url):
+    monkeypatch.setattr(fetcher, "stream_news", fake_stream([newsapi_article(i) for i in range(200)]))
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        return await fetcher.run_ingestion(
+            session_factory=sessionmaker, queue_size=5, commit_every=25, store_workers=2, extract_workers=3,
+        )
+
+    report = asyncio.run(run())
+
+    assert report.inserted == 200
+    assert all(b.inserted <= 25 for b in report.batches)
+    for stage in ("extract", "validate", "store"):
+        assert report.metrics[stage]["max_queue_depth"] <= 5
+        assert report.metrics[stage]["queue_depth"] == 0
+    assert report.metrics["extract"]["processed"] == 200
+    assert report.metrics["store"]["throughput_per_sec"] > 0
@@ -0,0 +1,45 @@
+import pytest
+from src.agents import nodes
+from src.agents.fake_llm import FakeChatModel
+from src.agents.graph import app
+from src.agents.llm import registry
+
+
+def cluster_state(articles: int = 8) -> dict:
+    raw_articles = [
+        {
+            "id": f"article-{i}",
+            "title": f"Chipmaker expands fab capacity ({i})",
+            "content": " ".join(
+                f"Source {i} reports that the new fab will add {j * 10} thousand wafers per month by 2027."
+                for j in range(60)
+            ),
+        }
+        for i in range(articles)
+    ]
+    return {"raw_articles": raw_articles, "draft_story": None, "editor_feedback": None, "is_approved": False, "iteration_count": 0}
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeChatModel(reject_first=2)
+    registry.register(llm)
+    yield llm
+    registry.clear()
+
+
+@pytest.mark.parametrize("revision_mode", [True, False])
+def test_revision_iterations_send_less_context(fake_llm, monkeypatch, revision_mode):
+    monkeypatch.setattr(nodes, "RESEARCHER_REVISION_MODE", revision_mode)
+
+    final_state = app.invoke(cluster_state())
+
+    researcher_calls = [c for c in fake_llm.stats.calls if c.kind == "researcher"]
+    assert final_state["is_approved"] and final_state["iteration_count"] == 3
+    assert len(researcher_calls) == 3
+    first, *revisions = [c.input_tokens for c in researcher_calls]
+    if revision_mode:
+        assert all(tokens < first / 3 for tokens in revisions)
+        assert final_state["draft_story"].source_article_ids == [f"article-{i}" for i in range(8)]
+    else:
+        assert all(tokens >= first for tokens in revisions)
@@ -0,0 +1,57 @@
+from src.agents.fake_llm import FakeChatModel
+from src.agents.graph import app
+from src.agents.llm import registry
+from src.agents.prechecks import check_draft
+from src.agents.state import SynthesizedStory
+from tests.test_clustering import ARTICLES, FED, STARSHIP
+from tests.test_nodes import cluster_state
+
+INVENTED = " Shares of Nvidia rose after the launch, adding 4.2 billion dollars."
+
+
+def story(summary: str, ids: list[str] = ["cnn", "wsj"], title: str = "Digest") -> SynthesizedStory:
+    return SynthesizedStory(title=title, summary=summary, source_article_ids=ids)
+
+
+def test_check_draft_flags_each_rule():
+    good = f"## Key developments\n\n- {STARSHIP}.\n- **Markets:** {FED}."
+    assert check_draft(story(good), ARTICLES).passed
+
+    assert set(check_draft(story("## Key developments\n\nNothing.", [], title=""), ARTICLES).problems) == {"title", "length", "sources"}
+    report = check_draft(story(f"##Key developments\n\n**{STARSHIP}. See [the launch](https://example.com."), ARTICLES)
+    assert set(report.problems) == {"markdown"} and "heading" in report.feedback() and "**" in report.feedback()
+
+    report = check_draft(story(f"{STARSHIP}.{INVENTED} Launches rose 12% to 1,200."), ARTICLES)
+    assert set(report.problems) == {"numbers", "entities"}
+    assert "4.2" in report.problems["numbers"] and "1200" in report.problems["numbers"] and "12" in report.problems["numbers"]
+    assert "Nvidia" in report.problems["entities"] and "SpaceX" not in report.problems["entities"]
+
+
+def test_ordinary_summary_passes():
+    # Clause-initial words and day or month names are capitalized anyway, not invented names
+    summary = (f"## Key developments\n\n- {STARSHIP}.\n- **Markets:** {FED}.\n\n"
+               "What it means: Together, the launch and the rate decision on Monday set the tone for March.")
+    assert check_draft(story(summary), ARTICLES).passed
+
+
+def test_failing_draft_returns_to_researcher_without_editor_call():
+    class InventingModel(FakeChatModel):
+        def _draft(self, prompt: str) -> str:
+            draft = super()._draft(prompt)
+            if "PREVIOUS DRAFT" in prompt:
+                return draft.replace(INVENTED, "")
+            return draft.replace('", "source_article_ids"', f'{INVENTED}", "source_article_ids"')
+
+    llm = InventingModel()
+    registry.register(llm)
+    try:
+        final_state = app.invoke(cluster_state(articles=3))
+    finally:
+        registry.clear()
+
+    assert [c.kind for c in llm.stats.calls] == ["researcher", "researcher", "editor"]
+    assert final_state["precheck_passed"] and final_state["is_approved"]
+    assert "Nvidia" not in final_state["draft_story"].summary
+    avoided = final_state["usage"]["editor_avoided"]
+    assert avoided["calls"] == 1 and avoided["prompt_tokens"] > 0
+    assert final_state["usage"]["total"]["calls"] == 3
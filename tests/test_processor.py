@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from src.agents.fake_llm import FakeChatModel
+from src.agents.llm import registry
+from src.db.models import RawArticle, Story, StorySource
+from src.services.clustering import load_unprocessed_articles
+from src.services.feed_cache import get_feed_cache
+from src.services.processor import ProcessorService
+from tests.conftest import make_sessionmaker
+from tests.test_clustering import ARTICLES
+
+
+def raw_article(article: dict) -> RawArticle:
+    return RawArticle(
+        id=uuid4(),
+        source_id=article["id"],
+        url=f"https://{article['id']}.example.com/story",
+        title=article["title"],
+        content=article["content"],
+        published_at=datetime.now(timezone.utc),
+    )
+
+
+def test_processor_persists_stories_and_marks_articles_processed(sqlite_url):
+    llm = FakeChatModel()
+    registry.register(llm)
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        async with sessionmaker() as session:
+            session.add_all(raw_article(a) for a in ARTICLES)
+            await session.commit()
+
+        await get_feed_cache().set("stale-first-page", b"{}", head=True)
+        report = await ProcessorService(batch_size=2).run(sessionmaker)
+        assert await get_feed_cache().get("stale-first-page") is None
+
+        async with sessionmaker() as session:
+            stories = (await session.execute(select(func.count()).select_from(Story))).scalar_one()
+            links = (await session.execute(select(func.count()).select_from(StorySource))).scalar_one()
+            left = (await session.execute(select(func.count()).where(RawArticle.processed.is_(False)))).scalar_one()
+        return report, stories, links, left
+
+    try:
+        report, stories, links, left = asyncio.run(run())
+    finally:
+        registry.clear()
+
+    # Batch 1 claims the two Starship articles (one cluster), batch 2 the Fed article
+    assert (report.claimed, report.clusters, report.stories, report.processed) == (3, 2, 2, 3)
+    assert (stories, links, left) == (2, 3, 0)
+    assert len(llm.stats.calls) == 4
+
+
+def test_claim_query_skips_rows_locked_by_other_workers():
+    class RecordingSession:
+        async def execute(self, stmt):
+            self.sql = str(stmt.compile(dialect=postgresql.dialect()))
+            return self
+
+        def scalars(self):
+            return self
+
+        def all(self):
+            return []
+
+    session = RecordingSession()
+    asyncio.run(load_unprocessed_articles(session, 10, skip_locked=True))
+    assert "WHERE raw_article.processed IS false" in session.sql and session.sql.endswith("FOR UPDATE SKIP LOCKED")
+    index = next(i for i in RawArticle.__table__.indexes if i.name == "ix_raw_article_unprocessed")
+    assert str(index.dialect_options["postgresql"]["where"]) == "processed = false"
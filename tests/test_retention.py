@@ -0,0 +1,151 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import numpy as np
+from sqlalchemy import LargeBinary, func, select, text, type_coerce
+from src.db.models import RawArticle, Story, StorySource
+from src.db.types import compress_text, decompress_text
+from src.services import retention
+from src.services.news_fetcher import compact_payload, expand_payload
+from src.services.semantic_cache import CachedAnswer, InMemorySemanticCache
+from tests.conftest import make_sessionmaker
+
+PAYLOAD = {
+    "source": {"id": "wired", "name": "Wired"},
+    "author": "A. Writer",
+    "title": "New model released",
+    "description": "A lab released a model.",
+    "url": "https://wired.example.com/model",
+    "urlToImage": None,
+    "publishedAt": "2026-01-02T03:04:05Z",
+    "content": "A lab released a model… [+1200 chars]",
+}
+
+
+def article(days_old: int, **overrides) -> RawArticle:
+    when = datetime.now(timezone.utc) - timedelta(days=days_old)
+    values = dict(
+        id=uuid4(), source_id="wired", url=f"https://wired.example.com/{uuid4()}", title="Title",
+        content="Body text. " * 100, raw_json=compact_payload(PAYLOAD), published_at=when, ingested_at=when, processed=True,
+    )
+    return RawArticle(**{**values, **overrides})
+
+
+def test_compressed_text_round_trips_and_reads_plain_rows():
+    body = "Sentinel tracks AI news. " * 100
+    assert decompress_text(compress_text(body, "zstd")) == body
+    assert decompress_text(compress_text(body, "zlib")) == body
+    assert len(compress_text(body, "zstd")) < len(body) / 5
+    # Short values and rows written before compression are stored as plain UTF-8
+    assert compress_text("short", "zstd") == b"short"
+    assert decompress_text("legacy body".encode()) == "legacy body"
+
+
+def test_compact_payload_expands_to_the_original():
+    row = RawArticle(
+        source_id="wired", url=PAYLOAD["url"], urlToImage=None, title=PAYLOAD["title"],
+        published_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc), raw_json=compact_payload(PAYLOAD),
+    )
+    assert set(row.raw_json) == {"source", "author", "description", "content"}
+    assert expand_payload(row) == PAYLOAD
+
+
+def test_archive_and_restore_round_trip(sqlite_url, tmp_path, monkeypatch):
+    chat_cache = InMemorySemanticCache()
+    monkeypatch.setattr(retention, "get_chat_cache", lambda: chat_cache)
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        old, shared, orphan, recent = article(120), article(120), article(100), article(5)
+        old_story = Story(id=uuid4(), title="Old", summary="...", created_at=datetime.now(timezone.utc) - timedelta(days=120), sources=[old, shared])
+        new_story = Story(id=uuid4(), title="New", summary="...", sources=[shared, recent])
+        async with sessionmaker() as session:
+            session.add_all([old_story, new_story, orphan])
+            await session.commit()
+        await chat_cache.store(np.array([1.0, 0.0]), CachedAnswer("What happened?", "Old news.", story_ids=frozenset({str(old_story.id)})))
+
+        # By default stories stay in the feed, and so do the articles they link to
+        kept = await retention.archive(sessionmaker, older_than_days=90, archive_dir=tmp_path / "articles", story_older_than_days=0)
+        assert (kept.stories, kept.articles) == (0, 1)
+        await retention.restore(sessionmaker, kept.path)
+
+        report = await retention.archive(sessionmaker, older_than_days=90, archive_dir=tmp_path, batch_size=1, story_older_than_days=90)
+        async with sessionmaker() as session:
+            remaining = set((await session.execute(select(RawArticle.id))).scalars())
+            stories = set((await session.execute(select(Story.id))).scalars())
+        # `shared` is still a source of a live story, so it stays
+        assert (report.stories, report.articles, report.parts) == (1, 2, 3)
+        assert remaining == {shared.id, recent.id}
+        assert stories == {new_story.id}
+        assert await chat_cache.size() == 0
+
+        await retention.restore(sessionmaker, report.path)
+        await retention.restore(sessionmaker, report.path)   # Idempotent
+        async with sessionmaker() as session:
+            restored = await session.get(Story, old_story.id)
+            links = set((await session.execute(select(StorySource.raw_article_id).where(StorySource.story_id == old_story.id))).scalars())
+            body = (await session.get(RawArticle, old.id)).content
+            count = await session.scalar(select(func.count()).select_from(RawArticle))
+        assert restored.created_at.replace(tzinfo=timezone.utc) == old_story.created_at
+        assert links == {old.id, shared.id}
+        assert body == old.content
+        assert count == 4
+
+    asyncio.run(run())
+
+
+def test_restore_links_to_articles_ingested_again(sqlite_url, tmp_path, monkeypatch):
+    monkeypatch.setattr(retention, "get_chat_cache", lambda: InMemorySemanticCache())
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        old, other = article(120), article(120)
+        story = Story(id=uuid4(), title="Old", summary="...", created_at=datetime.now(timezone.utc) - timedelta(days=120), sources=[old, other])
+        async with sessionmaker() as session:
+            session.add(story)
+            await session.commit()
+        report = await retention.archive(sessionmaker, older_than_days=90, archive_dir=tmp_path, story_older_than_days=90)
+
+        # The crawler sees the URL again and stores it under a new id
+        again = article(1, url=old.url)
+        async with sessionmaker() as session:
+            session.add(again)
+            await session.commit()
+
+        restored = await retention.restore(sessionmaker, report.path)
+        async with sessionmaker() as session:
+            links = set((await session.execute(select(StorySource.raw_article_id).where(StorySource.story_id == story.id))).scalars())
+            ids = set((await session.execute(select(RawArticle.id))).scalars())
+        return report, restored, again, other, links, ids
+
+    report, restored, again, other, links, ids = asyncio.run(run())
+
+    assert (report.stories, report.articles) == (1, 2)
+    assert (restored.stories, restored.articles) == (1, 1)
+    assert links == {again.id, other.id}
+    assert ids == {again.id, other.id}
+
+
+def test_compact_rewrites_legacy_rows(sqlite_url):
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        legacy = article(1, raw_json=PAYLOAD)
+        short = article(1, content="Too short to compress.")
+        async with sessionmaker() as session:
+            session.add_all([legacy, short])
+            await session.commit()
+            # As written before compression: plain text in the content column
+            await session.execute(text("UPDATE raw_article SET content = CAST(:body AS BLOB) WHERE id = :id"),
+                                  {"body": "Legacy body. " * 100, "id": legacy.id.hex})
+            await session.commit()
+
+        assert await retention.compact(sessionmaker) == 1
+        assert await retention.compact(sessionmaker) == 0
+        async with sessionmaker() as session:
+            stored = await session.scalar(select(type_coerce(RawArticle.content, LargeBinary)).where(RawArticle.id == legacy.id))
+            row = await session.get(RawArticle, legacy.id)
+        assert stored.startswith(b"\x00")
+        assert row.content == "Legacy body. " * 100
+        assert row.raw_json == compact_payload(PAYLOAD)
+
+    asyncio.run(run())
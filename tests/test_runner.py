@@ -0,0 +1,49 @@
+import asyncio
+import time
+import pytest
+from src.agents.fake_llm import FakeChatModel
+from src.agents.llm import registry
+from src.agents.rate_limit import RateLimiter
+from src.agents.runner import run_graph_batch
+from tests.test_nodes import cluster_state
+
+
+@pytest.fixture
+def slow_llm():
+    llm = FakeChatModel(latency=0.05)
+    registry.register(llm)
+    yield llm
+    registry.clear()
+
+
+def test_batch_runs_clusters_concurrently_through_async_nodes(slow_llm):
+    states = [cluster_state(articles=2) for _ in range(12)]
+
+    run = asyncio.run(run_graph_batch(states, concurrency=12))
+
+    assert run.succeeded == 12 and not run.errors
+    assert all(state["is_approved"] for state in run.results)
+    assert len(slow_llm.stats.calls) == 24
+    # 24 calls x 50ms would take >1.2s one after another
+    assert run.seconds < 0.6
+
+
+def test_batch_isolates_failing_clusters(slow_llm):
+    broken = cluster_state(articles=1)
+    del broken["raw_articles"]
+
+    run = asyncio.run(run_graph_batch([cluster_state(articles=1), broken], concurrency=2))
+
+    assert run.succeeded == 1 and list(run.errors) == [1]
+
+
+def test_rate_limiter_spaces_requests_to_the_quota():
+    limiter = RateLimiter(requests_per_period=5, tokens_per_period=None, period=0.5)
+
+    async def burst():
+        start = time.perf_counter()
+        await asyncio.gather(*(limiter.acquire() for _ in range(10)))
+        return time.perf_counter() - start
+
+    # The first 5 pass immediately, the next 5 wait for the bucket to refill (~0.1s each)
+    assert 0.4 <= asyncio.run(burst()) < 1.0
@@ -0,0 +1,115 @@
+import asyncio
+from uuid import uuid4
+import httpx
+import numpy as np
+from src.agents.fake_llm import FakeChatModel
+from src.agents.llm import registry
+from src.api.main import app
+from src.db.models import Story
+from src.db.session import get_session
+from src.services.chat import ChatService, get_chat_service
+from src.services.embeddings import HashingEmbedder
+from src.services.semantic_cache import CachedAnswer, InMemorySemanticCache
+from src.services.vector_index import VectorIndex, VectorRetriever
+from tests.conftest import make_sessionmaker
+from tests.test_clustering import ARTICLES
+from tests.test_processor import raw_article
+
+
+def unit(*values) -> np.ndarray:
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_lookup_reuses_answers_above_the_threshold_only():
+    async def run():
+        cache = InMemorySemanticCache(threshold=0.9)
+        await cache.store(unit(1, 0, 0), CachedAnswer("q", "rates held", story_ids=frozenset({"s1"})))
+        close = await cache.lookup(unit(1, 0.2, 0))       # cosine ~0.98
+        far = await cache.lookup(unit(1, 1, 0))           # cosine ~0.71
+        return close, far, await cache.stats()
+
+    close, far, stats = asyncio.run(run())
+    assert close.answer == "rates held" and close.similarity > 0.9
+    assert far is None
+    assert (stats["hits"], stats["misses"], stats["saved_llm_calls"], stats["hit_rate"]) == (1, 1, 1, 0.5)
+    assert stats["lookup_ms_p95"] >= stats["lookup_ms_p50"] >= 0
+
+
+def test_entries_expire_and_least_recently_used_are_evicted():
+    async def run():
+        expiring = InMemorySemanticCache(ttl_seconds=0.0)
+        await expiring.store(unit(1, 0), CachedAnswer("q", "a"))
+        expired = await expiring.lookup(unit(1, 0))
+
+        lru = InMemorySemanticCache(max_entries=2)
+        await lru.store(unit(1, 0, 0), CachedAnswer("x", "x"))
+        await lru.store(unit(0, 1, 0), CachedAnswer("y", "y"))
+        await lru.lookup(unit(1, 0, 0))                  # x is now the most recently used
+        await lru.store(unit(0, 0, 1), CachedAnswer("z", "z"))
+        answers = [await lru.lookup(v) for v in (unit(1, 0, 0), unit(0, 1, 0), unit(0, 0, 1))]
+        return expired, [a.answer if a else None for a in answers]
+
+    expired, answers = asyncio.run(run())
+    assert expired is None
+    assert answers == ["x", None, "z"]
+
+
+def test_invalidation_by_story_and_by_similar_new_story():
+    async def run():
+        cache = InMemorySemanticCache()
+        await cache.store(unit(1, 0, 0), CachedAnswer("a", "a", story_ids=frozenset({"s1", "s2"})))
+        await cache.store(unit(0, 1, 0), CachedAnswer("b", "b", story_ids=frozenset({"s3"})))
+        await cache.store(unit(0, 0, 1), CachedAnswer("c", "c"))
+        by_story = await cache.invalidate_stories(["s2"])
+        by_vector = await cache.invalidate_near(np.array([[0, 1, 0.1]]), threshold=0.8)
+        return by_story, by_vector, await cache.size(), await cache.lookup(unit(0, 0, 1))
+
+    by_story, by_vector, size, left = asyncio.run(run())
+    assert (by_story, by_vector, size) == (1, 1, 1)
+    assert left.answer == "c"
+
+
+def test_chat_endpoint_serves_similar_questions_from_the_cache(sqlite_url, tmp_path):
+    llm = FakeChatModel()
+    registry.register(llm)
+    embedder = HashingEmbedder(dim=128)
+    retriever = VectorRetriever(VectorIndex(str(tmp_path), dim=128, model=embedder.name), embedder)
+    service = ChatService(retriever, InMemorySemanticCache(threshold=0.8), k=3)
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        async with sessionmaker() as session:
+            articles = [raw_article(a) for a in ARTICLES]
+            story = Story(id=uuid4(), title="Fed holds rates", summary="The Federal Reserve held interest rates steady.", sources=articles[2:])
+            session.add_all([*articles, story])
+            await session.commit()
+            await retriever.index_new_rows(session)
+
+        async def session_override():
+            async with sessionmaker() as session:
+                yield session
+
+        app.dependency_overrides[get_session] = session_override
+        app.dependency_overrides[get_chat_service] = lambda: service
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                first = (await client.post("/chat", json={"question": "Why did the Federal Reserve hold interest rates steady?"})).json()
+                second = (await client.post("/chat", json={"question": "why did the federal reserve hold interest rates steady"})).json()
+                await service.cache.invalidate_stories([story.id])
+                third = (await client.post("/chat", json={"question": "Why did the Federal Reserve hold interest rates steady?"})).json()
+                stats = (await client.get("/chat/cache-stats")).json()
+        finally:
+            app.dependency_overrides.clear()
+        return first, second, third, stats
+
+    try:
+        first, second, third, stats = asyncio.run(run())
+    finally:
+        registry.clear()
+
+    assert (first["cached"], second["cached"], third["cached"]) == (False, True, False)
+    assert second["answer"] == first["answer"] and second["sources"] == first["sources"]
+    assert {s["kind"] for s in first["sources"]} == {"article", "story"}
+    assert [call.kind for call in llm.stats.calls] == ["chat", "chat"]
+    assert (stats["hits"], stats["saved_llm_calls"], stats["invalidations"]) == (1, 1, 1)
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Entry point -> (cumulative import budget in seconds, modules it must not load at import time).
+# The budgets are a few times the measured cost, so only a heavy import slipping back in fails them.
+ENTRY_POINTS = {
+    "src.db.session": (1.5, ["asyncpg", "langgraph", "langchain_core"]),
+    "src.agents.graph": (1.0, ["langgraph", "langchain_core", "trafilatura"]),
+    "src.services.news_fetcher": (2.0, ["trafilatura", "langgraph", "langchain_core", "asyncpg"]),
+    "src.services.crawl_scheduler": (2.0, ["trafilatura", "langgraph", "langchain_core", "asyncpg"]),
+    "src.services.processor": (3.0, ["langgraph", "trafilatura", "asyncpg"]),
+    "src.api.main": (3.0, ["langgraph", "trafilatura", "asyncpg"]),
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative microseconds per module from `python -X importtime`, in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_entry_point_imports_within_budget(module):
+    budget, lazy = ENTRY_POINTS[module]
+    times = import_times(module)
+
+    assert times[module] / 1e6 < budget, f"importing {module} took {times[module] / 1e6:.2f}s (budget {budget}s)"
+    assert not [name for name in lazy if name in times], f"{module} imports heavy dependencies at startup"
+
+
+def test_lazy_attributes_still_resolve():
+    from src.agents import graph
+    from src.db import session
+
+    assert graph.app is graph.get_app()
+    assert session.AsyncSessionLocal is session.get_sessionmaker()
+    assert session.AsyncSessionLocal.kw["bind"] is session.engine
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import httpx
+import pytest
+import structlog
+from src.agents.fake_llm import FakeChatModel
+from src.agents.llm import registry
+from src.logger.tracing import (
+    JsonFileSpanExporter,
+    OtlpHttpSpanExporter,
+    chrome_trace,
+    instrument_engine,
+    load_spans,
+    span,
+    stage_breakdown,
+    timeline,
+    traced,
+    tracer,
+)
+from src.services.news_fetcher import NewsFetcherService
+from src.services.processor import ProcessorService
+from tests.conftest import make_sessionmaker
+from tests.test_clustering import ARTICLES
+from tests.test_news_fetcher import RecordingExtractor, fake_stream, newsapi_article
+from tests.test_processor import raw_article
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exported():
+    exporter = ListExporter()
+    tracer.set_exporter(exporter)
+    yield exporter
+    tracer.set_exporter(None)
+
+
+def test_spans_nest_bind_log_context_and_record_errors(exported):
+    @traced()
+    def failing():
+        raise ValueError("boom")
+
+    with span("outer", run=1) as outer:
+        context = structlog.contextvars.get_contextvars()
+        with span("inner"):
+            pass
+        with pytest.raises(ValueError):
+            failing()
+    tracer.flush()
+
+    inner, fail, root = exported.spans
+    assert (context["trace_id"], context["span_id"]) == (outer.trace_id, outer.span_id)
+    assert "trace_id" not in structlog.contextvars.get_contextvars()
+    assert root.parent_id is None and root.attributes == {"run": 1}
+    assert inner.parent_id == fail.parent_id == root.span_id
+    assert {inner.trace_id, fail.trace_id} == {root.trace_id}
+    assert fail.name.endswith("failing") and fail.error == "ValueError: boom"
+    assert root.start_ns <= inner.start_ns <= inner.end_ns <= root.end_ns
+
+
+def test_processor_run_is_one_trace_per_batch_down_to_db_and_llm_calls(exported, sqlite_url):
+    registry.register(FakeChatModel())
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        instrument_engine(sessionmaker.kw["bind"])
+        async with sessionmaker() as session:
+            session.add_all(raw_article(a) for a in ARTICLES)
+            await session.commit()
+        await ProcessorService(batch_size=10).run(sessionmaker)
+
+    try:
+        asyncio.run(run())
+    finally:
+        registry.clear()
+    tracer.flush()
+
+    batches = [s for s in exported.spans if s.name == "processor.batch"]
+    by_id = {s.span_id: s for s in exported.spans}
+    trace = [s for s in exported.spans if s.trace_id == batches[0].trace_id]
+
+    def path(s):
+        return path(by_id[s.parent_id]) + [s.name] if s.parent_id else [s.name]
+
+    paths = {" > ".join(path(s)) for s in trace}
+    assert "processor.batch > graph.run > graph.researcher > llm.call" in paths
+    assert "processor.batch > graph.run > graph.citation_check" in paths
+    assert "processor.batch > graph.run > graph.editor > llm.call" in paths
+    assert any(p == "processor.batch > db.query" for p in paths)
+    assert {s.attributes["db.operation"] for s in trace if s.name == "db.query"} >= {"SELECT", "INSERT", "UPDATE"}
+    assert "processor.batch" in [name for name, *_ in stage_breakdown(exported.spans)]
+    assert timeline(exported.spans, batches[0].trace_id)[0].startswith("processor.batch")
+
+
+def test_ingestion_spans_cover_extraction_and_commits(exported, monkeypatch, sqlite_url):
+    monkeypatch.setenv("NEWS_API_KEY", "test-key")
+    fetcher = NewsFetcherService(extractor=RecordingExtractor())
+    monkeypatch.setattr(fetcher, "stream_news", fake_stream([newsapi_article(i) for i in range(3)]))
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        async with sessionmaker() as session:
+            await fetcher.run_ingestion(session, commit_every=10)
+
+    asyncio.run(run())
+    tracer.flush()
+
+    root = next(s for s in exported.spans if s.name == "ingestion.run")
+    children = [s.name for s in exported.spans if s.parent_id == root.span_id]
+    assert children.count("extract") == 3 and children.count("ingestion.commit") == 1
+
+
+def test_exporters_write_span_files_and_otlp_requests(tmp_path):
+    requests = []
+    transport = httpx.MockTransport(lambda request: requests.append(json.loads(request.content)) or httpx.Response(200))
+    file_exporter = JsonFileSpanExporter(tmp_path / "traces.jsonl")
+    otlp_exporter = OtlpHttpSpanExporter("http://collector/v1/traces", client=httpx.Client(transport=transport))
+
+    for exporter in (file_exporter, otlp_exporter):
+        tracer.set_exporter(exporter)
+        try:
+            with span("crawl", queries=2):
+                with span("newsapi.request", page=1, ok=True):
+                    pass
+        finally:
+            tracer.set_exporter(None)
+
+    spans = load_spans(tmp_path / "traces.jsonl")
+    assert [s.name for s in spans] == ["newsapi.request", "crawl"]
+    assert [e["name"] for e in chrome_trace(spans)["traceEvents"]] == ["newsapi.request", "crawl"]
+    otlp = requests[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert otlp[0]["parentSpanId"] == otlp[1]["spanId"]
+    assert otlp[0]["attributes"] == [{"key": "page", "value": {"intValue": "1"}}, {"key": "ok", "value": {"boolValue": True}}]
@@ -0,0 +1,82 @@
+import asyncio
+import httpx
+import pytest
+from sqlalchemy import select
+from src.agents.fake_llm import FakeChatModel
+from src.agents.llm import registry
+from src.agents.runner import run_graph_batch
+from src.agents.usage import PROMPT_TOKENS, estimate_cost, track_usage
+from src.api.main import app
+from src.db.models import Story
+from src.services.processor import ProcessorService
+from tests.conftest import make_sessionmaker
+from tests.test_clustering import ARTICLES
+from tests.test_nodes import cluster_state
+from tests.test_processor import raw_article
+
+
+def test_estimate_cost_uses_per_million_prices():
+    assert estimate_cost("qwen/qwen3-32b", 1_000_000, 1_000_000) == pytest.approx(0.88)
+    assert estimate_cost("unlisted-model", 10_000, 10_000) == 0.0
+
+
+def test_graph_runs_account_usage_per_node_and_in_total():
+    llm = FakeChatModel(reject_first=1)
+    registry.register(llm)
+    try:
+        run = asyncio.run(run_graph_batch([cluster_state(articles=2), cluster_state(articles=1)], concurrency=2))
+    finally:
+        registry.clear()
+
+    usage = run.usage
+    by_kind = {kind: [c for c in llm.stats.calls if c.kind == kind] for kind in ("researcher", "editor")}
+    for node, calls in by_kind.items():
+        assert usage[node]["calls"] == len(calls)
+        assert usage[node]["prompt_tokens"] == sum(c.input_tokens for c in calls)
+        assert usage[node]["completion_tokens"] == sum(c.output_tokens for c in calls)
+    assert usage["total"]["calls"] == len(llm.stats.calls) == 6
+    assert usage["total"]["prompt_tokens"] == llm.stats.tokens()
+    assert sum(r["usage"]["total"]["calls"] for r in run.results) == 6
+
+
+def test_usage_outside_a_scope_still_reaches_the_metrics():
+    llm = FakeChatModel()
+    registry.register(llm)
+    before = PROMPT_TOKENS.value(model="fake-chat", node="other")
+    try:
+        registry.model().invoke("hello")
+        with track_usage("scoped") as meter:
+            registry.model().invoke("hello again")
+    finally:
+        registry.clear()
+
+    assert PROMPT_TOKENS.value(model="fake-chat", node="other") - before == llm.stats.calls[0].input_tokens
+    assert (meter.calls, meter.prompt_tokens) == (1, llm.stats.calls[1].input_tokens)
+
+
+def test_processor_stores_story_usage_and_api_serves_metrics(sqlite_url):
+    llm = FakeChatModel()
+    registry.register(llm)
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        async with sessionmaker() as session:
+            session.add_all(raw_article(a) for a in ARTICLES)
+            await session.commit()
+        await ProcessorService().run(sessionmaker)
+        async with sessionmaker() as session:
+            stories = (await session.execute(select(Story))).scalars().all()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/metrics")
+        return stories, response
+
+    try:
+        stories, response = asyncio.run(run())
+    finally:
+        registry.clear()
+
+    assert sum(s.llm_usage["total"]["calls"] for s in stories) == len(llm.stats.calls)
+    assert all(s.llm_usage["researcher"]["prompt_tokens"] > 0 and s.llm_cost_usd == 0.0 for s in stories)
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain")
+    assert 'sentinel_llm_prompt_tokens_total{model="fake-chat",node="researcher"}' in response.text
+    assert 'sentinel_llm_latency_seconds_bucket{model="fake-chat",node="editor",le="+Inf"}' in response.text
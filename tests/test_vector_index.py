@@ -0,0 +1,113 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import numpy as np
+import pytest
+from src.db.models import Story
+from src.services.embeddings import HashingEmbedder, get_embedder
+from src.services.vector_index import VectorIndex, VectorRetriever, chunk_text
+from tests.conftest import make_sessionmaker
+from tests.test_clustering import ARTICLES
+from tests.test_processor import raw_article
+
+
+def clustered_vectors(n: int, dim: int = 32, topics: int = 50, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim))
+    return (centers[rng.integers(0, topics, n)] + 0.3 * rng.standard_normal((n, dim))).astype(np.float32)
+
+
+def test_chunks_overlap_and_cover_every_word():
+    words = [f"w{i}" for i in range(450)]
+    chunks = chunk_text(" ".join(words), size=200, overlap=40)
+
+    assert [c.split()[0] for c in chunks] == ["w0", "w160", "w320"]
+    assert chunks[-1].split()[-1] == "w449"
+    assert chunk_text("short text", size=200, overlap=40) == ["short text"]
+    assert chunk_text("   ") == []
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    vectors = HashingEmbedder(dim=64).embed(["Starship reaches orbit", "Starship reaches orbit", ""])
+
+    assert vectors.shape == (3, 64)
+    assert np.allclose(vectors[0], vectors[1])
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0)
+    assert not vectors[2].any()
+
+
+def test_auto_backend_falls_back_to_hashing_without_sentence_transformers(monkeypatch):
+    monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+
+    assert isinstance(get_embedder("auto"), HashingEmbedder)
+    with pytest.raises(ImportError):
+        get_embedder("sentence-transformers")
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int8"])
+def test_ivf_search_matches_brute_force_and_survives_reopen(tmp_path, dtype):
+    vectors = clustered_vectors(3000)
+    ids = [uuid4() for _ in range(len(vectors))]
+    index = VectorIndex(str(tmp_path), dim=32, dtype=dtype, min_train=1000)
+    index.add(vectors[:2000], ids[:2000], "article", [0] * 2000)
+    assert index.maybe_train()
+    # Appended after training: assigned to the existing lists
+    index.add(vectors[2000:], ids[2000:], "story", [1] * 1000)
+
+    queries = clustered_vectors(20, seed=1)
+    recall = np.mean([
+        len(set(index.search_rows(q, 10, nprobe=8)[0]) & set(index.exact_search(q, 10)[0])) / 10 for q in queries
+    ])
+    assert recall >= 0.9
+
+    reopened = VectorIndex(str(tmp_path), dim=32, dtype=dtype, min_train=1000)
+    hit = reopened.search(vectors[2500], k=1)[0]
+    assert (hit.id, hit.kind, hit.chunk) == (ids[2500], "story", 1)
+    assert hit.score > 0.99
+    with pytest.raises(ValueError):
+        VectorIndex(str(tmp_path), dim=64, dtype=dtype)
+
+
+def test_retriever_indexes_only_new_rows(sqlite_url, tmp_path):
+    class CountingEmbedder(HashingEmbedder):
+        texts = 0
+
+        def embed(self, texts):
+            CountingEmbedder.texts += len(texts)
+            return super().embed(texts)
+
+    embedder = CountingEmbedder(dim=64)
+    retriever = VectorRetriever(VectorIndex(str(tmp_path), dim=64, model=embedder.name), embedder, batch_rows=2)
+
+    async def run():
+        sessionmaker = await make_sessionmaker(sqlite_url)
+        async with sessionmaker() as session:
+            session.add_all(raw_article(a) for a in ARTICLES)
+            await session.commit()
+            first = await retriever.index_new_rows(session)
+
+            story = Story(
+                id=uuid4(),
+                title="Fed holds rates",
+                summary="The Federal Reserve kept rates unchanged.",
+                created_at=datetime.now(timezone.utc) + timedelta(seconds=1),
+            )
+            session.add(story)
+            await session.commit()
+            embedded_before = CountingEmbedder.texts
+            second = await retriever.index_new_rows(session)
+            embedded_after = CountingEmbedder.texts
+
+            hits = retriever.search("Federal Reserve interest rates", k=2)
+            texts = await retriever.chunk_texts(session, hits)
+        return first, second, embedded_after - embedded_before, story, hits, texts
+
+    first, second, embedded, story, hits, texts = asyncio.run(run())
+
+    assert (first.articles, first.stories, first.chunks) == (3, 0, 3)
+    assert (second.articles, second.stories, second.chunks) == (0, 1, 1)
+    assert embedded == 1
+    assert {hit.kind for hit in hits} == {"article", "story"}
+    assert any(hit.id == story.id for hit in hits)
+    assert all("Fed" in text for text in texts)